@@ -1,9 +1,21 @@
+import hashlib
 import re
 
 from ..constants import STRAND
 from ..interval import Interval
 
 
+def sequence_digest(seq):
+    """
+    Args:
+        seq (str): a nucleotide or amino acid sequence
+
+    Returns:
+        str: hex digest of the sequence. Used to compare (and name) sequences without keeping or re-building them
+    """
+    return hashlib.md5(seq.encode('utf-8')).hexdigest()
+
+
 class ReferenceName(str):
     """
     Class for reference sequence names. Ensures that hg19/hg38 chromosome names match.
@@ -7,10 +7,14 @@ from ..util import WeakMavisNamespace
 
 
 PASS_FILENAME = 'annotations.tab'
+DRAWINGS_FILENAME = 'annotations.drawings.jsonl'
 
 DEFAULTS = WeakMavisNamespace()
 """
 - :term:`annotation_filters`
+- :term:`annotation_processes`
+- :term:`defer_drawings`
+- :term:`fusion_cache_size`
 - :term:`max_orf_cap`
 - :term:`min_domain_mapping_match`
 - :term:`min_orf_size`
@@ -49,6 +53,27 @@ DEFAULTS.add(
     cast_type=tab.cast_boolean,
     defn='flag to indicate if events which are synonymous at the cdna level should produce illustrations',
 )
+DEFAULTS.add(
+    'annotation_processes',
+    1,
+    defn='number of processes to use in building the fusion products and drawings. When greater than 1 the breakpoint '
+    'pairs are split into shards which are annotated in parallel and the rows are written in the input order',
+)
+DEFAULTS.add(
+    'fusion_cache_size',
+    1000,
+    defn='maximum number of built fusion transcripts to keep so that equivalent annotations (same transcripts, '
+    'breakpoints, untemplated sequence and event type) re-use the fusion product instead of rebuilding it. '
+    'Set to 0 to disable',
+)
+DEFAULTS.add(
+    'defer_drawings',
+    False,
+    cast_type=tab.cast_boolean,
+    defn='flag to indicate that annotate should not draw the illustrations. Instead the inputs required to draw them '
+    'are written to a sidecar file which can be drawn later (in parallel and/or for selected annotations) with the '
+    'draw command',
+)
 
 SPLICE_TYPE = MavisNamespace(
     RETAIN='retained intron',
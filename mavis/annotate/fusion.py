@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 from .genomic import Exon, Transcript, PreTranscript
 from .protein import calculate_orf, Domain, Translation
 from ..breakpoint import Breakpoint
@@ -69,6 +71,8 @@ class FusionTranscript(PreTranscript):
         self.mapping_to_chrs = dict()  # keeps track of what chromosome per interval
         self.break1 = None  # first breakpoint position in the fusion transcript
         self.break2 = None  # second breakpoint position in the fusion transcript
+        self._coordinate_maps = {}  # exon coordinate maps by splicing pattern
+        self._sequence_digests = None  # (reference genome, spliced transcripts, digests)
 
     def exon_number(self, exon):
         """
@@ -438,7 +442,12 @@ class FusionTranscript(PreTranscript):
             fusion_pre_transcript.spliced_transcripts.append(fusion_spl_tx)
 
             # calculate the putative open reading frames
-            orfs = calculate_orf(fusion_spl_tx.get_seq(), min_orf_size=min_orf_size)
+            # keep one more than the cap so that the filtering below can still tell when to sort
+            orfs = calculate_orf(
+                fusion_spl_tx.get_seq(),
+                min_orf_size=min_orf_size,
+                max_orf_cap=max_orf_cap + 1 if max_orf_cap else None,
+            )
             # limit the length to either only the longest ORF or anything longer than the input translations
             min_orf_length = max([len(o) for o in orfs] + [min_orf_size if min_orf_size else 0])
             for ref_tx in [ann.transcript1, ann.transcript2]:
@@ -602,3 +611,103 @@ class FusionTranscript(PreTranscript):
             raise NotSpecifiedError('transcript strand must be specified to pull exons')
 
         return str(s), new_exons
+
+
+class FusionTranscriptCache:
+    """
+    bounded (least recently used) cache of built fusion transcripts keyed by the content of the
+    annotation which determines the fusion product. Expanded orientations/strands/event types and
+    events repeated across libraries frequently produce identical fusions which are then only built
+    once. Built fusion transcripts are shared between annotations and should not be modified
+    """
+
+    def __init__(self, maxsize=1000):
+        """
+        Args:
+            maxsize (int): the maximum number of fusion transcripts to keep (0 to disable caching)
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        return len(self._cache)
+
+    @staticmethod
+    def _key(ann, reference_genome, min_orf_size, max_orf_cap, min_domain_mapping_match):
+        # transcripts are compared by identity. The cache entries keep a reference to them so ids are not re-used
+        return (
+            id(reference_genome),
+            id(ann.transcript1),
+            id(ann.transcript2),
+            ann.break1.key,
+            ann.break2.key,
+            ann.untemplated_seq,
+            ann.event_type,
+            ann.protocol,
+            min_orf_size,
+            max_orf_cap,
+            min_domain_mapping_match,
+        )
+
+    def build(
+        self,
+        ann,
+        reference_genome,
+        min_orf_size=None,
+        max_orf_cap=None,
+        min_domain_mapping_match=None,
+    ):
+        """
+        get the fusion transcript for an annotation, building it (see :meth:`FusionTranscript.build`)
+        only if an equivalent annotation has not already been built
+
+        Returns:
+            FusionTranscript: the (possibly shared) fusion transcript
+        """
+        if not self.maxsize:
+            self.misses += 1
+            return FusionTranscript.build(
+                ann,
+                reference_genome,
+                min_orf_size=min_orf_size,
+                max_orf_cap=max_orf_cap,
+                min_domain_mapping_match=min_domain_mapping_match,
+            )
+        key = self._key(ann, reference_genome, min_orf_size, max_orf_cap, min_domain_mapping_match)
+        if key in self._cache:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return self._cache[key][-1]
+        self.misses += 1
+        fusion = FusionTranscript.build(
+            ann,
+            reference_genome,
+            min_orf_size=min_orf_size,
+            max_orf_cap=max_orf_cap,
+            min_domain_mapping_match=min_domain_mapping_match,
+        )
+        self._cache[key] = (reference_genome, ann.transcript1, ann.transcript2, fusion)
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return fusion
+
+    def stats(self):
+        """
+        Returns:
+            str: summary of the cache usage for logging
+        """
+        total = self.hits + self.misses
+        return (
+            'fusion transcript cache: {} hits, {} misses ({:.1f}% hit rate), {} evictions, '
+            '{} cached'
+        ).format(
+            self.hits,
+            self.misses,
+            self.hits * 100 / total if total else 0,
+            self.evictions,
+            len(self._cache),
+        )
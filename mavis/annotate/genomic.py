@@ -1,7 +1,8 @@
+from bisect import bisect_right
 from copy import copy
 import itertools
 
-from .base import BioInterval, ReferenceName
+from .base import BioInterval, ReferenceName, sequence_digest
 from .constants import SPLICE_SITE_TYPE
 from .splicing import SpliceSite, SplicingPattern
 from ..constants import ORIENT, reverse_complement, STRAND
@@ -276,6 +277,131 @@ class Exon(BioInterval):
         )
 
 
+class ExonCoordinateMap:
+    """
+    sorted arrays of the genomic exon start and end positions and the cumulative length of the preceding exons (in
+    genomic order) used to convert between genomic and cdna coordinates by bisection
+    """
+
+    def __init__(self, exons, reverse=False):
+        """
+        Args:
+            exons (:class:`list` of :class:`~mavis.interval.Interval`): the non-overlapping exons sorted by position
+            reverse (bool): the transcript is on the reverse strand (cdna position 1 is the end of the last exon)
+        """
+        self.starts = []
+        self.ends = []
+        self.offsets = []
+        self.length = 0
+        self.reverse = reverse
+        for exon in exons:
+            if self.ends and exon.start <= self.ends[-1]:
+                raise AttributeError('input intervals cannot be overlapping', exon)
+            self.starts.append(exon.start)
+            self.ends.append(exon.end)
+            self.offsets.append(self.length)
+            self.length += exon.end - exon.start + 1
+
+    def _cdna_pos(self, index, pos):
+        cdna_pos = self.offsets[index] + pos - self.starts[index] + 1
+        return self.length - cdna_pos + 1 if self.reverse else cdna_pos
+
+    def genomic_to_nearest_cdna(self, pos, stick_direction=None):
+        """
+        Args:
+            pos (int): the genomic position
+            stick_direction (ORIENT): the exon to choose for intronic positions (defaults to the closest)
+
+        Returns:
+            tuple of int and int: the exonic cdna position and the intronic shift (None if the position is outside the
+            first and last exons)
+        """
+        index = bisect_right(self.starts, pos) - 1
+        if index < 0 or index >= len(self.starts):
+            return None
+        elif pos <= self.ends[index]:
+            return self._cdna_pos(index, pos), 0
+        elif index == len(self.starts) - 1:
+            return None
+        # intronic
+        prev_end = self.ends[index]
+        next_start = self.starts[index + 1]
+        if (
+            abs(pos - prev_end) <= abs(pos - next_start) or stick_direction == ORIENT.LEFT
+        ) and stick_direction != ORIENT.RIGHT:
+            return (
+                self._cdna_pos(index, prev_end),
+                prev_end - pos if self.reverse else pos - prev_end,
+            )
+        return (
+            self._cdna_pos(index + 1, next_start),
+            next_start - pos if self.reverse else pos - next_start,
+        )
+
+    def genomic_to_nearest_cdna_many(self, positions):
+        """
+        vectorized equivalent of :meth:`genomic_to_nearest_cdna` (intronic positions use the closest exon). Positions
+        before the first or after the last exon are given the first or last cdna position and their shift from the
+        first exon start or last exon end
+
+        Args:
+            positions (numpy.ndarray): the genomic positions
+
+        Returns:
+            tuple of numpy.ndarray and numpy.ndarray: the exonic cdna positions and the intronic shifts
+        """
+        import numpy as np
+
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = np.asarray(self.starts, dtype=np.int64)
+        ends = np.asarray(self.ends, dtype=np.int64)
+        offsets = np.asarray(self.offsets, dtype=np.int64)
+        last = len(starts) - 1
+
+        index = np.searchsorted(starts, positions, side='right') - 1
+        before = index < 0
+        index = np.clip(index, 0, last)
+        exonic = ~before & (positions <= ends[index])
+        after = ~exonic & (index == last) & ~before
+
+        # intronic positions are moved to the nearest exon (the upstream exon for ties)
+        next_index = np.minimum(index + 1, last)
+        use_next = (
+            ~exonic
+            & ~before
+            & ~after
+            & (np.abs(positions - ends[index]) > np.abs(positions - starts[next_index]))
+        )
+        anchor_index = np.where(use_next, next_index, index)
+        anchor = np.where(exonic, positions, np.where(use_next, starts[next_index], ends[index]))
+
+        cdna = offsets[anchor_index] + anchor - starts[anchor_index] + 1
+        shift = positions - anchor
+        if self.reverse:
+            cdna = self.length - cdna + 1
+            shift = -shift
+        cdna[before] = self.length if self.reverse else 1
+        shift[before] = positions[before] - starts[0]
+        cdna[after] = 1 if self.reverse else self.length
+        shift[after] = positions[after] - ends[last]
+        return cdna, shift
+
+    def cdna_to_genomic(self, pos):
+        """
+        Args:
+            pos (int): the cdna position (must be within the cdna)
+
+        Returns:
+            int: the genomic position
+        """
+        if pos < 1 or pos > self.length:
+            raise IndexError(pos, 'is outside mapped range', self.length)
+        if self.reverse:
+            pos = self.length - pos + 1
+        index = bisect_right(self.offsets, pos - 1) - 1
+        return self.starts[index] + pos - 1 - self.offsets[index]
+
+
 class PreTranscript(BioInterval):
     """
     """
@@ -305,6 +431,8 @@ class PreTranscript(BioInterval):
         self.exons = exons
         self.spliced_transcripts = [] if spliced_transcripts is None else spliced_transcripts
         self.is_best_transcript = is_best_transcript
+        self._coordinate_maps = {}  # exon coordinate maps by splicing pattern
+        self._sequence_digests = None  # (reference genome, spliced transcripts, digests)
 
         if len(exons) == 0:
             raise AttributeError('exons must be given')
@@ -406,6 +534,59 @@ class PreTranscript(BioInterval):
             raise IndexError('outside of exonic regions', pos, splicing_pattern, cdna_pos, shift)
         return cdna_pos
 
+    def coordinate_map(self, splicing_pattern):
+        """
+        Args:
+            splicing_pattern (SplicingPattern): list of genomic splice sites 3'5' repeating
+
+        Returns:
+            ExonCoordinateMap: the (cached) coordinate map for the exons defined by the splicing pattern
+        """
+        key = (
+            self.start,
+            self.end,
+            self.get_strand(),
+            tuple(sorted([s.pos for s in splicing_pattern])),
+        )
+        if key not in self._coordinate_maps:
+            exons = sorted(self._genomic_to_cdna_mapping(splicing_pattern).keys())
+            self._coordinate_maps[key] = ExonCoordinateMap(
+                exons, reverse=self.get_strand() == STRAND.NEG
+            )
+        return self._coordinate_maps[key]
+
+    def sequence_digests(self, reference_genome=None):
+        """
+        digests of the spliced cdna and protein sequences of all the spliced transcripts and translations. These are
+        computed once per reference genome (and set of spliced transcripts/translations) and then cached
+
+        Args:
+            reference_genome (:class:`dict` of :class:`Bio.SeqRecord` by :class:`str`): dict of reference sequence
+                by template/chr name
+
+        Returns:
+            tuple of :class:`set` of :class:`str` and :class:`set` of :class:`str`: the cdna and protein sequence digests
+        """
+        key = tuple(
+            [id(spl_tx) for spl_tx in self.spliced_transcripts]
+            + [id(translation) for translation in self.translations]
+        )
+        cached = self._sequence_digests
+        if cached is not None and cached[0] is reference_genome and cached[1] == key:
+            return cached[2]
+        cdna_digests = set()
+        protein_digests = set()
+        for spl_tx in self.spliced_transcripts:
+            cdna_digests.add(sequence_digest(spl_tx.get_seq(reference_genome)))
+            for translation in spl_tx.translations:
+                protein_digests.add(sequence_digest(translation.get_aa_seq(reference_genome)))
+        self._sequence_digests = (
+            reference_genome,
+            key,
+            (cdna_digests, protein_digests),
+        )
+        return cdna_digests, protein_digests
+
     def convert_genomic_to_nearest_cdna(
         self, pos, splicing_pattern, stick_direction=None, allow_outside=True
     ):
@@ -422,47 +603,31 @@ class PreTranscript(BioInterval):
                 * *int* - the intronic shift
 
         """
-        mapping = self._genomic_to_cdna_mapping(splicing_pattern)
-        exons = sorted(list(mapping.keys()))
-        # exonic
-        for ex in exons:
-            if pos <= ex.end and pos >= ex.start:
-                # in the current exon
-                cdna_pos = Interval.convert_pos(
-                    mapping, pos, True if self.get_strand() == STRAND.NEG else False
-                )
-                return cdna_pos, 0
-        # intronic
-        for ex1, ex2 in zip(exons, exons[1::]):
-            if pos > ex1.end and pos < ex2.start:
-                # in the current intron
-                if (
-                    abs(pos - ex1.end) <= abs(pos - ex2.start) or stick_direction == ORIENT.LEFT
-                ) and stick_direction != ORIENT.RIGHT:
-                    # closest to the first exon
-                    cdna_pos = Interval.convert_pos(
-                        mapping, ex1.end, True if self.get_strand() == STRAND.NEG else False
-                    )
-                    return (
-                        cdna_pos,
-                        pos - ex1.end if self.get_strand() == STRAND.POS else ex1.end - pos,
-                    )
-                cdna_pos = Interval.convert_pos(
-                    mapping, ex2.start, True if self.get_strand() == STRAND.NEG else False
-                )
-                return (
-                    cdna_pos,
-                    pos - ex2.start if self.get_strand() == STRAND.POS else ex2.start - pos,
-                )
-        if allow_outside:
-            cdna_length = sum([len(e) for e in exons])
-            if pos < exons[0].start:  # before the first exon
-                return cdna_length if self.is_reverse else 1, pos - exons[0].start
-            elif pos > exons[-1].end:
-                return 1 if self.is_reverse else cdna_length, pos - exons[-1].end
-            else:
-                raise NotImplementedError('Unexpected error', self.exons, pos)
-        raise IndexError('position does not fall within the current transcript', pos, mapping)
+        coord_map = self.coordinate_map(splicing_pattern)
+        result = coord_map.genomic_to_nearest_cdna(pos, stick_direction=stick_direction)
+        if result is not None:
+            return result
+        elif allow_outside:
+            if pos < coord_map.starts[0]:  # before the first exon
+                return coord_map.length if self.is_reverse else 1, pos - coord_map.starts[0]
+            return 1 if self.is_reverse else coord_map.length, pos - coord_map.ends[-1]
+        raise IndexError(
+            'position does not fall within the current transcript', pos, splicing_pattern
+        )
+
+    def convert_genomic_to_cdna_many(self, positions, splicing_pattern):
+        """
+        converts an array of genomic positions to their nearest cdna positions and intronic shifts. See
+        :meth:`ExonCoordinateMap.genomic_to_nearest_cdna_many`
+
+        Args:
+            positions (numpy.ndarray): the genomic positions
+            splicing_pattern (SplicingPattern): the splicing pattern
+
+        Returns:
+            tuple of numpy.ndarray and numpy.ndarray: the exonic cdna positions and the intronic shifts (0 for exonic positions)
+        """
+        return self.coordinate_map(splicing_pattern).genomic_to_nearest_cdna_many(positions)
 
     def convert_cdna_to_genomic(self, pos, splicing_pattern):
         """
@@ -473,21 +638,17 @@ class PreTranscript(BioInterval):
         Returns:
             int: the genomic equivalent
         """
-        mapping = self._cdna_to_genomic_mapping(splicing_pattern)
-        exons = sorted(mapping.values())
-        length = sum([len(e) for e in mapping])
+        coord_map = self.coordinate_map(splicing_pattern)
         if pos < 0:
             if self.is_reverse:
-                return exons[-1].end + abs(pos)
-            return exons[0].start + pos
-        if pos > length:
-            pos -= length
+                return coord_map.ends[-1] + abs(pos)
+            return coord_map.starts[0] + pos
+        if pos > coord_map.length:
+            pos -= coord_map.length
             if self.is_reverse:
-                return exons[0].start - pos
-            return exons[-1].end + pos
-        return Interval.convert_pos(
-            mapping, pos, True if self.get_strand() == STRAND.NEG else False
-        )
+                return coord_map.starts[0] - pos
+            return coord_map.ends[-1] + pos
+        return coord_map.cdna_to_genomic(pos)
 
     def exon_number(self, exon):
         """
@@ -611,6 +772,11 @@ class Transcript(BioInterval):
         elif len(splicing_patt) % 2 != 0:
             raise AssertionError('splicing pattern must be a list of 3\'5\' splicing positions')
 
+    @property
+    def coordinate_map(self):
+        """:class:`ExonCoordinateMap`: the genomic/cdna coordinate map for the exons of this transcript"""
+        return self.unspliced_transcript.coordinate_map(self.splicing_pattern)
+
     def convert_genomic_to_cdna(self, pos):
         """
         Args:
@@ -629,6 +795,16 @@ class Transcript(BioInterval):
             pos, self.splicing_pattern, **kwargs
         )
 
+    def convert_genomic_to_cdna_many(self, positions):
+        """
+        Args:
+            positions (numpy.ndarray): the genomic positions
+
+        Returns:
+            tuple of numpy.ndarray and numpy.ndarray: the exonic cdna positions and the intronic shifts (0 for exonic positions)
+        """
+        return self.coordinate_map.genomic_to_nearest_cdna_many(positions)
+
     def convert_cdna_to_genomic(self, pos):
         """
         Args:
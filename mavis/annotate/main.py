@@ -1,13 +1,15 @@
+import itertools
 import json
+import multiprocessing
 import os
 import re
 import time
 import warnings
-import hashlib
 
-from .constants import DEFAULTS, PASS_FILENAME
-from .genomic import PreTranscript
+from .base import BioInterval, sequence_digest
+from .constants import DEFAULTS, DRAWINGS_FILENAME, PASS_FILENAME
 from .variant import (
+    Annotation,
     annotate_events,
     choose_more_annotated,
     choose_transcripts_by_priority,
@@ -15,13 +17,17 @@ from .variant import (
     flatten_fusion_transcript,
     flatten_fusion_translation,
 )
-from .fusion import determine_prime
+from .fusion import determine_prime, FusionTranscript, FusionTranscriptCache
+from .genomic import IntergenicRegion, PreTranscript, Template
+from .protein import Domain
 from ..cluster.constants import DEFAULTS as CLUSTER_DEFAULTS
+from ..breakpoint import Breakpoint, BreakpointPair
 from ..constants import COLUMNS, PRIME, PROTOCOL, sort_columns
 from ..error import DrawingFitError, NotSpecifiedError
 from ..illustrate.constants import DEFAULTS as ILLUSTRATION_DEFAULTS
 from ..illustrate.constants import DiagramSettings
-from ..illustrate.diagram import draw_sv_summary_diagram
+from ..illustrate.diagram import draw_sv_summary_diagram, sv_summary_diagram_min_width
+from ..illustrate.util import MIN_PIXEL_ACCURACY
 from ..util import LOG, mkdirp, read_inputs
 
 
@@ -54,7 +60,23 @@ def draw(drawing_config, ann, reference_genome, template_metadata, drawings_dire
         (initial_width, {'draw_fusion_transcript': False, 'draw_reference_transcripts': False})
     )
 
+    # measure the layout once per group of settings to skip the attempts that cannot fit
+    min_widths = {}
     for i, (curr_width, other_settings) in enumerate(drawing_attempts):
+        settings_key = tuple(sorted(other_settings.items()))
+        if settings_key not in min_widths:
+            try:
+                min_widths[settings_key] = sv_summary_diagram_min_width(
+                    drawing_config, ann, templates=template_metadata, **other_settings
+                )
+            except (AttributeError, KeyError, NotSpecifiedError):
+                min_widths[settings_key] = 0  # cannot measure, rely on the drawing attempts
+        # allow for pixel rounding in the measurement. The last (fallback) attempt is always drawn
+        if (
+            i < len(drawing_attempts) - 1
+            and curr_width + MIN_PIXEL_ACCURACY < min_widths[settings_key]
+        ):
+            continue
         LOG(
             'drawing attempt:',
             i + 1,
@@ -113,6 +135,361 @@ def draw(drawing_config, ann, reference_genome, template_metadata, drawings_dire
     return drawing, legend
 
 
+def annotate_rows(
+    ann,
+    reference_genome,
+    template_metadata,
+    drawing_config,
+    drawings_directory,
+    fa_output_file,
+    draw_fusions_only=DEFAULTS.draw_fusions_only,
+    draw_non_synonymous_cdna_only=DEFAULTS.draw_non_synonymous_cdna_only,
+    defer_drawings=DEFAULTS.defer_drawings,
+    fusion_settings=None,
+):
+    """
+    builds the output rows (one per fusion transcript/translation) for an annotation and draws it (where applicable)
+
+    Args:
+        defer_drawings (bool): return the drawing inputs (see :func:`drawing_record`) instead of drawing
+        fusion_settings (dict): the arguments used to build the fusion transcript (stored with deferred drawings)
+
+    Returns:
+        tuple:
+            - dict: the flattened annotation
+            - :class:`list` of :class:`dict`: the rows to be output
+            - :class:`list` of :class:`tuple` of :class:`str` and :class:`str`: the fasta id and sequence of each fusion cdna
+            - dict: the deferred drawing record (None unless the drawing was deferred)
+    """
+    ann_row = ann.flatten()
+    ann_row[COLUMNS.fusion_sequence_fasta_file] = fa_output_file
+    LOG(ann, time_stamp=False)
+    # get the reference sequence digests for either transcript
+    ref_cdna_seq = {}
+    ref_protein_seq = {}
+
+    for pre_transcript in [
+        x for x in [ann.transcript1, ann.transcript2] if isinstance(x, PreTranscript)
+    ]:
+        name = pre_transcript.name
+        cdna_digests, protein_digests = pre_transcript.sequence_digests(reference_genome)
+        for digest in cdna_digests:
+            ref_cdna_seq.setdefault(digest, set()).add(name)
+        for digest in protein_digests:
+            ref_protein_seq.setdefault(digest, set()).add(name)
+
+    # try building the fusion product
+    rows = []
+    fasta_records = []
+    record = None
+    cdna_synon_all = True
+    # add fusion information to the current ann_row
+    for spl_fusion_tx in [] if not ann.fusion else ann.fusion.transcripts:
+        seq = ann.fusion.get_cdna_seq(spl_fusion_tx.splicing_pattern)
+        # make the fasta id a hex of the string to avoid having to load the sequences later
+        digest = sequence_digest(seq)
+        fusion_fa_id = 'seq-{}'.format(digest)
+        fasta_records.append((fusion_fa_id, seq))
+        cdna_synon = ';'.join(sorted(list(ref_cdna_seq.get(digest, set()))))
+
+        temp_row = {}
+        temp_row.update(ann_row)
+        temp_row.update(flatten_fusion_transcript(spl_fusion_tx))
+        temp_row[COLUMNS.fusion_sequence_fasta_id] = fusion_fa_id
+        temp_row[COLUMNS.cdna_synon] = cdna_synon if cdna_synon else None
+        if not cdna_synon:
+            cdna_synon_all = False
+        if spl_fusion_tx.translations:
+            # duplicate the ann_row for each translation
+            for fusion_translation in spl_fusion_tx.translations:
+                nrow = dict()
+                nrow.update(ann_row)
+                nrow.update(temp_row)
+                aa_seq = fusion_translation.get_aa_seq()
+                protein_synon = ';'.join(
+                    sorted(list(ref_protein_seq.get(sequence_digest(aa_seq), set())))
+                )
+                nrow[COLUMNS.protein_synon] = protein_synon if protein_synon else None
+                # select the exon
+                nrow.update(flatten_fusion_translation(fusion_translation))
+                if ann.single_transcript() and ann.transcript1.translations:
+                    nrow[COLUMNS.fusion_protein_hgvs] = call_protein_indel(
+                        ann.transcript1.translations[0], fusion_translation, reference_genome
+                    )
+                rows.append(nrow)
+        else:
+            temp_row.update(ann_row)
+            rows.append(temp_row)
+    # draw the annotation and add the path to all applicable rows (one drawing for multiple annotated_events)
+    if any(
+        [
+            not ann.fusion and not draw_fusions_only,
+            ann.fusion and not draw_non_synonymous_cdna_only,
+            ann.fusion and draw_non_synonymous_cdna_only and not cdna_synon_all,
+        ]
+    ):
+        if defer_drawings:
+            record = drawing_record(ann, fusion_settings, template_metadata)
+        else:
+            drawing, legend = draw(
+                drawing_config, ann, reference_genome, template_metadata, drawings_directory
+            )
+            for row in rows + [ann_row]:
+                row[COLUMNS.annotation_figure] = drawing
+                row[COLUMNS.annotation_figure_legend] = legend
+    if not rows:
+        rows = [ann_row]
+    return ann_row, rows, fasta_records, record
+
+
+def _feature_record(feature):
+    if feature is None:
+        return None
+    elif isinstance(feature, IntergenicRegion):
+        return {
+            'chr': feature.chr,
+            'start': feature.start,
+            'end': feature.end,
+            'strand': feature.strand,
+        }
+    return {
+        'chr': feature.get_chr(),
+        'name': feature.name,
+        # domains by translation for each spliced transcript
+        'domains': [
+            [
+                [
+                    {
+                        'name': domain.name,
+                        'regions': [[region.start, region.end] for region in domain.regions],
+                        'data': domain.data,
+                    }
+                    for domain in translation.domains
+                ]
+                for translation in spl_tx.translations
+            ]
+            for spl_tx in feature.spliced_transcripts
+        ],
+    }
+
+
+def _template_record(template):
+    return {
+        'start': template.start,
+        'end': template.end,
+        'bands': [
+            {'start': band.start, 'end': band.end, 'name': band.name, 'data': band.data}
+            for band in template.bands
+        ],
+    }
+
+
+def drawing_record(ann, fusion_settings=None, template_metadata=None):
+    """
+    the compact (json serializable) inputs needed to redraw an annotation. Reference genes and transcripts are stored
+    by name, their domains and the bands of the templates are stored in full
+
+    Args:
+        ann (Annotation): the annotation to be drawn
+        fusion_settings (dict): the arguments used to build the fusion transcript of the annotation
+        template_metadata (dict of Template by str): the templates by chromosome name
+
+    Returns:
+        dict: the drawing record
+    """
+    template_metadata = {} if template_metadata is None else template_metadata
+    return {
+        'annotation_id': ann.annotation_id,
+        'break1': ann.break1.to_dict(),
+        'break2': ann.break2.to_dict(),
+        'opposing_strands': ann.opposing_strands,
+        'stranded': ann.stranded,
+        'untemplated_seq': ann.untemplated_seq,
+        'event_type': ann.event_type,
+        'protocol': ann.protocol,
+        'transcript1': _feature_record(ann.transcript1),
+        'transcript2': _feature_record(ann.transcript2),
+        'genes_overlapping_break1': sorted([g.name for g in ann.genes_overlapping_break1]),
+        'genes_overlapping_break2': sorted([g.name for g in ann.genes_overlapping_break2]),
+        'genes_proximal_to_break1': sorted([[g.name, d] for g, d in ann.genes_proximal_to_break1]),
+        'genes_proximal_to_break2': sorted([[g.name, d] for g, d in ann.genes_proximal_to_break2]),
+        'fusion': fusion_settings if ann.fusion else None,
+        'templates': {
+            chrom: _template_record(template_metadata[chrom])
+            for chrom in {ann.break1.chr, ann.break2.chr}
+            if chrom in template_metadata
+        },
+    }
+
+
+def annotation_from_drawing_record(record, genes_by_name, reference_genome):
+    """
+    rebuilds the annotation (and fusion transcript) described by a drawing record. The domains of the reference
+    transcripts are replaced by those stored in the record
+
+    Args:
+        record (dict): see :func:`drawing_record`
+        genes_by_name (dict): reference genes by chromosome and gene name (see :func:`_index_reference_genes`)
+        reference_genome (:class:`dict` of :class:`Bio.SeqRecord` by :class:`str`): dict of reference sequence
+            by template/chr name
+
+    Returns:
+        Annotation: the annotation to be drawn
+
+    Raises:
+        KeyError: if a gene or transcript is not found in the reference annotations
+    """
+
+    def feature(feature_record):
+        if feature_record is None:
+            return None
+        elif 'name' not in feature_record:
+            return IntergenicRegion(
+                feature_record['chr'],
+                feature_record['start'],
+                feature_record['end'],
+                feature_record['strand'],
+            )
+        for gene in genes_by_name[feature_record['chr']].values():
+            for pre_transcript in gene.transcripts:
+                if pre_transcript.name == feature_record['name']:
+                    for spl_tx, domains_by_translation in zip(
+                        pre_transcript.spliced_transcripts, feature_record['domains']
+                    ):
+                        for translation, domains in zip(
+                            spl_tx.translations, domains_by_translation
+                        ):
+                            translation.domains = [
+                                Domain(
+                                    domain['name'],
+                                    [tuple(region) for region in domain['regions']],
+                                    translation,
+                                    data=domain['data'],
+                                )
+                                for domain in domains
+                            ]
+                    return pre_transcript
+        raise KeyError('transcript not found in the reference annotations', feature_record)
+
+    breakpoints = []
+    for bp_record in [record['break1'], record['break2']]:
+        breakpoints.append(
+            Breakpoint(
+                bp_record['chr'],
+                bp_record['start'],
+                bp_record['end'],
+                orient=bp_record['orientation'],
+                strand=bp_record['strand'],
+                seq=bp_record['seq'],
+            )
+        )
+    bpp = BreakpointPair(
+        *breakpoints,
+        opposing_strands=record['opposing_strands'],
+        stranded=record['stranded'],
+        untemplated_seq=record['untemplated_seq'],
+        data={
+            COLUMNS.annotation_id: record['annotation_id'],
+            COLUMNS.event_type: record['event_type'],
+            COLUMNS.protocol: record['protocol'],
+        }
+    )
+    ann = Annotation(bpp, feature(record['transcript1']), feature(record['transcript2']))
+    for breakpoint in ['break1', 'break2']:
+        chrom = getattr(ann, breakpoint).chr
+        getattr(ann, 'genes_overlapping_' + breakpoint).update(
+            [genes_by_name[chrom][name] for name in record['genes_overlapping_' + breakpoint]]
+        )
+        getattr(ann, 'genes_proximal_to_' + breakpoint).update(
+            [
+                (genes_by_name[chrom][name], dist)
+                for name, dist in record['genes_proximal_to_' + breakpoint]
+            ]
+        )
+    if record['fusion'] is not None:
+        ann.fusion = FusionTranscript.build(ann, reference_genome, **record['fusion'])
+    return ann
+
+
+def templates_from_drawing_record(record):
+    """
+    rebuilds the templates (and their bands) stored in a drawing record
+
+    Args:
+        record (dict): see :func:`drawing_record`
+
+    Returns:
+        dict of Template by str: the templates by chromosome name
+    """
+    templates = {}
+    for chrom, template_record in record['templates'].items():
+        bands = [
+            BioInterval(None, band['start'], band['end'], name=band['name'], data=band['data'])
+            for band in template_record['bands']
+        ]
+        templates[chrom] = Template(
+            chrom, template_record['start'], template_record['end'], bands=bands
+        )
+    return templates
+
+
+def _index_reference_genes(annotations):
+    genes_by_name = {}
+    for chrom, genes in annotations.items():
+        for gene in genes:
+            genes_by_name.setdefault(chrom, {})[gene.name] = gene
+    return genes_by_name
+
+
+def _draw_records(records):
+    """
+    rebuild and draw a batch of deferred drawing records (called in the worker processes)
+    """
+    settings = _WORKER_SETTINGS['draw_records']
+    results = []
+    for record in records:
+        LOG('drawing', record['annotation_id'])
+        ann = annotation_from_drawing_record(
+            record, settings['genes_by_name'], settings['reference_genome']
+        )
+        drawing, legend = draw(
+            settings['drawing_config'],
+            ann,
+            settings['reference_genome'],
+            templates_from_drawing_record(record),
+            settings['drawings_directory'],
+        )
+        results.append((record['annotation_id'], drawing, legend))
+    return results
+
+
+_WORKER_SETTINGS = {}
+
+
+def _init_annotation_worker(settings):
+    # with fork the (read-only) reference data is shared with the parent process rather than copied
+    _WORKER_SETTINGS.update(settings)
+
+
+def _annotate_shard(bpps):
+    """
+    annotate a shard of breakpoint pairs and build their output rows (called in the worker processes)
+    """
+    settings = _WORKER_SETTINGS
+    results = []
+    for ann in annotate_events(bpps, log=LOG, **settings['annotate_events']):
+        LOG(
+            'current annotation',
+            ann.annotation_id,
+            ann.transcript1,
+            ann.transcript2,
+            ann.event_type,
+        )
+        results.append(annotate_rows(ann, **settings['annotate_rows']))
+    # the fusion cache stats are cumulative for the worker and are logged by the parent process
+    return os.getpid(), settings['annotate_events']['fusion_cache'].stats(), results
+
+
 def main(
     inputs,
     output,
@@ -129,6 +506,9 @@ def main(
     draw_fusions_only=DEFAULTS.draw_fusions_only,
     draw_non_synonymous_cdna_only=DEFAULTS.draw_non_synonymous_cdna_only,
     max_proximity=CLUSTER_DEFAULTS.max_proximity,
+    annotation_processes=DEFAULTS.annotation_processes,
+    fusion_cache_size=DEFAULTS.fusion_cache_size,
+    defer_drawings=DEFAULTS.defer_drawings,
     **kwargs
 ):
     """
@@ -141,6 +521,10 @@ def main(
         min_domain_mapping_match (float): min mapping match percent (0-1) to count a domain as mapped
         min_orf_size (int): minimum size of an :term:`open reading frame` to keep as a putative translation
         max_orf_cap (int): the maximum number of :term:`open reading frame` s to collect for any given event
+        annotation_processes (int): number of processes to annotate with (the fusion cache stats of each process are
+            logged once all the annotations are written)
+        fusion_cache_size (int): maximum number of built fusion transcripts to keep for re-use by equivalent annotations
+        defer_drawings (bool): write the drawing inputs to a sidecar file (see :func:`draw_main`) instead of drawing
     """
     # error early on missing input files
     annotations.files_exist()
@@ -171,23 +555,37 @@ def main(
 
     annotations.load()
     reference_genome.load()
-    annotated_events = annotate_events(
-        bpps,
-        reference_genome=reference_genome.content,
-        annotations=annotations.content,
-        min_orf_size=min_orf_size,
-        min_domain_mapping_match=min_domain_mapping_match,
-        max_proximity=max_proximity,
-        max_orf_cap=max_orf_cap,
-        log=LOG,
-        filters=annotation_filters,
-    )
-
     # now try generating the svg
     drawing_config = DiagramSettings(
         **{k: v for k, v in kwargs.items() if k in ILLUSTRATION_DEFAULTS}
     )
-
+    settings = {
+        'annotate_events': dict(
+            reference_genome=reference_genome.content,
+            annotations=annotations.content,
+            min_orf_size=min_orf_size,
+            min_domain_mapping_match=min_domain_mapping_match,
+            max_proximity=max_proximity,
+            max_orf_cap=max_orf_cap,
+            filters=annotation_filters,
+            fusion_cache=FusionTranscriptCache(fusion_cache_size),
+        ),
+        'annotate_rows': dict(
+            reference_genome=reference_genome.content,
+            template_metadata=template_metadata.content,
+            drawing_config=drawing_config,
+            drawings_directory=drawings_directory,
+            fa_output_file=fa_output_file,
+            draw_fusions_only=draw_fusions_only,
+            draw_non_synonymous_cdna_only=draw_non_synonymous_cdna_only,
+            defer_drawings=defer_drawings,
+            fusion_settings=dict(
+                min_orf_size=min_orf_size,
+                max_orf_cap=max_orf_cap,
+                min_domain_mapping_match=min_domain_mapping_match,
+            ),
+        ),
+    }
     header_req = {
         COLUMNS.break1_strand,
         COLUMNS.break2_strand,
@@ -211,104 +609,140 @@ def main(
     tabbed_fh = open(tabbed_output_file, 'w')
     LOG('opening for write:', fa_output_file)
     fasta_fh = open(fa_output_file, 'w')
+    drawings_fh = None
+    if defer_drawings:
+        drawings_file = os.path.join(output, DRAWINGS_FILENAME)
+        LOG('opening for write:', drawings_file)
+        drawings_fh = open(drawings_file, 'w')
 
+    pool = None
+    worker_stats = {}
     try:
-        total = len(annotated_events)
-        for i, ann in enumerate(annotated_events):
-            ann_row = ann.flatten()
-            ann_row[COLUMNS.fusion_sequence_fasta_file] = fa_output_file
+        if annotation_processes > 1 and len(bpps) > 1:
+            # several shards per process to balance the load. imap returns the results in the input order
+            shard_size = max(1, len(bpps) // (annotation_processes * 4))
+            shards = [bpps[i : i + shard_size] for i in range(0, len(bpps), shard_size)]
+            LOG('annotating {} shards with {} processes'.format(len(shards), annotation_processes))
+            pool = multiprocessing.Pool(
+                annotation_processes, initializer=_init_annotation_worker, initargs=(settings,)
+            )
+
+            def annotate_all():
+                for pid, stats, shard_results in pool.imap(_annotate_shard, shards):
+                    worker_stats[pid] = stats
+                    yield from shard_results
+
+        else:
+            annotated_events = annotate_events(bpps, log=LOG, **settings['annotate_events'])
+            LOG(settings['annotate_events']['fusion_cache'].stats())
+
+            def annotate_all():
+                total = len(annotated_events)
+                for i, ann in enumerate(annotated_events):
+                    LOG(
+                        '({} of {}) current annotation'.format(i + 1, total),
+                        ann.annotation_id,
+                        ann.transcript1,
+                        ann.transcript2,
+                        ann.event_type,
+                    )
+                    yield annotate_rows(ann, **settings['annotate_rows'])
+
+        for ann_row, rows, fasta_records, record in annotate_all():
             if header is None:
                 header_req.update(ann_row.keys())
                 header = sort_columns(header_req)
                 tabbed_fh.write('\t'.join([str(c) for c in header]) + '\n')
-            LOG(
-                '({} of {}) current annotation'.format(i + 1, total),
-                ann.annotation_id,
-                ann.transcript1,
-                ann.transcript2,
-                ann.event_type,
-            )
-            LOG(ann, time_stamp=False)
-            # get the reference sequences for either transcript
-            ref_cdna_seq = {}
-            ref_protein_seq = {}
-
-            for pre_transcript in [
-                x for x in [ann.transcript1, ann.transcript2] if isinstance(x, PreTranscript)
-            ]:
-                name = pre_transcript.name
-                for spl_tx in pre_transcript.spliced_transcripts:
-                    ref_cdna_seq.setdefault(spl_tx.get_seq(reference_genome.content), set()).add(
-                        name
-                    )
-                    for translation in spl_tx.translations:
-                        ref_protein_seq.setdefault(
-                            translation.get_aa_seq(reference_genome.content), set()
-                        ).add(name)
-
-            # try building the fusion product
-            rows = []
-            cdna_synon_all = True
-            # add fusion information to the current ann_row
-            for spl_fusion_tx in [] if not ann.fusion else ann.fusion.transcripts:
-                seq = ann.fusion.get_cdna_seq(spl_fusion_tx.splicing_pattern)
-                # make the fasta id a hex of the string to avoid having to load the sequences later
-                fusion_fa_id = 'seq-{}'.format(hashlib.md5(seq.encode('utf-8')).hexdigest())
+            for fusion_fa_id, seq in fasta_records:
                 fasta_fh.write('> {}\n{}\n'.format(fusion_fa_id, seq))
-                cdna_synon = ';'.join(sorted(list(ref_cdna_seq.get(seq, set()))))
-
-                temp_row = {}
-                temp_row.update(ann_row)
-                temp_row.update(flatten_fusion_transcript(spl_fusion_tx))
-                temp_row[COLUMNS.fusion_sequence_fasta_id] = fusion_fa_id
-                temp_row[COLUMNS.cdna_synon] = cdna_synon if cdna_synon else None
-                if not cdna_synon:
-                    cdna_synon_all = False
-                if spl_fusion_tx.translations:
-                    # duplicate the ann_row for each translation
-                    for fusion_translation in spl_fusion_tx.translations:
-                        nrow = dict()
-                        nrow.update(ann_row)
-                        nrow.update(temp_row)
-                        aa_seq = fusion_translation.get_aa_seq()
-                        protein_synon = ';'.join(sorted(list(ref_protein_seq.get(aa_seq, set()))))
-                        nrow[COLUMNS.protein_synon] = protein_synon if protein_synon else None
-                        # select the exon
-                        nrow.update(flatten_fusion_translation(fusion_translation))
-                        if ann.single_transcript() and ann.transcript1.translations:
-                            nrow[COLUMNS.fusion_protein_hgvs] = call_protein_indel(
-                                ann.transcript1.translations[0],
-                                fusion_translation,
-                                reference_genome.content,
-                            )
-                        rows.append(nrow)
-                else:
-                    temp_row.update(ann_row)
-                    rows.append(temp_row)
-            # draw the annotation and add the path to all applicable rows (one drawing for multiple annotated_events)
-            if any(
-                [
-                    not ann.fusion and not draw_fusions_only,
-                    ann.fusion and not draw_non_synonymous_cdna_only,
-                    ann.fusion and draw_non_synonymous_cdna_only and not cdna_synon_all,
-                ]
-            ):
-                drawing, legend = draw(
-                    drawing_config,
-                    ann,
-                    reference_genome.content,
-                    template_metadata.content,
-                    drawings_directory,
-                )
-                for row in rows + [ann_row]:
-                    row[COLUMNS.annotation_figure] = drawing
-                    row[COLUMNS.annotation_figure_legend] = legend
-            if not rows:
-                rows = [ann_row]
             for row in rows:
                 tabbed_fh.write('\t'.join([str(row.get(k, None)) for k in header]) + '\n')
+            if record is not None:
+                drawings_fh.write(json.dumps(record, sort_keys=True) + '\n')
+        for pid, stats in sorted(worker_stats.items()):
+            LOG('annotation process', pid, stats)
     finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
         LOG('closing:', tabbed_output_file)
         tabbed_fh.close()
         LOG('closing:', fa_output_file)
         fasta_fh.close()
+        if drawings_fh is not None:
+            LOG('closing:', drawings_fh.name)
+            drawings_fh.close()
+
+
+def draw_main(
+    inputs,
+    output,
+    reference_genome,
+    annotations,
+    annotation_ids=None,
+    annotation_processes=DEFAULTS.annotation_processes,
+    **kwargs
+):
+    """
+    draws the illustrations deferred by annotate (see :term:`defer_drawings`). Writes the drawings and a table of the
+    drawing and legend file for each annotation id to the output directory
+
+    Args:
+        inputs (:class:`List` of :class:`str`): the deferred drawing files (annotations.drawings.jsonl)
+        output (str): path to the output directory
+        reference_genome (:class:`~mavis.annotate.file_io.ReferenceFile`): see :func:`~mavis.annotate.file_io.load_reference_genome`
+        annotations (:class:`~mavis.annotate.file_io.ReferenceFile`): see :func:`~mavis.annotate.file_io.load_reference_genes`
+        annotation_ids (:class:`List` of :class:`str`): only draw these annotations (all if not given)
+        annotation_processes (int): number of processes to draw with
+
+    Returns:
+        :class:`list` of :class:`tuple`: the annotation id, drawing file and legend file for each record drawn
+    """
+    records = []
+    for filename in inputs:
+        LOG('reading:', filename)
+        with open(filename, 'r') as fh:
+            for line in fh:
+                if line.strip():
+                    records.append(json.loads(line))
+    if annotation_ids:
+        annotation_ids = set(annotation_ids)
+        records = [r for r in records if r['annotation_id'] in annotation_ids]
+    LOG('drawing {} annotations'.format(len(records)))
+
+    annotations.load()
+    reference_genome.load()
+    mkdirp(output)
+    settings = {
+        'draw_records': dict(
+            genes_by_name=_index_reference_genes(annotations.content),
+            reference_genome=reference_genome.content,
+            drawing_config=DiagramSettings(
+                **{k: v for k, v in kwargs.items() if k in ILLUSTRATION_DEFAULTS}
+            ),
+            drawings_directory=output,
+        )
+    }
+    if annotation_processes > 1 and len(records) > 1:
+        chunk_size = max(1, len(records) // (annotation_processes * 4))
+        chunks = [records[i : i + chunk_size] for i in range(0, len(records), chunk_size)]
+        with multiprocessing.Pool(
+            annotation_processes, initializer=_init_annotation_worker, initargs=(settings,)
+        ) as pool:
+            results = list(itertools.chain.from_iterable(pool.imap(_draw_records, chunks)))
+    else:
+        _init_annotation_worker(settings)
+        results = _draw_records(records)
+
+    table_file = os.path.join(output, 'drawings.tab')
+    LOG('writing:', table_file)
+    with open(table_file, 'w') as fh:
+        fh.write(
+            '\t'.join(
+                [COLUMNS.annotation_id, COLUMNS.annotation_figure, COLUMNS.annotation_figure_legend]
+            )
+            + '\n'
+        )
+        for row in results:
+            fh.write('\t'.join([str(c) for c in row]) + '\n')
+    return results
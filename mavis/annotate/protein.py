@@ -1,4 +1,6 @@
+import heapq
 import itertools
+import re
 
 from .base import BioInterval
 from ..constants import CODON_SIZE, START_AA, STOP_AA, translate
@@ -6,37 +8,53 @@ from ..error import NotSpecifiedError
 from ..interval import Interval
 
 
-def calculate_orf(spliced_cdna_sequence, min_orf_size=None):
+#: codons which always translate to the start (``M``) or stop (``*``) amino acids, including
+#: the ambiguous stop codons recognized by the standard ambiguous DNA codon table
+START_CODONS = {'ATG'}
+STOP_CODONS = {'TAA', 'TAG', 'TGA', 'TAR', 'TRA'}
+_ORF_CODON_PATTERN = re.compile(
+    '(?=({}))'.format('|'.join(sorted(START_CODONS | STOP_CODONS))), re.IGNORECASE
+)
+
+
+def calculate_orf(spliced_cdna_sequence, min_orf_size=None, max_orf_cap=None):
     """
     calculate all possible open reading frames given a spliced cdna sequence (no introns)
 
+    Start and stop codons are located directly on the nucleotide sequence and then assigned to
+    their reading frame, rather than translating the full sequence in each frame
+
     Args:
         spliced_cdna_sequence (str): the sequence
+        min_orf_size (int): minimum length of an open reading frame to be reported
+        max_orf_cap (int): if given, only the longest max_orf_cap open reading frames are kept (ties
+            favour the frame/position ordering)
 
     Returns:
         :any:`list` of :any:`Interval`: list of open reading frame positions on the input sequence
+            ordered by reading frame and then position
     """
     # do not revcomp
     assert START_AA != STOP_AA
-    cds_orfs = []  # (cds_start, cds_end)
-    for offset in range(0, CODON_SIZE):
-        aa_sequence = translate(spliced_cdna_sequence, offset)
-        # now calc the open reading frames
-        orf_intervals = []
-        current_start = None
-        for i, curr_amino_acid in enumerate(aa_sequence):
-            if curr_amino_acid == START_AA:
-                pos = i * CODON_SIZE + 1 + offset
-                if current_start is None:
-                    current_start = pos
-            elif curr_amino_acid == STOP_AA:
-                pos = (i + 1) * CODON_SIZE + offset
-                if current_start is not None:  # close the current interval
-                    itvl = Interval(current_start, pos)
-                    if min_orf_size is None or len(itvl) >= min_orf_size:
-                        orf_intervals.append(itvl)
-                    current_start = None
-        cds_orfs.extend(orf_intervals)
+    current_start = [None] * CODON_SIZE
+    cds_orfs = [[] for _ in range(CODON_SIZE)]  # (cds_start, cds_end) per reading frame
+    for match in _ORF_CODON_PATTERN.finditer(spliced_cdna_sequence):
+        pos = match.start()
+        frame = pos % CODON_SIZE
+        if match.group(1).upper() in START_CODONS:
+            if current_start[frame] is None:
+                current_start[frame] = pos + 1
+        elif current_start[frame] is not None:  # close the current interval
+            end = pos + CODON_SIZE
+            if min_orf_size is None or end - current_start[frame] + 1 >= min_orf_size:
+                cds_orfs[frame].append(Interval(current_start[frame], end))
+            current_start[frame] = None
+    cds_orfs = list(itertools.chain.from_iterable(cds_orfs))
+    if max_orf_cap and len(cds_orfs) > max_orf_cap:
+        longest = heapq.nlargest(
+            max_orf_cap, range(len(cds_orfs)), key=lambda i: (len(cds_orfs[i]), -i)
+        )
+        cds_orfs = [cds_orfs[i] for i in sorted(longest)]
     return cds_orfs
 
 
@@ -180,60 +198,110 @@ class Domain:
         if total > len(input_sequence):
             raise UserWarning('could not map the sequences to the input')
 
+        target = input_sequence.upper()
+        target_codes = None  # only encoded if some region does not match exactly
         results = []
         last_min_end = 0
         for seq in seq_list:
             # align the current sequence to find the best matches
-            scores = []
             min_match = max(1, int(round(len(seq) * min_region_match, 0)))
-            for pos in range(last_min_end, len(input_sequence) - len(seq) + 1):
-                score = 0
-                for i in range(0, len(seq)):
-                    if input_sequence[pos + i].upper() == seq[i].upper():
-                        score += 1
-                if score > min_match:
-                    scores.append((Interval(pos + 1, pos + len(seq)), score))
-            if not scores:
+            query = seq.upper()
+            positions = _exact_region_placements(query, target, last_min_end)
+            score = len(seq)
+            if not positions or score <= min_match:
+                if target_codes is None:
+                    target_codes = _encode_protein(target)
+                positions, score = _best_region_placements(
+                    _encode_protein(query), target_codes, last_min_end
+                )
+            if not positions or score <= min_match:
                 raise UserWarning('could not align a given region', seq)
-            best_score = max([s[1] for s in scores])
-            best = [s for s in scores if s[1] == best_score]
-            results.append(best)
-            last_min_end = min([s[0].end for s in best])
-        # take the best score for each region and see if they work in sequence
-        combinations = [[p] for p in results[0]]
-        for scores in results[1:]:
-            temp_combos = []
-            for pos, score in scores:
-                for curr in combinations:
-                    if pos.start > curr[-1][0].end:
-                        temp_combos.append(curr[:] + [(pos, score)])
-            combinations = temp_combos
-            if not combinations:
-                break
-
-        # compute the cumulative scores for the putative alignments
-        best_score = None
-        best_scoring_alignments = []
-        for alignment in combinations:
-            cumu_score = sum([s[1] for s in alignment])
-            if not best_scoring_alignments or cumu_score > best_score:
-                best_scoring_alignments = [alignment]
-                best_score = cumu_score
-            elif cumu_score == best_score:
-                best_scoring_alignments.append(alignment)
-
-        if not best_scoring_alignments:
+            results.append((score, [Interval(pos + 1, pos + len(seq)) for pos in positions]))
+            last_min_end = min([itvl.end for itvl in results[-1][1]])
+        # every placement of a region has the same (best) score so any chain of non-overlapping
+        # placements has the same cumulative score. Count the chains ending at each placement
+        # (capped at 2 since only uniqueness matters) and remember the previous placement
+        chains = [[(1, None)] * len(results[0][1])]
+        for region_index in range(1, len(results)):
+            prev_placements = results[region_index - 1][1]
+            prev_chains = chains[-1]
+            curr_chains = []
+            for itvl in results[region_index][1]:
+                count = 0
+                link = None
+                for prev_index, prev_itvl in enumerate(prev_placements):
+                    if itvl.start > prev_itvl.end and prev_chains[prev_index][0]:
+                        count = min(2, count + prev_chains[prev_index][0])
+                        link = prev_index
+                curr_chains.append((count, link))
+            chains.append(curr_chains)
+        num_alignments = min(2, sum([count for count, link in chains[-1]]))
+
+        if not num_alignments:
             raise UserWarning('could not map the sequences to the input')
-        elif len(best_scoring_alignments) > 1:
+        elif num_alignments > 1:
             raise UserWarning('multiple mappings of equal score')
         else:
-            alignment = [s[0] for s in best_scoring_alignments[0]]
+            # trace the unique chain back from the last region
+            index = [i for i, (count, link) in enumerate(chains[-1]) if count][0]
+            alignment = []
+            for region_index in range(len(results) - 1, -1, -1):
+                alignment.append(results[region_index][1][index])
+                index = chains[region_index][index][1]
+            alignment.reverse()
+            best_score = sum([score for score, placements in results])
             regions = []
             for itvl, seq in zip(alignment, seq_list):
                 regions.append(DomainRegion(itvl.start, itvl.end, seq))
             return best_score, total, regions
 
 
+def _exact_region_placements(query, target, start):
+    """
+    find all (possibly overlapping) exact matches of a query sequence in the target sequence
+
+    Returns:
+        :any:`list` of :any:`int`: the 0-based start positions of the matches at or after start
+    """
+    positions = []
+    pos = target.find(query, start)
+    while pos >= 0:
+        positions.append(pos)
+        pos = target.find(query, pos + 1)
+    return positions
+
+
+def _encode_protein(seq):
+    import numpy as np
+
+    return np.frombuffer(seq.encode('latin-1'), dtype=np.uint8)
+
+
+def _best_region_placements(query_codes, target_codes, start):
+    """
+    score the query against every ungapped placement in the target (from start) by the number of
+    matching characters
+
+    Args:
+        query_codes (numpy.ndarray): the encoded (upper-cased) region sequence
+        target_codes (numpy.ndarray): the encoded (upper-cased) sequence to align to
+        start (int): the first 0-based position a placement may start at
+
+    Returns:
+        tuple: the list of 0-based start positions with the best score and the best score
+    """
+    import numpy as np
+
+    num_positions = len(target_codes) - len(query_codes) + 1 - start
+    if num_positions <= 0:
+        return [], 0
+    scores = np.zeros(num_positions, dtype=np.int64)
+    for i, code in enumerate(query_codes):
+        scores += target_codes[start + i : start + i + num_positions] == code
+    best_score = int(scores.max())
+    return [int(pos) + start for pos in np.flatnonzero(scores == best_score)], best_score
+
+
 class Translation(BioInterval):
     def __init__(self, start, end, transcript=None, domains=None, seq=None, name=None):
         """
@@ -2,7 +2,7 @@ import itertools
 import json
 from shortuuid import uuid
 
-from .fusion import determine_prime, FusionTranscript
+from .fusion import determine_prime, FusionTranscript, FusionTranscriptCache
 from .genomic import IntergenicRegion
 from ..breakpoint import Breakpoint, BreakpointPair
 from ..constants import COLUMNS, GENE_PRODUCT_TYPE, PROTOCOL, STOP_AA, STRAND, SVTYPE
@@ -834,6 +834,7 @@ def annotate_events(
     max_orf_cap=3,
     log=DEVNULL,
     filters=None,
+    fusion_cache=None,
 ):
     """
     Args:
@@ -846,12 +847,15 @@ def annotate_events(
         max_orf_cap (int): see :term:`max_orf_cap`
         log (callable): callable function to take in strings and time_stamp args
         filters (list of callable): list of functions taking in a list and returning a list for filtering
+        fusion_cache (FusionTranscriptCache): cache of fusion transcripts shared between equivalent annotations
 
     Returns:
         list of :class:`Annotation`: list of the putative annotations
     """
     if filters is None:
         filters = [choose_more_annotated, choose_transcripts_by_priority]
+    if fusion_cache is None:
+        fusion_cache = FusionTranscriptCache(0)
     results = []
     total = len(bpps)
     for i, bpp in enumerate(bpps):
@@ -871,7 +875,7 @@ def annotate_events(
                 ann.data[COLUMNS.assumed_untemplated] = False
             # try building the fusion product
             try:
-                ft = FusionTranscript.build(
+                ft = fusion_cache.build(
                     ann,
                     reference_genome,
                     min_orf_size=min_orf_size,
@@ -1,3 +1,4 @@
+from collections import Counter
 import itertools
 import warnings
 
@@ -346,6 +347,7 @@ def assemble(
     assembly_min_uniq=0.01,
     min_complexity=0,
     log=lambda *pos, **kwargs: None,
+    stats=None,
     **kwargs
 ):
     """
@@ -365,6 +367,7 @@ def assemble(
         remap_min_exact_match: see :term:`assembly_min_exact_match_to_remap`
         assembly_max_paths: see :term:`assembly_max_paths`
         log (function): the log function
+        stats (dict): if given, updated with the size of the assembly graph and the number of paths pulled from it
 
     Returns:
         :class:`list` of :class:`Contig`: a list of putative contigs
@@ -403,6 +406,11 @@ def assemble(
     assembly.trim_forks_by_freq(min_edge_trim_weight)
     assembly.trim_tails_by_freq(min_edge_trim_weight)
     assembly.trim_noncutting_paths_by_freq(min_edge_trim_weight)
+    if stats is not None:
+        stats.update(
+            assembly_graph_nodes=assembly.number_of_nodes(),
+            assembly_graph_edges=assembly.number_of_edges(),
+        )
 
     path_scores = {}
     for component in digraph_connected_components(assembly):
@@ -418,6 +426,8 @@ def assemble(
             )
         )
 
+    if stats is not None:
+        stats['assembly_paths'] = len(path_scores)
     # now map the contigs to the possible input sequences
     log('filtering contigs by size and complexity', len(path_scores), time_stamp=False)
     contigs = []
@@ -430,9 +440,15 @@ def assemble(
     log('filtering similar contigs', len(contigs))
     # remap the input reads
     contigs = filter_contigs(contigs, assembly_min_uniq)
-    log('remapping reads to {} contigs'.format(len(contigs)))
+    # duplicate sequences give identical alignments so each distinct sequence is only remapped once
+    remap_counts = Counter(iter(sequences))
+    log(
+        'remapping {} distinct of {} reads to {} contigs'.format(
+            len(remap_counts), sum(remap_counts.values()), len(contigs)
+        )
+    )
 
-    for input_seq in sequences:
+    for input_seq in remap_counts:
         maps_to = {}  # contig, score
         for contig in contigs:
             alignment = nsb_align(
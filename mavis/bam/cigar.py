@@ -4,6 +4,9 @@ an iterable list of tuples where the first element in each tuple is the
 CIGAR value (i.e. 1 for an insertion), and the second value is the frequency
 """
 import re
+
+import numpy as np
+
 from ..constants import CIGAR, DNA_ALPHABET, GAP
 
 EVENT_STATES = {CIGAR.D, CIGAR.I, CIGAR.X}
@@ -13,7 +16,44 @@ QUERY_ALIGNED_STATES = ALIGNED_STATES | {CIGAR.I, CIGAR.S}
 CLIPPING_STATE = {CIGAR.S, CIGAR.H}
 
 
-def recompute_cigar_mismatch(read, ref):
+def _ambiguous_match_table():
+    """
+    lookup table (indexed by the byte values of the reference and query characters) of the ambiguous dna
+    matches (see :attr:`~mavis.constants.DNA_ALPHABET`)
+    """
+    if _AMBIGUOUS_MATCH_TABLE[0] is None:
+        chars = [chr(i) for i in range(256)]
+        _AMBIGUOUS_MATCH_TABLE[0] = np.array(
+            [[DNA_ALPHABET.match(x, y) for y in chars] for x in chars], dtype=bool
+        )
+    return _AMBIGUOUS_MATCH_TABLE[0]
+
+
+_AMBIGUOUS_MATCH_TABLE = [None]
+
+
+def _mismatch_runs(ref_seq, query_seq):
+    """
+    compare an aligned block of reference and query sequence
+
+    Returns:
+        :class:`list` of :class:`tuple` of :class:`int` and :class:`int`: the =/X cigar tuples for the block
+    """
+    if ref_seq == query_seq:
+        return [(CIGAR.EQ, len(ref_seq))]
+    matches = _ambiguous_match_table()[
+        np.frombuffer(ref_seq.encode('latin-1'), dtype=np.uint8),
+        np.frombuffer(query_seq.encode('latin-1'), dtype=np.uint8),
+    ]
+    run_starts = np.flatnonzero(matches[1:] != matches[:-1]) + 1
+    run_bounds = [0] + run_starts.tolist() + [len(matches)]
+    result = []
+    for run_start, run_end in zip(run_bounds, run_bounds[1:]):
+        result.append((CIGAR.EQ if matches[run_start] else CIGAR.X, run_end - run_start))
+    return result
+
+
+def recompute_cigar_mismatch(read, ref, reference_offset=0):
     """
     for cigar tuples where M is used, recompute to replace with X/= for increased
     utility and specificity
@@ -21,31 +61,34 @@ def recompute_cigar_mismatch(read, ref):
     Args:
         read (pysam.AlignedSegment): the input read
         ref (str): the reference sequence
+        reference_offset (int): the genomic position of the first base of the reference sequence
 
     Returns:
         :class:`list` of :class:`tuple` of :class:`int` and :class:`int`: the cigar tuple
     """
     result = []
-    offset = 0
 
-    ref_pos = read.reference_start
+    ref_pos = read.reference_start - reference_offset
     seq_pos = 0
+    query_sequence = read.query_sequence
+    ref = getattr(ref, 'seq', ref)  # slice the sequence rather than the SeqRecord
 
     for cigar_value, freq in read.cigar:
         if cigar_value in ALIGNED_STATES:
-            for offset in range(0, freq):
-                if DNA_ALPHABET.match(ref[ref_pos], read.query_sequence[seq_pos]):
-                    if len(result) == 0 or result[-1][0] != CIGAR.EQ:
-                        result.append((CIGAR.EQ, 1))
-                    else:
-                        result[-1] = (CIGAR.EQ, result[-1][1] + 1)
+            ref_seq = str(ref[ref_pos : ref_pos + freq])
+            if len(ref_seq) < freq:
+                raise IndexError('aligned block extends past the end of the reference sequence')
+            query_seq = query_sequence[seq_pos : seq_pos + freq]
+            if len(query_seq) < freq:
+                raise IndexError('aligned block extends past the end of the query sequence')
+            # compare the block as a whole and join the first run to any preceding =/X run
+            for state, run_freq in _mismatch_runs(ref_seq, query_seq):
+                if result and result[-1][0] == state:
+                    result[-1] = (state, result[-1][1] + run_freq)
                 else:
-                    if len(result) == 0 or result[-1][0] != CIGAR.X:
-                        result.append((CIGAR.X, 1))
-                    else:
-                        result[-1] = (CIGAR.X, result[-1][1] + 1)
-                ref_pos += 1
-                seq_pos += 1
+                    result.append((state, run_freq))
+            ref_pos += freq
+            seq_pos += freq
             continue
         if cigar_value in QUERY_ALIGNED_STATES:
             seq_pos += freq
@@ -301,10 +344,15 @@ def merge_indels(cigar):
     return new_cigar
 
 
-def hgvs_standardize_cigar(read, reference_seq):
+def hgvs_standardize_cigar(read, reference_seq, reference_offset=0):
     """
     extend alignments as long as matches are possible.
     call insertions before deletions
+
+    Args:
+        read (pysam.AlignedSegment): the input read
+        reference_seq (str): the reference sequence
+        reference_offset (int): the genomic position of the first base of the reference sequence
     """
     cigar = join(read.cigar)
     new_cigar = []
@@ -327,7 +375,7 @@ def hgvs_standardize_cigar(read, reference_seq):
             new_cigar.append(cigar[i])
     new_cigar = merge_indels(new_cigar)
     # now we need to extend any insertions
-    rpos = read.reference_start
+    rpos = read.reference_start - reference_offset
     qpos = 0
     cigar = [new_cigar[0]]
     if cigar[0][0] in REFERENCE_ALIGNED_STATES:
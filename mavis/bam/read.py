@@ -1,8 +1,10 @@
+from collections import Counter
 from copy import copy
 import itertools
 import re
 import subprocess
 
+import numpy as np
 import pysam
 from Bio.Data import IUPACData as iupac
 
@@ -159,6 +161,82 @@ class SamRead(pysam.AlignedSegment):
         return hash(self.key())
 
 
+def _aligned_blocks(read):
+    """
+    Args:
+        read (pysam.AlignedSegment): the read
+
+    Returns:
+        list of tuple of int and int: 0-based half-open reference ranges of the gapless aligned blocks of the read
+    """
+    try:
+        return read.get_blocks()
+    except AttributeError:  # fall back to collapsing the individual aligned positions
+        blocks = []
+        for pos in read.get_reference_positions():
+            if blocks and blocks[-1][1] == pos:
+                blocks[-1][1] = pos + 1
+            else:
+                blocks.append([pos, pos + 1])
+        return blocks
+
+
+def _block_depth(blocks, start, end):
+    """
+    Args:
+        blocks (iterable of tuple of int and int): 0-based half-open reference ranges
+        start (int): start of the window (1-based inclusive)
+        end (int): end of the window (1-based inclusive)
+
+    Returns:
+        numpy.ndarray: the number of blocks covering each position of the window
+    """
+    if end < start:
+        return np.zeros(0, dtype=np.int64)
+    block_starts = []
+    block_ends = []
+    for block_start, block_end in blocks:
+        # convert the 0-based half-open block to offsets into the 1-based window
+        block_start = max(block_start + 1, start) - start
+        block_end = min(block_end, end) - start + 1
+        if block_start < block_end:
+            block_starts.append(block_start)
+            block_ends.append(block_end)
+    diff = np.zeros(end - start + 2, dtype=np.int64)
+    np.add.at(diff, np.array(block_starts, dtype=np.int64), 1)
+    np.add.at(diff, np.array(block_ends, dtype=np.int64), -1)
+    return np.cumsum(diff[:-1])
+
+
+def coverage(reads, start, end, filter_func=None, bin_size=1):
+    """
+    Compute the read depth over a genomic window from the aligned blocks of the reads (excluding those for which
+    the filter_func returns True). Each block adds to a difference array which is then prefix-summed so the
+    cost depends on the number of blocks rather than the number of aligned positions
+
+    Args:
+        reads (iterable of pysam.AlignedSegment): reads to pileup
+        start (int): start of the window (1-based inclusive)
+        end (int): end of the window (1-based inclusive)
+        filter_func (callable): function which takes in a  read and returns True if it should be ignored and False otherwise
+        bin_size (int): number of consecutive positions to average together
+
+    Returns:
+        numpy.ndarray: the read count at each position of the window (or the mean read count of each bin when the bin_size is greater than 1)
+    """
+    blocks = []
+    for read in reads:
+        if filter_func and filter_func(read):
+            continue
+        blocks.extend(_aligned_blocks(read))
+    depth = _block_depth(blocks, start, end)
+    if bin_size <= 1 or not depth.shape[0]:
+        return depth
+    bin_starts = np.arange(0, depth.shape[0], bin_size)
+    bin_lengths = np.diff(np.append(bin_starts, depth.shape[0]))
+    return np.add.reduceat(depth, bin_starts) / bin_lengths
+
+
 def pileup(reads, filter_func=None):
     """
     For a given set of reads generate a pileup of all reads (excluding those for which the filter_func returns True)
@@ -173,13 +251,18 @@ def pileup(reads, filter_func=None):
     Note:
         returns positions using 1-based indexing
     """
-    hist = {}  # genome position => frequency count
+    blocks = []
     for read in reads:
         if filter_func and filter_func(read):
             continue
-        for pos in read.get_reference_positions():
-            hist[pos + 1] = hist.get(pos + 1, 0) + 1
-    return sorted(hist.items())
+        blocks.extend(_aligned_blocks(read))
+    if not blocks:
+        return []
+    start = min(s for s, e in blocks) + 1
+    end = max(e for s, e in blocks)
+    depth = _block_depth(blocks, start, end)
+    positions = np.flatnonzero(depth)
+    return list(zip((positions + start).tolist(), depth[positions].tolist()))
 
 
 def map_ref_range_to_query_range(read, ref_range):
@@ -290,6 +373,36 @@ def calculate_alignment_score(read, consec_bonus=1):
     return score / max_score
 
 
+def kmer_index(ref, kmer_size):
+    """
+    indexes the positions of all k-mers in a reference sequence for re-use as alignment seeds
+    (see :func:`nsb_align`)
+
+    Args:
+        ref (str): the reference sequence
+        kmer_size (int): the k-mer length
+
+    Returns:
+        :class:`dict` of :class:`list` of :class:`int` by :class:`str`: the sorted (overlapping) start positions of each k-mer
+    """
+    ref = str(ref)
+    index = {}
+    for i in range(0, len(ref) - kmer_size + 1):
+        index.setdefault(ref[i : i + kmer_size], []).append(i)
+    return index
+
+
+def _non_overlapping(positions, kmer_size):
+    """
+    reduce sorted k-mer positions to the non-overlapping matches (as found by re.finditer)
+    """
+    result = []
+    for pos in positions:
+        if not result or pos >= result[-1] + kmer_size:
+            result.append(pos)
+    return result
+
+
 def nsb_align(
     ref,
     seq,
@@ -298,6 +411,7 @@ def nsb_align(
     min_match=0,
     min_consecutive_match=1,
     scoring_function=calculate_alignment_score,
+    ref_kmer_index=None,
 ):
     """
     given some reference string and a smaller sequence string computes the best non-space-breaking alignment
@@ -314,6 +428,9 @@ def nsb_align(
         min_match (float): the minimum number of matches compared to total
         scoring_function (callable): any function that will take a read as input and return a float
           used in comparing alignments to choose the best alignment
+        ref_kmer_index (dict): pre-computed k-mer positions of the reference (see :func:`kmer_index`) for k-mers of
+          the min_consecutive_match length. Used to seed the alignments instead of searching the reference for each
+          k-mer
 
     Returns:
         :class:`list` of :class:`~pysam.AlignedSegment`: list of aligned segments
@@ -349,7 +466,10 @@ def nsb_align(
             if current_kmer in kmers_checked:
                 putative_start_positions.update([p - i for p in kmers_checked[current_kmer]])
                 continue
-            rp = [m.start() for m in re.finditer(current_kmer, ref)]
+            if ref_kmer_index is not None:
+                rp = _non_overlapping(ref_kmer_index.get(current_kmer, []), min_consecutive_match)
+            else:
+                rp = [m.start() for m in re.finditer(current_kmer, ref)]
             kmers_checked[current_kmer] = rp
             putative_start_positions.update([p - i for p in rp])
     for ref_start in putative_start_positions:
@@ -576,6 +696,14 @@ def convert_events_to_softclipping(read, orientation, max_event_size, min_anchor
     return read
 
 
+# ambiguous bases are split evenly between the bases they represent. Counts are scaled so these splits stay integers
+_COMPLEXITY_SCALE = 12
+_COMPLEXITY_WEIGHTS = {
+    ambig_base: {base: _COMPLEXITY_SCALE // len(values) for base in values}
+    for ambig_base, values in iupac.ambiguous_dna_values.items()
+}
+
+
 def sequence_complexity(seq):
     """
     basic measure of sequence complexity
@@ -583,10 +711,9 @@ def sequence_complexity(seq):
     if not seq:
         return 0
     hist = {c: 0 for c in iupac.unambiguous_dna_letters}
-    for ambig_base in seq.upper():
-        values = iupac.ambiguous_dna_values[ambig_base]
-        for base in values:  # ignore N's etc
-            hist[base] += 1 / len(values)
+    for ambig_base, freq in Counter(seq.upper()).items():
+        for base, weight in _COMPLEXITY_WEIGHTS[ambig_base].items():  # ignore N's etc
+            hist[base] += freq * weight
     total = sum(hist.values())
     scores = [
         (hist[base1] + hist[base2]) / total
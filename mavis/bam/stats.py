@@ -1,11 +1,14 @@
 #!/projects/tumour_char/analysis_scripts/python/centos06/anaconda3_v2.3.0/bin/python
 import math
+import multiprocessing
 import statistics as stats
 import warnings
 
 import os
 
-from .read import sequenced_strand
+import numpy as np
+import pysam
+
 from ..constants import STRAND
 
 os.environ["OMP_NUM_THREADS"] = "4"  # export OMP_NUM_THREADS=4
@@ -103,6 +106,222 @@ class Histogram(dict):
         return result
 
 
+class DepthMap:
+    """
+    coarse map of the read density (reads per base) along each chromosome, used to predict how many reads will be
+    fetched for a region before any reads are decoded
+
+    Attributes:
+        bin_size (int): the length of each bin
+        density (:class:`dict` of :class:`list` of :class:`float` by :class:`str`): the read density of each bin by chromosome
+    """
+
+    def __init__(self, bin_size, density=None):
+        self.bin_size = bin_size
+        self.density = {} if density is None else density
+        values = sorted([d for bins in self.density.values() for d in bins if d > 0])
+        self.median_density = stats.median(values) if values else 0
+
+    def expected_reads(self, chrom, start, end):
+        """
+        Args:
+            chrom (str): the chromosome name
+            start (int): the start of the region (1-based inclusive)
+            end (int): the end of the region (1-based inclusive)
+
+        Returns:
+            float: the expected number of reads in the region or None if the chromosome is not in the map
+        """
+        bins = self.density.get(chrom, None)
+        if bins is None:
+            return None
+        total = 0
+        for index in range(
+            (start - 1) // self.bin_size, min(len(bins), (end - 1) // self.bin_size + 1)
+        ):
+            overlap = (
+                min(end, (index + 1) * self.bin_size) - max(start, index * self.bin_size + 1) + 1
+            )
+            total += bins[index] * overlap
+        return total
+
+    def fold(self, chrom, start, end):
+        """
+        the density of the region relative to the median bin density (or None if the region is not in the map)
+        """
+        expected = self.expected_reads(chrom, start, end)
+        if expected is None or not self.median_density:
+            return None
+        return expected / (end - start + 1) / self.median_density
+
+    def write(self, filename):
+        with open(filename, 'w') as fh:
+            fh.write('#chr\tstart\tend\tdensity\n')
+            for chrom, bins in sorted(self.density.items()):
+                for index, density in enumerate(bins):
+                    fh.write(
+                        '{}\t{}\t{}\t{}\n'.format(
+                            chrom, index * self.bin_size + 1, (index + 1) * self.bin_size, density
+                        )
+                    )
+
+    @classmethod
+    def read(cls, filename):
+        density = {}
+        bin_size = None
+        with open(filename, 'r') as fh:
+            for line in fh:
+                if line.startswith('#') or not line.strip():
+                    continue
+                chrom, start, end, value = line.rstrip('\n').split('\t')
+                bin_size = int(end) - int(start) + 1
+                density.setdefault(chrom, []).append(float(value))
+        return cls(bin_size, density)
+
+
+def compute_depth_map(bam_cache, bin_size=1000000, sample_size=1000):
+    """
+    builds a coarse depth map by counting the reads overlapping a small region from the center of each bin. Chromosomes
+    with no mapped reads in the bam index are not sampled
+
+    Args:
+        bam_cache (BamCache): the bam file to sample
+        bin_size (int): the length of each bin
+        sample_size (int): the length of the region counted for each bin
+
+    Returns:
+        DepthMap: the depth map
+    """
+    density = {}
+    mapped = {s.contig: s.mapped for s in bam_cache.fh.get_index_statistics()}
+    for chrom, length in zip(bam_cache.fh.references, bam_cache.fh.lengths):
+        bins = []
+        for bin_start in range(0, length, bin_size):
+            if not mapped.get(chrom, 0):
+                bins.append(0)
+                continue
+            bin_end = min(length, bin_start + bin_size)
+            sample_start = max(bin_start, (bin_start + bin_end - sample_size) // 2)
+            sample_end = min(bin_end, sample_start + sample_size)
+            count = bam_cache.fh.count(chrom, sample_start, sample_end)
+            bins.append(count / (sample_end - sample_start))
+        density[chrom] = bins
+    return DepthMap(bin_size, density)
+
+
+# the read fields collected for the bam stats (one column each)
+_READ_COLUMNS = [
+    'reference_start',
+    'reference_end',
+    'next_reference_start',
+    'template_length',
+    'query_length',
+    'is_read1',
+    'is_reverse',
+    'is_paired',
+]
+_COL = {name: index for index, name in enumerate(_READ_COLUMNS)}
+
+
+def _sample_region_reads(bam_file, regions, min_mapping_quality=1, sample_cap=10000):
+    """
+    collects the fields used by the bam stats from the properly paired reads of each region. The fields are read
+    straight from pysam (no read copies are made) so that this can be run in a separate process
+
+    Args:
+        bam_file (str): path to the bam file
+        regions (:class:`list` of :class:`tuple` of :class:`str`, :class:`int` and :class:`int`): the chromosome,
+            start and end of each region (passed as-is to pysam fetch)
+        min_mapping_quality (int): the minimum mapping quality for a read to be used
+        sample_cap (int): maximum number of reads (by name) to read for any given region
+
+    Returns:
+        :class:`list` of :class:`numpy.ndarray`: the read fields (see _READ_COLUMNS) for each region
+    """
+    result = []
+    with pysam.AlignmentFile(bam_file, 'rb') as fh:
+        for chrom, start, end in regions:
+            rows = []
+            names = set()
+            for read in fh.fetch(chrom, start, end):
+                if sample_cap is not None and len(names) >= sample_cap:
+                    break
+                if not read.is_unmapped and read.reference_start == read.reference_end:
+                    continue  # invalid read
+                names.add(read.query_name)
+                if any(
+                    [
+                        read.is_unmapped,
+                        read.mate_is_unmapped,
+                        read.mapping_quality < min_mapping_quality,
+                        read.next_reference_id != read.reference_id,
+                        read.is_secondary,
+                        not read.is_proper_pair,
+                    ]
+                ):
+                    continue
+                rows.append(
+                    (
+                        read.reference_start,
+                        read.reference_end,
+                        read.next_reference_start,
+                        abs(read.template_length),
+                        read.query_length,
+                        read.is_read1,
+                        read.is_reverse,
+                        read.is_paired,
+                    )
+                )
+            result.append(np.array(rows, dtype=np.int64).reshape((-1, len(_READ_COLUMNS))))
+    return result
+
+
+def _sample_reads(bam_cache, regions, processes=1, **kwargs):
+    """
+    collects the read fields (see :func:`_sample_region_reads`) for each region, splitting the regions between
+    processes
+
+    Returns:
+        :class:`list` of :class:`numpy.ndarray`: the read fields for each region (in the input order)
+    """
+    bam_file = bam_cache.fh.filename
+    if isinstance(bam_file, bytes):
+        bam_file = bam_file.decode('utf8')
+    if processes <= 1 or len(regions) <= 1:
+        return _sample_region_reads(bam_file, regions, **kwargs)
+    chunk_size = int(math.ceil(len(regions) / processes))
+    chunks = [regions[i : i + chunk_size] for i in range(0, len(regions), chunk_size)]
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.starmap(
+            _sample_region_reads,
+            [
+                (bam_file, chunk, kwargs['min_mapping_quality'], kwargs['sample_cap'])
+                for chunk in chunks
+            ],
+        )
+    return [data for chunk_data in results for data in chunk_data]
+
+
+def _median(values):
+    """
+    median of a sorted array (same as :meth:`Histogram.median`)
+    """
+    if len(values) % 2 == 0:
+        center = len(values) // 2
+        return (values[center - 1].item() + values[center].item()) / 2
+    return values[len(values) // 2].item()
+
+
+def _distribution_stderr(values, median, fraction):
+    """
+    mean squared error of the closest fraction of the values to the median (same as
+    :meth:`Histogram.distribution_stderr`)
+    """
+    err = np.sort(np.power(values - median, 2, dtype=np.float64))
+    end = int(len(err) * fraction)
+    return err[:end].sum().item() / end
+
+
 def compute_transcriptome_bam_stats(
     bam_cache,
     annotations,
@@ -111,6 +330,7 @@ def compute_transcriptome_bam_stats(
     stranded=True,
     sample_cap=10000,
     distribution_fraction=0.97,
+    processes=1,
 ):
     """
     computes various statistical measures relating the input bam file
@@ -124,12 +344,11 @@ def compute_transcriptome_bam_stats(
         stranded (bool): if True then reads must match the gene strand
         sample_cap (int): maximum number of reads to collect for any given sample region
         distribution_fraction (float): the proportion of the distribution to use in computing stdev
+        processes (int): number of processes to read the sampled genes with
 
     Returns:
         BamStats: the fragment size median, stdev and the read length in a object
     """
-    import numpy as np
-
     total_annotations = []
     for chr, anns_list in annotations.items():
         if bam_cache.valid_chr(chr):
@@ -146,69 +365,64 @@ def compute_transcriptome_bam_stats(
             )
         )
 
-    fragment_hist = Histogram()
+    regions = [
+        (bam_cache.fh.get_reference_name(bam_cache.reference_id(gene.chr)), gene.start, gene.end)
+        for gene in genes
+    ]
+    reads_by_gene = _sample_reads(
+        bam_cache,
+        regions,
+        processes=processes,
+        min_mapping_quality=min_mapping_quality,
+        sample_cap=sample_cap,
+    )
+
+    fragment_sizes = []
     read_strand_verification = Histogram()
     read_strand_verification[1] = 0
     read_strand_verification[2] = 0
 
     read_lengths = []
-    for gene in genes:
-        for read in bam_cache.fetch(
-            gene.chr, gene.start, gene.end, cache_if=lambda x: False, limit=sample_cap
-        ):
-            if any(
-                [
-                    read.is_unmapped,
-                    read.mate_is_unmapped,
-                    read.mapping_quality < min_mapping_quality,
-                    read.next_reference_id != read.reference_id,
-                    read.is_secondary,
-                    not read.is_proper_pair,
-                ]
-            ):
-                continue
-            if stranded:
-                try:
-                    strand = sequenced_strand(read, 1)
-                    if strand == gene.get_strand():
-                        read_strand_verification.add(1)
-                    else:
-                        read_strand_verification.add(2)
-                except ValueError:
-                    pass
-            if stranded:
-                if read.is_read1:
-                    if read.is_reverse:
-                        if gene.get_strand() == STRAND.POS:
-                            continue
-                    elif gene.get_strand() == STRAND.NEG:
-                        continue
-                else:
-                    if read.is_reverse:
-                        if gene.get_strand() == STRAND.NEG:
-                            continue
-                    elif gene.get_strand() == STRAND.POS:
-                        continue
-            read_lengths.append(len(read.query_sequence))
-
-            if read.reference_end > read.next_reference_start:
-                continue
-            current_frags = set()
-            for spl_tx in gene.spliced_transcripts:
-                try:
-                    cdna_pos1 = spl_tx.convert_genomic_to_cdna(read.reference_start)
-                    cdna_pos2 = spl_tx.convert_genomic_to_cdna(read.next_reference_start)
-                    current_frags.add(abs(cdna_pos1 - cdna_pos2) - 2)
-                except IndexError:
-                    pass
+    for gene, reads in zip(genes, reads_by_gene):
+        if stranded:
+            # the sequenced strand (see sequenced_strand) assuming the first read determines the strand
+            is_neg = reads[:, _COL['is_read1']] == reads[:, _COL['is_reverse']]
+            gene_strand = gene.get_strand()
+            paired = reads[:, _COL['is_paired']].astype(bool)
+            matches = (is_neg & (gene_strand == STRAND.NEG)) | (
+                ~is_neg & (gene_strand == STRAND.POS)
+            )
+            read_strand_verification.add(1, int(np.sum(paired & matches)))
+            read_strand_verification.add(2, int(np.sum(paired & ~matches)))
+            # drop the reads from the opposite strand to the gene
+            opposite = (is_neg & (gene_strand == STRAND.POS)) | (
+                ~is_neg & (gene_strand == STRAND.NEG)
+            )
+            reads = reads[~opposite]
+        read_lengths.extend(reads[:, _COL['query_length']].tolist())
+
+        pairs = reads[reads[:, _COL['reference_end']] <= reads[:, _COL['next_reference_start']]]
+        pairs = pairs[:, [_COL['reference_start'], _COL['next_reference_start']]]
+        if not len(pairs):
+            continue
+        # convert all the pairs for each transcript at once and keep the pairs where both positions are exonic
+        frags_by_transcript = []
+        for spl_tx in gene.spliced_transcripts:
+            cdna_pos1, shift1 = spl_tx.convert_genomic_to_cdna_many(pairs[:, 0])
+            cdna_pos2, shift2 = spl_tx.convert_genomic_to_cdna_many(pairs[:, 1])
+            frags_by_transcript.append(
+                (np.abs(cdna_pos1 - cdna_pos2) - 2, (shift1 == 0) & (shift2 == 0))
+            )
+        for index in range(0, len(pairs)):
+            current_frags = {
+                int(frags[index]) for frags, exonic in frags_by_transcript if exonic[index]
+            }
             if current_frags:
-                fragment_hist.add(sum(current_frags) / len(current_frags))
+                fragment_sizes.append(sum(current_frags) / len(current_frags))
     read_length = stats.median(read_lengths)
-    result = Histogram()
-    for val, freq in fragment_hist.items():
-        result.add(val + read_length, freq)
-    median = result.median()
-    err = result.distribution_stderr(median, distribution_fraction)
+    fragment_sizes = np.sort(np.array(fragment_sizes) + read_length)
+    median = _median(fragment_sizes)
+    err = _distribution_stderr(fragment_sizes, median, distribution_fraction)
     bamstats = BamStats(median, math.sqrt(err), read_length)
     if stranded:
         bamstats.add_stranded_information(read_strand_verification)
@@ -222,24 +436,24 @@ def compute_genome_bam_stats(
     min_mapping_quality=1,
     sample_cap=10000,
     distribution_fraction=0.99,
+    processes=1,
 ):
     """
     computes various statistical measures relating the input bam file
 
     Args:
-        bam_file_handle (pysam.AlignmentFile): the input bam file handle
+        bam_file_handle (BamCache): the input bam file handle
         sample_bin_size (int): how large to make the sample bin (in bp)
         sample_size (int): the number of genes to compute stats over
         log (callable): outputs logging information
         min_mapping_quality (int): the minimum mapping quality for a read to be used
         sample_cap (int): maximum number of reads to collect for any given sample region
         distribution_fraction (float): the proportion of the distribution to use in computing stdev
+        processes (int): number of processes to read the sampled bins with
 
     Returns:
         BamStats: the fragment size median, stdev and the read length in a object
     """
-    import numpy as np
-
     total = sum([l - sample_bin_size for l in bam_file_handle.fh.lengths])
     bins = []
     randoms = [int(n * (total - 1) + 1) for n in np.random.rand(sample_size)]
@@ -253,26 +467,17 @@ def compute_genome_bam_stats(
                 break
         bins.append((bam_file_handle.fh.references[template_index], pos, pos + sample_bin_size))
 
-    hist = Histogram()
-    read_lengths = []
-    for bin_chr, bin_start, bin_end in bins:
-        for read in bam_file_handle.fetch(
-            bin_chr, bin_start, bin_end, limit=sample_cap, cache_if=lambda x: False
-        ):
-            if any(
-                [
-                    read.is_unmapped,
-                    read.mate_is_unmapped,
-                    read.mapping_quality < min_mapping_quality,
-                    read.next_reference_id != read.reference_id,
-                    read.is_secondary,
-                    not read.is_proper_pair,
-                ]
-            ):
-                continue
-            hist[abs(read.template_length)] = hist.get(abs(read.template_length), 0) + 1
-            read_lengths.append(len(read.query_sequence))
-    median = hist.median()
-    err = hist.distribution_stderr(median, distribution_fraction)
+    reads = np.concatenate(
+        _sample_reads(
+            bam_file_handle,
+            bins,
+            processes=processes,
+            min_mapping_quality=min_mapping_quality,
+            sample_cap=sample_cap,
+        )
+    )
+    fragment_sizes = np.sort(reads[:, _COL['template_length']])
+    median = _median(fragment_sizes)
+    err = _distribution_stderr(fragment_sizes, median, distribution_fraction)
 
-    return BamStats(median, math.sqrt(err), np.median(read_lengths))
+    return BamStats(median, math.sqrt(err), np.median(reads[:, _COL['query_length']]))
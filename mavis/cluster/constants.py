@@ -1,6 +1,12 @@
 from ..util import WeakMavisNamespace
 
 
+COST_WINDOW_PADDING = 1000
+""":class:`int`: length added to each breakpoint to approximate its evidence window when predicting the validation cost"""
+
+TRANSCRIPTOME_COST_FACTOR = 2
+""":class:`int`: relative validation cost of transcriptome clusters compared to genome clusters"""
+
 DEFAULTS = WeakMavisNamespace()
 """
 - :term:`cluster_initial_size_limit`
@@ -9,6 +15,7 @@ DEFAULTS = WeakMavisNamespace()
 - :term:`max_files`
 - :term:`max_proximity`
 - :term:`min_clusters_per_file`
+- :term:`split_by_cost`
 - :term:`uninformative_filter`
 """
 DEFAULTS.add(
@@ -44,3 +51,12 @@ DEFAULTS.add(
     defn='A list of chromosome names to use. BreakpointPairs on other chromosomes will be filtered'
     'out. For example \'1 2 3 4\' would filter out events/breakpoint pairs on any chromosomes but 1, 2, 3, and 4',
 )
+DEFAULTS.add(
+    'split_by_cost',
+    False,
+    defn='split the clusters into files of roughly equal predicted validation cost (based on the breakpoint window '
+    'sizes, the protocol and, when the bam file is given, the read depth from the bam index) rather than '
+    'dealing them evenly by count. Neighbouring clusters are kept in the same file. The library fragment size and '
+    'read length are not known at clustering so each evidence window is approximated as the breakpoint padded by a '
+    'fixed {}bp'.format(COST_WINDOW_PADDING),
+)
@@ -4,9 +4,11 @@ import os
 from shortuuid import uuid
 import time
 
+import pysam
+
 from .cluster import merge_breakpoint_pairs
-from .constants import DEFAULTS
-from ..constants import COLUMNS
+from .constants import COST_WINDOW_PADDING, DEFAULTS, TRANSCRIPTOME_COST_FACTOR
+from ..constants import COLUMNS, PROTOCOL
 from ..util import (
     filter_on_overlap,
     filter_uninformative,
@@ -20,13 +22,97 @@ from ..util import (
 )
 
 
+def estimate_depth_from_index(bam_file):
+    """
+    estimate the relative read depth for each chromosome from the mapped read counts in the bam index
+
+    Args:
+        bam_file (str): path to the indexed bam file
+
+    Returns:
+        :class:`dict` of :class:`float` by :class:`str`: the depth of each chromosome relative to the mean depth
+    """
+    depth = {}
+    total_mapped = 0
+    total_length = 0
+    with pysam.AlignmentFile(bam_file, 'rb') as fh:
+        for stats in fh.get_index_statistics():
+            length = fh.get_reference_length(stats.contig)
+            if not length:
+                continue
+            depth[stats.contig] = stats.mapped / length
+            total_mapped += stats.mapped
+            total_length += length
+    if not total_mapped:
+        return {}
+    mean_depth = total_mapped / total_length
+    return {chrom: d / mean_depth for chrom, d in depth.items()}
+
+
+def estimate_cluster_cost(cluster, chr_depth=None, window_padding=COST_WINDOW_PADDING):
+    """
+    predicts the relative cost of validating a cluster. This is proportional to the size of the windows which will
+    be read from the bam file and the depth of the reads in them
+
+    Args:
+        cluster (BreakpointPair): the cluster
+        chr_depth (:class:`dict` of :class:`float` by :class:`str`): relative depth by chromosome (see :func:`estimate_depth_from_index`)
+        window_padding (int): length added to each breakpoint to approximate the evidence window
+
+    Returns:
+        float: the predicted cost
+    """
+    chr_depth = {} if chr_depth is None else chr_depth
+    cost = 0
+    for breakpoint in [cluster.break1, cluster.break2]:
+        cost += (len(breakpoint) + window_padding) * chr_depth.get(breakpoint.chr, 1)
+    if cluster.data.get(COLUMNS.protocol, None) == PROTOCOL.TRANS:
+        cost *= TRANSCRIPTOME_COST_FACTOR
+    return cost
+
+
+def partition_by_cost(clusters, costs, number_of_jobs):
+    """
+    splits the (position sorted) clusters into consecutive groups of roughly equal total cost
+
+    Args:
+        clusters (list): the clusters sorted by position
+        costs (:class:`list` of :class:`float`): the predicted cost of each cluster
+        number_of_jobs (int): the maximum number of groups
+
+    Returns:
+        :class:`list` of :class:`list`: the non-empty groups of clusters
+    """
+    total = sum(costs)
+    jobs = [[] for j in range(0, number_of_jobs)]
+    cumulative = 0
+    for cluster, cost in zip(clusters, costs):
+        # assign by the midpoint of the cluster in the cumulative cost
+        index = int((cumulative + cost / 2) * number_of_jobs / total) if total else 0
+        jobs[min(index, number_of_jobs - 1)].append(cluster)
+        cumulative += cost
+    return [job for job in jobs if job]
+
+
 def split_clusters(
-    clusters, outputdir, batch_id, min_clusters_per_file=0, max_files=1, write_bed_summary=True
+    clusters,
+    outputdir,
+    batch_id,
+    min_clusters_per_file=0,
+    max_files=1,
+    write_bed_summary=True,
+    split_by_cost=False,
+    bam_file=None,
 ):
     """
     For a set of clusters creates a bed file representation of all clusters.
     Also splits the clusters evenly into multiple files based on the user parameters (min_clusters_per_file, max_files)
 
+    Args:
+        split_by_cost (bool): split the clusters into consecutive groups of equal predicted cost instead of
+          dealing them out evenly by count
+        bam_file (str): path to the bam file used to estimate the read depth for the cost (optional)
+
     Returns:
         list: of output file names (not including the bed file)
     """
@@ -42,14 +128,34 @@ def split_clusters(
     elif number_of_jobs == 0:
         number_of_jobs = 1
 
-    jobs = [[] for j in range(0, number_of_jobs)]
     clusters = sorted(
         clusters, key=lambda x: (x.break1.chr, x.break1.start, x.break2.chr, x.break2.start)
     )
 
-    # split up consecutive clusters
-    for i, cluster in enumerate(clusters):
-        jobs[i % len(jobs)].append(cluster)
+    if split_by_cost:
+        chr_depth = {}
+        if bam_file:
+            LOG('estimating read depth from the bam index:', bam_file)
+            chr_depth = estimate_depth_from_index(bam_file)
+        costs = [estimate_cluster_cost(c, chr_depth) for c in clusters]
+        jobs = partition_by_cost(clusters, costs, number_of_jobs)
+        if not jobs:
+            jobs = [[]]
+        job_costs = []
+        start = 0
+        for job in jobs:
+            job_costs.append(sum(costs[start : start + len(job)]))
+            start += len(job)
+        LOG(
+            'split by predicted cost into {} files (min cost: {:.0f}, max cost: {:.0f})'.format(
+                len(jobs), min(job_costs), max(job_costs)
+            )
+        )
+    else:
+        jobs = [[] for j in range(0, number_of_jobs)]
+        # split up consecutive clusters
+        for i, cluster in enumerate(clusters):
+            jobs[i % len(jobs)].append(cluster)
 
     assert sum([len(j) for j in jobs]) == len(clusters)
     output_files = []
@@ -77,6 +183,8 @@ def main(
     max_proximity=DEFAULTS.max_proximity,
     min_clusters_per_file=DEFAULTS.min_clusters_per_file,
     max_files=DEFAULTS.max_files,
+    split_by_cost=DEFAULTS.split_by_cost,
+    bam_file=None,
     batch_id=None,
     split_only=False,
     start_time=int(time.time()),
@@ -99,6 +207,8 @@ def main(
         annotations (ReferenceFile): see :func:`~mavis.annotate.file_io.load_reference_genes`
         min_clusters_per_file (int): the minimum number of clusters to output to a file
         max_files (int): the maximum number of files to split clusters into
+        split_by_cost (bool): split the clusters into files of equal predicted validation cost
+        bam_file (str): path to the bam file, used to estimate read depth when splitting by cost
     """
     if uninformative_filter:
         annotations.load()
@@ -246,6 +356,8 @@ def main(
         min_clusters_per_file=min_clusters_per_file,
         max_files=max_files,
         write_bed_summary=True,
+        split_by_cost=split_by_cost,
+        bam_file=bam_file,
     )
 
     generate_complete_stamp(output, LOG, start_time=start_time, prefix='MAVIS-{}.'.format(batch_id))
@@ -163,10 +163,12 @@ class LibraryConfig(MavisNamespace):
         sample_cap=3000,
         sample_bin_size=1000,
         sample_size=500,
+        stats_processes=1,
         **kwargs
     ):
         """
-        Builds a library config section and gathers the bam stats
+        Builds a library config section and gathers the bam stats (sampling the bam file with stats_processes
+        processes)
         """
         PROTOCOL.enforce(protocol)
 
@@ -177,6 +179,9 @@ class LibraryConfig(MavisNamespace):
                 )
             annotations.load()
         bam = BamCache(bam_file)
+        if kwargs.get('depth_map', None) and not os.path.exists(kwargs['depth_map']):
+            log('writing:', kwargs['depth_map'])
+            stats.compute_depth_map(bam).write(kwargs['depth_map'])
         if protocol == PROTOCOL.TRANS:
             bamstats = stats.compute_transcriptome_bam_stats(
                 bam,
@@ -184,6 +189,7 @@ class LibraryConfig(MavisNamespace):
                 sample_size=sample_size,
                 sample_cap=sample_cap,
                 distribution_fraction=distribution_fraction,
+                processes=stats_processes,
             )
         elif protocol == PROTOCOL.GENOME:
             bamstats = stats.compute_genome_bam_stats(
@@ -192,6 +198,7 @@ class LibraryConfig(MavisNamespace):
                 sample_bin_size=sample_bin_size,
                 sample_cap=sample_cap,
                 distribution_fraction=distribution_fraction,
+                processes=stats_processes,
             )
         else:
             raise ValueError('unrecognized value for protocol', protocol)
@@ -767,6 +774,11 @@ def generate_config(args, parser, log=DEVNULL):
     if SUBCOMMAND.VALIDATE not in args.skip_stage:
         for i, libconf in enumerate(libs):
             log('generating the config section for:', libconf.library)
+            depth_map_args = {}
+            if args.get('depth_map_dir', None):
+                depth_map_args['depth_map'] = os.path.join(
+                    args.depth_map_dir, '{}.depth_map.tab'.format(libconf.library)
+                )
             libs[i] = LibraryConfig.build(
                 library=libconf.library,
                 protocol=libconf.protocol,
@@ -780,6 +792,8 @@ def generate_config(args, parser, log=DEVNULL):
                 if libconf.protocol == PROTOCOL.GENOME
                 else args.transcriptome_bins,
                 distribution_fraction=args.distribution_fraction,
+                stats_processes=args.get('stats_processes', 1),
+                **depth_map_args
             )
     write_config(
         args.write, include_defaults=args.add_defaults, libraries=libs, conversions=convert, log=log
@@ -7,7 +7,7 @@ import os
 
 from Bio.Alphabet import Gapped
 from Bio.Alphabet.IUPAC import ambiguous_dna
-from Bio.Data.IUPACData import ambiguous_dna_values
+from Bio.Data.IUPACData import ambiguous_dna_complement, ambiguous_dna_values
 from Bio.Seq import Seq
 from tab import cast_boolean, cast_null
 
@@ -439,6 +439,7 @@ SUBCOMMAND = MavisNamespace(
     CONFIG='config',
     CONVERT='convert',
     OVERLAY='overlay',
+    DRAW='draw',
 )
 """:class:`MavisNamespace`: holds controlled vocabulary for allowed pipeline stage values
 
@@ -446,6 +447,7 @@ SUBCOMMAND = MavisNamespace(
 - cluster
 - config
 - convert
+- draw
 - pairing
 - pipeline
 - schedule
@@ -458,9 +460,16 @@ CODON_SIZE = 3
 """:class:`int`: the number of bases making up a codon"""
 
 
+_DNA_COMPLEMENT_TABLE = str.maketrans(
+    ''.join(ambiguous_dna_complement) + ''.join(ambiguous_dna_complement).lower(),
+    ''.join(ambiguous_dna_complement.values()) + ''.join(ambiguous_dna_complement.values()).lower(),
+)
+_SEQUENCE_PATTERN = re.compile('^[A-Za-z]*$')
+
+
 def reverse_complement(s):
     """
-    wrapper for the Bio.Seq reverse_complement method
+    reverse complement a DNA sequence (same complement table as the Bio.Seq reverse_complement method)
 
     Args:
         s (str): the input DNA sequence
@@ -476,10 +485,9 @@ def reverse_complement(s):
         'ACCGGAT'
     """
     input_string = str(s)
-    if not re.match('^[A-Za-z]*$', input_string):
+    if not _SEQUENCE_PATTERN.match(input_string):
         raise ValueError('unexpected sequence format. cannot reverse complement', input_string)
-    input_string = Seq(input_string, DNA_ALPHABET)
-    return str(input_string.reverse_complement())
+    return input_string.translate(_DNA_COMPLEMENT_TABLE)[::-1]
 
 
 def translate(s, reading_frame=0):
@@ -4,7 +4,16 @@ This is the primary module responsible for generating svg visualizations
 """
 from svgwrite import Drawing
 
-from .elements import draw_exon_track, draw_genes, draw_template, draw_ustranscript, draw_vmarker
+from .elements import (
+    draw_exon_track,
+    draw_genes,
+    draw_template,
+    draw_ustranscript,
+    draw_vmarker,
+    genes_min_width,
+    template_min_width,
+    ustranscript_min_width,
+)
 from .scatter import draw_scatter
 from .util import generate_interval_mapping, LabelMapping
 
@@ -76,15 +85,13 @@ def draw_sv_summary_diagram(
     dx_label_shift = config.label_left_margin
 
     x += dx_label_shift
-    drawing_width = config.width - dx_label_shift - config.left_margin - config.right_margin
-    # calculate the half-width for transcripts and genes etc
-    half_drawing_width = (drawing_width - config.inner_margin - dx_label_shift) / 2
+    # calculate the full and half-width for transcripts and genes etc
+    drawing_width, half_drawing_width = _drawing_widths(config)
     second_drawing_shift = x + half_drawing_width + config.inner_margin + dx_label_shift
 
     if draw_reference_templates:
         try:
-            template1 = templates[ann.transcript1.get_chr()]
-            template2 = templates[ann.transcript2.get_chr()]
+            template1, template2 = _summary_templates(ann, templates)
             if user_friendly_labels and template1.name:
                 labels.set_key(template_display_label_prefix + template1.name, template1)
             if user_friendly_labels and template2.name:
@@ -133,47 +140,38 @@ def draw_sv_summary_diagram(
                 raise err
 
     colors = dict()
-    genes1 = set()
-    genes2 = set()
+    genes1, genes2 = _summary_genes(ann)
     legend = dict()
 
     for gene in ann.genes_overlapping_break1:
-        genes1.add(gene)
         colors[gene] = config.gene1_color
 
     for gene, _ in ann.genes_proximal_to_break1:
-        genes1.add(gene)
         colors[gene] = config.gene1_color
 
     for gene in ann.genes_overlapping_break2:
-        genes2.add(gene)
         colors.setdefault(gene, config.gene2_color)
 
     for gene, _ in ann.genes_proximal_to_break2:
-        genes2.add(gene)
         colors.setdefault(gene, config.gene2_color)
 
     if ann.transcript1:
         try:
-            genes1.add(ann.transcript1.gene)
             colors[ann.transcript1.gene] = config.gene1_color_selected
             for exon in ann.transcript1.exons:
                 colors[exon] = config.exon1_color
         except AttributeError:
-            genes1.add(ann.transcript1)
             colors[ann.transcript1] = config.gene1_color_selected
 
     if ann.transcript2:
         same = ann.transcript1 == ann.transcript2
         try:
-            genes2.add(ann.transcript2.gene)
             colors[ann.transcript2.gene] = (
                 config.gene2_color_selected if not same else config.gene1_color_selected
             )
             for exon in ann.transcript2.exons:
                 colors[exon] = config.exon2_color if not same else config.exon1_color
         except AttributeError:
-            genes2.add(ann.transcript2)
             colors[ann.transcript2] = (
                 config.gene2_color_selected if not same else config.gene1_color_selected
             )
@@ -256,23 +254,9 @@ def draw_sv_summary_diagram(
     if draw_reference_transcripts:
         theights = []
         # now the transcript level drawings
-        if any(
-            [
-                ann.transcript1 == ann.transcript2,
-                ann.transcript1 is None,
-                ann.transcript2 is None,
-                isinstance(ann.transcript1, IntergenicRegion),
-                isinstance(ann.transcript2, IntergenicRegion),
-            ]
-        ):
-            breaks = [ann.break1, ann.break2]
-            transcript = ann.transcript1
-            if ann.transcript1 is None or isinstance(ann.transcript1, IntergenicRegion):
-                transcript = ann.transcript2
-                breaks = [ann.break2]
-            elif ann.transcript2 is None or isinstance(ann.transcript2, IntergenicRegion):
-                breaks = [ann.break1]
-
+        transcripts, ratio = _summary_transcripts(ann)
+        if ratio is None:
+            transcript, breaks = transcripts[0]
             try:
                 svg_group = canvas.g(class_='transcript')
                 svg_group = draw_ustranscript(
@@ -291,24 +275,17 @@ def draw_sv_summary_diagram(
             except AttributeError:
                 pass  # Intergenic region or None
         else:  # separate drawings
-            try:
-                ratio = len(ann.transcript1.exons) / (
-                    len(ann.transcript1.exons) + len(ann.transcript2.exons)
-                )
-                ratio = max(0.25, min(ratio, 0.75))  # must be between 0.25 - 0.75
-            except AttributeError:
-                ratio = 0.5
-
+            (transcript1, breaks1), (transcript2, breaks2) = transcripts
             try:
                 svg_group = canvas.g(class_='transcript')
                 svg_group = draw_ustranscript(
                     config,
                     canvas,
-                    ann.transcript1,
+                    transcript1,
                     half_drawing_width * 2 * ratio
                     if not stack_reference_transcripts
                     else drawing_width,
-                    breakpoints=[ann.break1],
+                    breakpoints=breaks1,
                     labels=labels,
                     colors=colors,
                     reference_genome=reference_genome,
@@ -327,11 +304,11 @@ def draw_sv_summary_diagram(
                 svg_group = draw_ustranscript(
                     config,
                     canvas,
-                    ann.transcript2,
+                    transcript2,
                     half_drawing_width * 2 * (1 - ratio)
                     if not stack_reference_transcripts
                     else drawing_width,
-                    breakpoints=[ann.break2],
+                    breakpoints=breaks2,
                     labels=labels,
                     colors=colors,
                     reference_genome=reference_genome,
@@ -382,6 +359,154 @@ def draw_sv_summary_diagram(
     return canvas, legend
 
 
+def _drawing_widths(config):
+    """
+    the width of the full-width diagrams and of each of the side-by-side (half-width) diagrams in
+    :func:`draw_sv_summary_diagram`
+    """
+    dx_label_shift = config.label_left_margin
+    drawing_width = config.width - dx_label_shift - config.left_margin - config.right_margin
+    half_drawing_width = (drawing_width - config.inner_margin - dx_label_shift) / 2
+    return drawing_width, half_drawing_width
+
+
+def _diagram_width(config, drawing_width, half_drawing_width):
+    """
+    the inverse of :func:`_drawing_widths`. The smallest config.width which gives at least the full and half drawing
+    widths
+    """
+    dx_label_shift = config.label_left_margin
+    drawing_width = max(
+        drawing_width, 2 * half_drawing_width + config.inner_margin + dx_label_shift
+    )
+    return drawing_width + dx_label_shift + config.left_margin + config.right_margin
+
+
+def _summary_templates(ann, templates):
+    """
+    the templates drawn in the template level view (raises a KeyError if either is not given)
+    """
+    return templates[ann.transcript1.get_chr()], templates[ann.transcript2.get_chr()]
+
+
+def _summary_genes(ann):
+    """
+    the genes drawn in the gene level view for each breakpoint
+    """
+    genes1 = set(ann.genes_overlapping_break1)
+    genes1.update([gene for gene, _ in ann.genes_proximal_to_break1])
+    genes2 = set(ann.genes_overlapping_break2)
+    genes2.update([gene for gene, _ in ann.genes_proximal_to_break2])
+    for transcript, genes in [(ann.transcript1, genes1), (ann.transcript2, genes2)]:
+        if transcript:
+            try:
+                genes.add(transcript.gene)
+            except AttributeError:
+                genes.add(transcript)
+    return genes1, genes2
+
+
+def _summary_transcripts(ann):
+    """
+    the reference transcripts (and their breakpoints) drawn in the transcript level view
+
+    Returns:
+        tuple of list and float: the transcripts and breakpoints and the fraction of the width given to the first
+        transcript when they are drawn separately (None for a single drawing)
+    """
+    if any(
+        [
+            ann.transcript1 == ann.transcript2,
+            ann.transcript1 is None,
+            ann.transcript2 is None,
+            isinstance(ann.transcript1, IntergenicRegion),
+            isinstance(ann.transcript2, IntergenicRegion),
+        ]
+    ):
+        breaks = [ann.break1, ann.break2]
+        transcript = ann.transcript1
+        if ann.transcript1 is None or isinstance(ann.transcript1, IntergenicRegion):
+            transcript = ann.transcript2
+            breaks = [ann.break2]
+        elif ann.transcript2 is None or isinstance(ann.transcript2, IntergenicRegion):
+            breaks = [ann.break1]
+        return [(transcript, breaks)], None
+    try:
+        ratio = len(ann.transcript1.exons) / (
+            len(ann.transcript1.exons) + len(ann.transcript2.exons)
+        )
+        ratio = max(0.25, min(ratio, 0.75))  # must be between 0.25 - 0.75
+    except AttributeError:
+        ratio = 0.5
+    return [(ann.transcript1, [ann.break1]), (ann.transcript2, [ann.break2])], ratio
+
+
+def sv_summary_diagram_min_width(
+    config,
+    ann,
+    templates=None,
+    draw_reference_transcripts=True,
+    draw_reference_genes=True,
+    draw_reference_templates=True,
+    draw_fusion_transcript=True,
+    stack_reference_transcripts=False,
+):
+    """
+    measures the layout of :func:`draw_sv_summary_diagram` (without creating any svg elements) to find the smallest
+    config.width for which none of the interval mappings would raise a :class:`~mavis.error.DrawingFitError`. Used to
+    skip drawing attempts which are known not to fit. Gene level fit errors due to pixel rounding are not measured so
+    a drawing at this width may still (rarely) fail to fit
+
+    Args:
+        ann (Annotation): the annotation object to be illustrated
+        templates (list of Template): list of templates, used in drawing the template-level view
+
+    Returns:
+        float: the minimum total width of the diagram
+    """
+    templates = dict() if templates is None else templates
+    # required widths of the full-width and the half-width diagrams
+    full_widths = [0]
+    half_widths = [0]
+
+    if draw_reference_templates:
+        try:
+            template1, template2 = _summary_templates(ann, templates)
+            if template1 == template2:
+                full_widths.append(template_min_width(config, template1))
+            else:
+                half_widths.append(template_min_width(config, template1))
+                half_widths.append(template_min_width(config, template2))
+        except KeyError:
+            pass
+
+    if draw_reference_genes:
+        genes1, genes2 = _summary_genes(ann)
+        if ann.interchromosomal:
+            half_widths.append(genes_min_width(config, genes1, [ann.break1]))
+            half_widths.append(genes_min_width(config, genes2, [ann.break2]))
+        else:
+            full_widths.append(genes_min_width(config, genes1 | genes2, [ann.break1, ann.break2]))
+
+    if draw_reference_transcripts:
+        transcripts, ratio = _summary_transcripts(ann)
+        fractions = [None] if ratio is None else [ratio, 1 - ratio]
+        for (transcript, _), fraction in zip(transcripts, fractions):
+            try:
+                width = ustranscript_min_width(config, transcript)
+            except AttributeError:
+                continue  # Intergenic region or None
+            if fraction is None or stack_reference_transcripts:
+                full_widths.append(width)
+            else:  # drawn at half_drawing_width * 2 * fraction
+                half_widths.append(width / (2 * fraction))
+
+    if ann.fusion and draw_fusion_transcript:
+        full_widths.append(ustranscript_min_width(config, ann.fusion))
+
+    return _diagram_width(config, max(full_widths), max(half_widths))
+
+
 def draw_multi_transcript_overlay(
     config, gene, vmarkers=None, window_buffer=0, plots=None, log=DEVNULL
 ):
@@ -8,6 +8,7 @@ import re
 from .util import (
     dynamic_label_color,
     generate_interval_mapping,
+    interval_mapping_min_width,
     LabelMapping,
     split_intervals_into_tracks,
     Tag,
@@ -441,6 +442,31 @@ def draw_transcript_with_translation(
     return main_group
 
 
+def _ustranscript_mapping_args(config, pre_transcript):
+    """
+    the intervals, ratio and other arguments of the exon interval mapping in :func:`draw_ustranscript`
+    """
+    try:
+        exons_to_map = [e for e in pre_transcript.exons if len(e) >= config.exon_min_focus_size]
+    except AttributeError:
+        exons_to_map = pre_transcript.exons
+    mapping_args = dict(
+        min_width=config.exon_min_width,
+        min_inter_width=config.min_width,
+        start=min([e.start for e in pre_transcript.exons] + [pre_transcript.start]),
+        end=max([e.end for e in pre_transcript.exons] + [pre_transcript.end]),
+    )
+    return exons_to_map, config.exon_intron_ratio, mapping_args
+
+
+def ustranscript_min_width(config, pre_transcript):
+    """
+    the smallest target width :func:`draw_ustranscript` can map the exons of the transcript to
+    """
+    exons_to_map, _, mapping_args = _ustranscript_mapping_args(config, pre_transcript)
+    return interval_mapping_min_width(exons_to_map, **mapping_args)
+
+
 def draw_ustranscript(
     config,
     canvas,
@@ -481,24 +507,12 @@ def draw_ustranscript(
             'mapping and target_width arguments are required and mutually exclusive'
         )
 
-    genomic_min = min([e.start for e in pre_transcript.exons] + [pre_transcript.start])
-    genomic_max = max([e.end for e in pre_transcript.exons] + [pre_transcript.end])
+    exons_to_map, ratio, mapping_args = _ustranscript_mapping_args(config, pre_transcript)
+    genomic_min = mapping_args['start']
+    genomic_max = mapping_args['end']
 
     if mapping is None:
-        try:
-            exons_to_map = [e for e in pre_transcript.exons if len(e) >= config.exon_min_focus_size]
-        except AttributeError:
-            exons_to_map = pre_transcript.exons
-
-        mapping = generate_interval_mapping(
-            exons_to_map,
-            target_width,
-            config.exon_intron_ratio,
-            config.exon_min_width,
-            min_inter_width=config.min_width,
-            start=genomic_min,
-            end=genomic_max,
-        )
+        mapping = generate_interval_mapping(exons_to_map, target_width, ratio, **mapping_args)
 
     main_group = canvas.g(class_='pre_transcript')
 
@@ -607,6 +621,31 @@ def draw_ustranscript(
     return main_group
 
 
+def _genes_mapping_args(config, genes, breakpoints):
+    """
+    the intervals, ratio and other arguments of the gene interval mapping in :func:`draw_genes`
+    """
+    mapping_args = dict(
+        min_width=config.gene_min_width,
+        min_inter_width=config.min_width,
+        start=max(
+            min([g.start for g in genes] + [b.start for b in breakpoints]) - config.gene_min_buffer,
+            1,
+        ),
+        end=max([g.end for g in genes] + [b.end for b in breakpoints]) + config.gene_min_buffer,
+    )
+    return [g for g in genes], config.gene_intergenic_ratio, mapping_args
+
+
+def genes_min_width(config, genes, breakpoints=None):
+    """
+    the smallest target width :func:`draw_genes` can map the genes to
+    """
+    breakpoints = [] if breakpoints is None else breakpoints
+    genes_to_map, _, mapping_args = _genes_mapping_args(config, genes, breakpoints)
+    return interval_mapping_min_width(genes_to_map, **mapping_args)
+
+
 def draw_genes(
     config,
     canvas,
@@ -640,20 +679,11 @@ def draw_genes(
     labels = LabelMapping() if labels is None else labels
     plots = plots if plots else []
 
-    st = max(
-        min([g.start for g in genes] + [b.start for b in breakpoints]) - config.gene_min_buffer, 1
-    )
-    end = max([g.end for g in genes] + [b.end for b in breakpoints]) + config.gene_min_buffer
+    genes_to_map, ratio, mapping_args = _genes_mapping_args(config, genes, breakpoints)
+    st = mapping_args['start']
+    end = mapping_args['end']
     main_group = canvas.g(class_='genes')
-    mapping = generate_interval_mapping(
-        [g for g in genes],
-        target_width,
-        config.gene_intergenic_ratio,
-        config.gene_min_width,
-        start=st,
-        end=end,
-        min_inter_width=config.min_width,
-    )
+    mapping = generate_interval_mapping(genes_to_map, target_width, ratio, **mapping_args)
     if masks is None:
         masks = []
         try:
@@ -889,6 +919,25 @@ def draw_exon(config, canvas, exon, width, height, fill, label='', translation=N
     return g
 
 
+def _template_mapping_args(config, template):
+    """
+    the intervals, ratio and other arguments of the band interval mapping in :func:`draw_template`
+    """
+    # 1 as input since we don't want to change the ratio here
+    mapping_args = dict(
+        min_width=config.template_band_min_width, start=template.start, end=template.end
+    )
+    return template.bands, 1, mapping_args
+
+
+def template_min_width(config, template):
+    """
+    the smallest target width :func:`draw_template` can map the bands of the template to
+    """
+    bands, _, mapping_args = _template_mapping_args(config, template)
+    return interval_mapping_min_width(bands, **mapping_args)
+
+
 def draw_template(
     config, canvas, template, target_width, labels=None, colors=None, breakpoints=None
 ):
@@ -908,15 +957,8 @@ def draw_template(
         + config.breakpoint_bottom_margin
     )
     group = canvas.g(class_='template')
-    # 1 as input since we don't want to change the ratio here
-    mapping = generate_interval_mapping(
-        template.bands,
-        target_width,
-        1,
-        config.template_band_min_width,
-        start=template.start,
-        end=template.end,
-    )
+    bands, ratio, mapping_args = _template_mapping_args(config, template)
+    mapping = generate_interval_mapping(bands, target_width, ratio, **mapping_args)
     scaffold = canvas.rect(
         (0, 0), (target_width, config.scaffold_height), fill=config.scaffold_color
     )
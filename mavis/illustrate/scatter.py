@@ -1,6 +1,8 @@
 import os
 
-from ..bam.read import sequenced_strand, pileup
+import numpy as np
+
+from ..bam.read import sequenced_strand, coverage
 from ..util import LOG, DEVNULL
 from ..interval import Interval
 from ..validate.constants import DEFAULTS as VALIDATION_DEFAULTS
@@ -17,6 +19,7 @@ def bam_to_scatter(
     ymax=None,
     min_mapping_quality=0,
     ymax_color='#FF0000',
+    bin_size=1,
 ):
     """
     pull data from a bam file to set up a scatter plot of the pileup
@@ -26,11 +29,13 @@ def bam_to_scatter(
         chrom (str): chromosome name
         start (int): genomic start position for the plot
         end (int): genomic end position for the plot
-        bin_size (int): number of genomic positions to group together and average to reduce data
+        density (float): minimum overlap ratio for points to be dropped when drawn
         strand (STRAND): expected strand
         axis_name (str): axis name
         ymax (int): maximum value to plot the y axis
         min_mapping_quality (int): minimum mapping quality for reads to be considered in the plot
+        ymax_color (str): color for points above the ymax
+        bin_size (int): number of genomic positions to group together and average to reduce data
 
     Returns:
         ScatterPlot: the scatter plot representing the bam pileup
@@ -57,11 +62,22 @@ def bam_to_scatter(
     try:
         points = []
         try:
-            for refpos, count in pileup(samfile.fetch(chrom, start, end), filter_func=read_filter):
-                if refpos <= end and refpos >= start:
-                    points.append((refpos, count))
+            depth = coverage(
+                samfile.fetch(chrom, start, end),
+                start,
+                end,
+                filter_func=read_filter,
+                bin_size=bin_size,
+            )
         except ValueError:  # chrom not in bam
             pass
+        else:
+            bin_size = max(bin_size, 1)
+            indices = np.flatnonzero(depth)
+            bin_starts = start + indices * bin_size
+            # plot each bin at its center
+            positions = (bin_starts + np.minimum(bin_starts + bin_size - 1, end)) // 2
+            points = list(zip(positions.tolist(), depth[indices].tolist()))
 
         LOG('scatter plot {} has {} points'.format(axis_name, len(points)))
         plot = ScatterPlot(
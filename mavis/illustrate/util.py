@@ -90,17 +90,16 @@ def split_intervals_into_tracks(intervals):
     return tracks
 
 
-def generate_interval_mapping(
-    input_intervals,
-    target_width,
-    ratio,
-    min_width,
-    buffer_length=None,
-    start=None,
-    end=None,
-    min_inter_width=None,
-    min_pixel_accuracy=MIN_PIXEL_ACCURACY,
+def _mapping_intervals(
+    input_intervals, min_width, buffer_length=None, start=None, end=None, min_inter_width=None
 ):
+    """
+    split the input intervals into the non-overlapping intervals to be mapped and count the intermediate (non-focus)
+    intervals between them
+
+    Returns:
+        tuple: the intervals, start, end, min_inter_width and number of intermediate intervals
+    """
     min_inter_width = min_width if min_inter_width is None else min_inter_width
     if all([x is not None for x in [start, end, buffer_length]]):
         raise AttributeError('buffer_length is a mutually exclusive argument with start/end')
@@ -170,9 +169,6 @@ def generate_interval_mapping(
     ):  # if no input intervals are given, then use the start/end of the entire range as the focus
         intervals = [Interval(start, end)]
 
-    total_length = end - start + 1
-    genic_length = sum([len(i) for i in intervals])
-    intergenic_length = total_length - genic_length
     intermediate_intervals = 0
     if start < intervals[0].start:
         intermediate_intervals += 1
@@ -182,6 +178,42 @@ def generate_interval_mapping(
     for i in range(1, len(intervals)):
         if intervals[i].start > intervals[i - 1].end + 1:
             intermediate_intervals += 1
+    return intervals, start, end, min_inter_width, intermediate_intervals
+
+
+def interval_mapping_min_width(
+    input_intervals, min_width, buffer_length=None, start=None, end=None, min_inter_width=None
+):
+    """
+    computes the smallest target width that :func:`generate_interval_mapping` can map the input intervals to (with
+    the same arguments) without raising a :class:`~mavis.error.DrawingFitError`
+
+    Returns:
+        float: the pixel width reserved by the minimum widths of the focus and intermediate intervals
+    """
+    intervals, start, end, min_inter_width, intermediate_intervals = _mapping_intervals(
+        input_intervals, min_width, buffer_length, start, end, min_inter_width
+    )
+    return intermediate_intervals * min_inter_width + len(intervals) * min_width
+
+
+def generate_interval_mapping(
+    input_intervals,
+    target_width,
+    ratio,
+    min_width,
+    buffer_length=None,
+    start=None,
+    end=None,
+    min_inter_width=None,
+    min_pixel_accuracy=MIN_PIXEL_ACCURACY,
+):
+    intervals, start, end, min_inter_width, intermediate_intervals = _mapping_intervals(
+        input_intervals, min_width, buffer_length, start, end, min_inter_width
+    )
+    total_length = end - start + 1
+    genic_length = sum([len(i) for i in intervals])
+    intergenic_length = total_length - genic_length
     width = (
         target_width - intermediate_intervals * min_inter_width - len(intervals) * min_width
     )  # reserved width
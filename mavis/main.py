@@ -99,6 +99,7 @@ def overlay_main(
     max_drawing_retries,
     min_mapping_quality,
     ymax_color='#FF0000',
+    read_depth_bin_size=1,
     **kwargs
 ):
     """
@@ -141,6 +142,7 @@ def overlay_main(
                 axis_name=axis_name,
                 min_mapping_quality=min_mapping_quality,
                 ymax_color=ymax_color,
+                bin_size=read_depth_bin_size,
             )
         )
 
@@ -270,6 +272,20 @@ def main(argv=None):
         metavar=_config.get_metavar(float),
         help='the proportion of the distribution of calculated fragment sizes to use in determining the stdev',
     )
+    optional[SUBCOMMAND.CONFIG].add_argument(
+        '--stats_processes',
+        default=_util.get_env_variable('stats_processes', 1),
+        type=int,
+        metavar=_config.get_metavar(int),
+        help='number of processes to use in sampling the bam files for the fragment size stats',
+    )
+    optional[SUBCOMMAND.CONFIG].add_argument(
+        '--depth_map_dir',
+        type=_config.filepath,
+        metavar='DIRPATH',
+        help='directory to write a coarse read depth map for each library to (used in validation to predict the '
+        'number of reads in each evidence window)',
+    )
     optional[SUBCOMMAND.CONFIG].add_argument(
         '--convert',
         nmin=3,
@@ -348,6 +364,7 @@ def main(argv=None):
         SUBCOMMAND.PAIR,
         SUBCOMMAND.SUMMARY,
         SUBCOMMAND.CONVERT,
+        SUBCOMMAND.DRAW,
     ]:
         required[command].add_argument(
             '-n',
@@ -363,7 +380,8 @@ def main(argv=None):
         ['library', 'protocol', 'strand_specific', 'disease_status'], required[SUBCOMMAND.CLUSTER]
     )
     _config.augment_parser(
-        list(CLUSTER_DEFAULTS.keys()) + ['masking', 'annotations'], optional[SUBCOMMAND.CLUSTER]
+        list(CLUSTER_DEFAULTS.keys()) + ['masking', 'annotations', 'bam_file'],
+        optional[SUBCOMMAND.CLUSTER],
     )
     optional[SUBCOMMAND.CLUSTER].add_argument(
         '--batch_id', help='batch id to use for prefix of split files', type=_config.nameable_string
@@ -404,6 +422,18 @@ def main(argv=None):
         optional[SUBCOMMAND.ANNOTATE],
     )
 
+    # draw
+    _config.augment_parser(['annotations', 'reference_genome'], required[SUBCOMMAND.DRAW])
+    _config.augment_parser(
+        ['annotation_processes'] + list(ILLUSTRATION_DEFAULTS.keys()), optional[SUBCOMMAND.DRAW]
+    )
+    optional[SUBCOMMAND.DRAW].add_argument(
+        '--annotation_ids',
+        nargs='+',
+        metavar='ID',
+        help='only draw the annotations with these ids (draws all by default)',
+    )
+
     # pair
     _config.augment_parser(['annotations'], required[SUBCOMMAND.PAIR], optional[SUBCOMMAND.PAIR])
     _config.augment_parser(
@@ -446,6 +476,12 @@ def main(argv=None):
         help='bam file to use as data for plotting read_depth',
         action=_config.RangeAppendAction,
     )
+    optional[SUBCOMMAND.OVERLAY].add_argument(
+        '--read_depth_bin_size',
+        default=1,
+        type=int,
+        help='number of genomic positions to average together for each point of the read_depth plots',
+    )
     optional[SUBCOMMAND.OVERLAY].add_argument(
         '--marker',
         dest='markers',
@@ -532,6 +568,7 @@ def main(argv=None):
                 SUBCOMMAND.SUMMARY,
                 SUBCOMMAND.OVERLAY,
                 SUBCOMMAND.SETUP,
+                SUBCOMMAND.DRAW,
             },
         ]
     ):
@@ -564,6 +601,8 @@ def main(argv=None):
             convert_main(**args)
         elif command == SUBCOMMAND.OVERLAY:
             overlay_main(**args)
+        elif command == SUBCOMMAND.DRAW:
+            annotate_main.draw_main(**args)
         elif command == SUBCOMMAND.CONFIG:
             _config.generate_config(args, parser, log=_util.LOG)
         elif command == SUBCOMMAND.SCHEDULE:
@@ -200,6 +200,7 @@ def cluster_args(config, libconf):
         'protocol',
         'disease_status',
         'strand_specific',
+        'bam_file',
     ] + list(_CLUSTER.DEFAULTS.keys())
     args = {}
     args.update(_CLUSTER.DEFAULTS.items())
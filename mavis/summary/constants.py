@@ -15,6 +15,7 @@ HOMOPOLYMER_MIN_LENGTH = 3
 - :term:`filter_protein_synon`
 - :term:`filter_min_complexity`
 - :term:`filter_trans_homopolymers`
+- :term:`columnar_filters`
 """
 DEFAULTS.add(
     'filter_min_remapped_reads', 5, defn='Minimum number of remapped reads for a call by contig'
@@ -53,6 +54,12 @@ DEFAULTS.add(
     cast_type=float_fraction,
     defn='Filter event calls based on call sequence complexity',
 )
+DEFAULTS.add(
+    'columnar_filters',
+    False,
+    defn='Load the input rows into columns and apply the synonymous, homopolymer, complexity and evidence '
+    'filters as vectorized masks. Breakpoint pairs are only built for the rows which pass the filters',
+)
 
 
 PAIRING_STATE = MavisNamespace(
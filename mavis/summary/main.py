@@ -1,20 +1,20 @@
 from functools import partial
 import os
-import re
 import time
 
 import tab
 
-from .constants import DEFAULTS, HOMOPOLYMER_MIN_LENGTH
+from .constants import DEFAULTS
 from .summary import (
     annotate_dgv,
     filter_by_annotations,
     filter_by_call_method,
-    filter_by_evidence,
+    filter_pairs,
+    filter_table,
     get_pairing_state,
     group_by_distance,
 )
-from ..constants import CALL_METHOD, COLUMNS, PROTOCOL, SVTYPE
+from ..constants import CALL_METHOD, COLUMNS
 from ..pairing.constants import DEFAULTS as PAIRING_DEFAULTS
 from ..util import generate_complete_stamp, LOG, output_tabbed_file, read_inputs, soft_cast
 
@@ -40,6 +40,7 @@ def main(
     filter_trans_homopolymers=DEFAULTS.filter_trans_homopolymers,
     filter_min_linking_split_reads=DEFAULTS.filter_min_linking_split_reads,
     filter_min_complexity=DEFAULTS.filter_min_complexity,
+    columnar_filters=DEFAULTS.columnar_filters,
     flanking_call_distance=PAIRING_DEFAULTS.flanking_call_distance,
     split_call_distance=PAIRING_DEFAULTS.split_call_distance,
     contig_call_distance=PAIRING_DEFAULTS.contig_call_distance,
@@ -58,79 +59,75 @@ def main(
         CALL_METHOD.SPAN: spanning_call_distance,
     }
 
-    bpps = []
-    bpps.extend(
-        read_inputs(
-            inputs,
-            require=[
-                COLUMNS.event_type,
-                COLUMNS.product_id,
-                COLUMNS.fusion_cdna_coding_end,
-                COLUMNS.fusion_cdna_coding_start,
-                COLUMNS.fusion_splicing_pattern,
-                COLUMNS.fusion_mapped_domains,
-                COLUMNS.gene1,
-                COLUMNS.gene1_direction,
-                COLUMNS.gene2,
-                COLUMNS.gene2_direction,
-                COLUMNS.gene_product_type,
-                COLUMNS.genes_encompassed,
-                COLUMNS.library,
-                COLUMNS.protocol,
-                COLUMNS.transcript1,
-                COLUMNS.transcript2,
-                COLUMNS.untemplated_seq,
-                COLUMNS.tools,
-                COLUMNS.exon_last_5prime,
-                COLUMNS.exon_first_3prime,
-                COLUMNS.disease_status,
-            ],
-            add_default={
-                **{
-                    k: None
-                    for k in [
-                        COLUMNS.contig_remapped_reads,
-                        COLUMNS.contig_seq,
-                        COLUMNS.break1_split_reads,
-                        COLUMNS.break1_split_reads_forced,
-                        COLUMNS.break2_split_reads,
-                        COLUMNS.break2_split_reads_forced,
-                        COLUMNS.linking_split_reads,
-                        COLUMNS.flanking_pairs,
-                        COLUMNS.contigs_assembled,
-                        COLUMNS.contig_alignment_score,
-                        COLUMNS.contig_remap_score,
-                        COLUMNS.spanning_reads,
-                        COLUMNS.annotation_figure,
-                        COLUMNS.gene1_aliases,
-                        COLUMNS.gene2_aliases,
-                        COLUMNS.protein_synon,
-                        COLUMNS.cdna_synon,
-                        COLUMNS.net_size,
-                        COLUMNS.tracking_id,
-                        COLUMNS.assumed_untemplated,
-                        'dgv',
-                        'summary_pairing',
-                    ]
-                },
-                COLUMNS.call_method: CALL_METHOD.INPUT,
-            },
-            expand_strand=False,
-            expand_orient=False,
-            expand_svtype=False,
-            cast={
-                COLUMNS.break1_split_reads: partial(soft_cast, cast_type=int),
-                COLUMNS.break2_split_reads: partial(soft_cast, cast_type=int),
-                COLUMNS.contig_remapped_reads: partial(soft_cast, cast_type=int),
-                COLUMNS.spanning_reads: partial(soft_cast, cast_type=int),
-                COLUMNS.break1_split_reads_forced: partial(soft_cast, cast_type=int),
-                COLUMNS.break2_split_reads_forced: partial(soft_cast, cast_type=int),
-                COLUMNS.flanking_pairs: partial(soft_cast, cast_type=int),
-                COLUMNS.linking_split_reads: partial(soft_cast, cast_type=int),
-                COLUMNS.protein_synon: soft_cast_null,
-                COLUMNS.cdna_synon: soft_cast_null,
+    read_options = dict(
+        require=[
+            COLUMNS.event_type,
+            COLUMNS.product_id,
+            COLUMNS.fusion_cdna_coding_end,
+            COLUMNS.fusion_cdna_coding_start,
+            COLUMNS.fusion_splicing_pattern,
+            COLUMNS.fusion_mapped_domains,
+            COLUMNS.gene1,
+            COLUMNS.gene1_direction,
+            COLUMNS.gene2,
+            COLUMNS.gene2_direction,
+            COLUMNS.gene_product_type,
+            COLUMNS.genes_encompassed,
+            COLUMNS.library,
+            COLUMNS.protocol,
+            COLUMNS.transcript1,
+            COLUMNS.transcript2,
+            COLUMNS.untemplated_seq,
+            COLUMNS.tools,
+            COLUMNS.exon_last_5prime,
+            COLUMNS.exon_first_3prime,
+            COLUMNS.disease_status,
+        ],
+        add_default={
+            **{
+                k: None
+                for k in [
+                    COLUMNS.contig_remapped_reads,
+                    COLUMNS.contig_seq,
+                    COLUMNS.break1_split_reads,
+                    COLUMNS.break1_split_reads_forced,
+                    COLUMNS.break2_split_reads,
+                    COLUMNS.break2_split_reads_forced,
+                    COLUMNS.linking_split_reads,
+                    COLUMNS.flanking_pairs,
+                    COLUMNS.contigs_assembled,
+                    COLUMNS.contig_alignment_score,
+                    COLUMNS.contig_remap_score,
+                    COLUMNS.spanning_reads,
+                    COLUMNS.annotation_figure,
+                    COLUMNS.gene1_aliases,
+                    COLUMNS.gene2_aliases,
+                    COLUMNS.protein_synon,
+                    COLUMNS.cdna_synon,
+                    COLUMNS.net_size,
+                    COLUMNS.tracking_id,
+                    COLUMNS.assumed_untemplated,
+                    'dgv',
+                    'summary_pairing',
+                ]
             },
-        )
+            COLUMNS.call_method: CALL_METHOD.INPUT,
+        },
+        expand_strand=False,
+        expand_orient=False,
+        expand_svtype=False,
+        cast={
+            COLUMNS.break1_split_reads: partial(soft_cast, cast_type=int),
+            COLUMNS.break2_split_reads: partial(soft_cast, cast_type=int),
+            COLUMNS.contig_remapped_reads: partial(soft_cast, cast_type=int),
+            COLUMNS.spanning_reads: partial(soft_cast, cast_type=int),
+            COLUMNS.break1_split_reads_forced: partial(soft_cast, cast_type=int),
+            COLUMNS.break2_split_reads_forced: partial(soft_cast, cast_type=int),
+            COLUMNS.flanking_pairs: partial(soft_cast, cast_type=int),
+            COLUMNS.linking_split_reads: partial(soft_cast, cast_type=int),
+            COLUMNS.protein_synon: soft_cast_null,
+            COLUMNS.cdna_synon: soft_cast_null,
+        },
     )
     # load all transcripts
     reference_transcripts = dict()
@@ -142,65 +139,32 @@ def main(
                 if t.is_best_transcript:
                     best_transcripts[t.name] = t
 
-    filtered_pairs = []
-    temp = []  # store the bpps while we filter out
-
-    for bpp in bpps:
-        # filter by synonymous and RNA homopolymers
-        if filter_protein_synon and bpp.protein_synon:
-            bpp.data[COLUMNS.filter_comment] = 'synonymous protein'
-            filtered_pairs.append(bpp)
-            continue
-        elif filter_cdna_synon and bpp.cdna_synon:
-            bpp.data[COLUMNS.filter_comment] = 'synonymous cdna'
-            filtered_pairs.append(bpp)
-            continue
-        elif all(
-            [
-                filter_trans_homopolymers,
-                bpp.protocol == PROTOCOL.TRANS,
-                bpp.data.get(COLUMNS.repeat_count, None),
-                bpp.event_type in [SVTYPE.DUP, SVTYPE.INS, SVTYPE.DEL],
-            ]
-        ):
-            # a transcriptome event in a repeat region
-            match = re.match(r'^(-?\d+)-(-?\d+)$', str(bpp.data[COLUMNS.net_size]))
-            if match:
-                netsize_min = abs(int(match.group(1)))
-                netsize_max = abs(int(match.group(2)))
-
-                if all(
-                    [
-                        int(bpp.repeat_count) + 1
-                        >= HOMOPOLYMER_MIN_LENGTH,  # repeat count is 1 less than the length of the repeat
-                        netsize_min == netsize_max and netsize_min == 1,
-                        PROTOCOL.GENOME not in bpp.data.get(COLUMNS.pairing, ''),
-                    ]
-                ):
-                    bpp.data[COLUMNS.filter_comment] = 'homopolymer filter'
-                    filtered_pairs.append(bpp)
-                    continue
-        # filter based on the sequence call complexity
-        sc = str(bpp.data.get(COLUMNS.call_sequence_complexity, 'none')).lower()
-        if sc != 'none' and float(sc) < filter_min_complexity:
-            bpp.data[COLUMNS.filter_comment] = 'low complexity'
-            filtered_pairs.append(bpp)
-            continue
-        temp.append(bpp)
-    bpps = temp  # reassign the filtered result
-
-    # filter based on minimum evidence levels
-    bpps, filtered = filter_by_evidence(
-        bpps,
-        filter_min_remapped_reads=filter_min_remapped_reads,
-        filter_min_spanning_reads=filter_min_spanning_reads,
-        filter_min_flanking_reads=filter_min_flanking_reads,
-        filter_min_split_reads=filter_min_split_reads,
-        filter_min_linking_split_reads=filter_min_linking_split_reads,
-    )
-    for pair in filtered:
-        pair.data[COLUMNS.filter_comment] = 'low evidence'
-        filtered_pairs.append(pair)
+    if columnar_filters:
+        bpps, filtered_pairs = filter_table(
+            read_inputs(inputs, rows_only=True, **read_options),
+            filter_cdna_synon=filter_cdna_synon,
+            filter_protein_synon=filter_protein_synon,
+            filter_trans_homopolymers=filter_trans_homopolymers,
+            filter_min_complexity=filter_min_complexity,
+            filter_min_remapped_reads=filter_min_remapped_reads,
+            filter_min_spanning_reads=filter_min_spanning_reads,
+            filter_min_flanking_reads=filter_min_flanking_reads,
+            filter_min_split_reads=filter_min_split_reads,
+            filter_min_linking_split_reads=filter_min_linking_split_reads,
+        )
+    else:
+        bpps, filtered_pairs = filter_pairs(
+            read_inputs(inputs, **read_options),
+            filter_cdna_synon=filter_cdna_synon,
+            filter_protein_synon=filter_protein_synon,
+            filter_trans_homopolymers=filter_trans_homopolymers,
+            filter_min_complexity=filter_min_complexity,
+            filter_min_remapped_reads=filter_min_remapped_reads,
+            filter_min_spanning_reads=filter_min_spanning_reads,
+            filter_min_flanking_reads=filter_min_flanking_reads,
+            filter_min_split_reads=filter_min_split_reads,
+            filter_min_linking_split_reads=filter_min_linking_split_reads,
+        )
 
     bpps_by_library = {}  # split the input pairs by library
     libraries = {}
@@ -1,9 +1,14 @@
-from .constants import PAIRING_STATE
+from bisect import bisect_right
+import re
+
+import numpy as np
+
+from .constants import HOMOPOLYMER_MIN_LENGTH, PAIRING_STATE
 from ..breakpoint import Breakpoint, BreakpointPair
 from ..constants import CALL_METHOD, COLUMNS, DISEASE_STATUS, PROTOCOL, SVTYPE
 from ..interval import Interval
-from ..pairing.pairing import pair_by_distance, product_key
-from ..util import get_connected_components
+from ..pairing.pairing import comparison_distance, equivalent, product_key
+from ..util import bpps_from_row, UnionFind
 
 
 def filter_by_annotations(bpp_list, best_transcripts):
@@ -112,9 +117,10 @@ def group_events(events):
         opposing_strands=first.opposing_strands,
         stranded=first.stranded,
     )
-    data_columns = set()
+    values_by_column = {}
     for bpp in events:
-        data_columns.update(bpp.data.keys())
+        for col, value in bpp.data.items():
+            values_by_column.setdefault(col, set()).add(value)
         if any(
             [
                 bpp.break1.chr != new_bpp.break1.chr,
@@ -148,12 +154,11 @@ def group_events(events):
         COLUMNS.tools,
         COLUMNS.tracking_id,
     }
-    for col in data_columns:
-        new_data = sorted(list({bpp.data[col] for bpp in events}), key=lambda x: str(x))
-        if len(new_data) == 1:
-            new_bpp.data[col] = new_data[0]
-        elif col in list_columns:
-            new_bpp.data[col] = ';'.join([str(v) for v in new_data])
+    for col, values in values_by_column.items():
+        if len(values) == 1:
+            new_bpp.data[col] = next(iter(values))
+        elif col in list_columns:  # only sort and join the columns which are kept
+            new_bpp.data[col] = ';'.join(sorted([str(v) for v in values]))
 
     untemplated_seq = {bpp.untemplated_seq for bpp in events}
     if len(untemplated_seq) == 1:
@@ -165,17 +170,34 @@ def group_events(events):
 def group_by_distance(calls, distances):
     """
     groups a set of calls based on their proximity. Returns a new list of calls where close calls have been merged
+
+    Calls are sorted by their first breakpoint so that the candidates for each call can be found by bisection, and
+    the connected components are built with union-find (skipping the comparison of calls which are already
+    in the same group)
     """
     mapping = {}
     for call in calls:
         mapping.setdefault(product_key(call), []).append(call)
-    pairing = pair_by_distance(calls, distances, against_self=True)
+    sorted_calls = sorted(calls, key=lambda b: b.break1.start)
+    starts = [call.break1.start for call in sorted_calls]
+    max_useq = max([len(c.untemplated_seq) if c.untemplated_seq else 0 for c in calls] + [0])
+    max_distance = max([comparison_distance(c, c, distances) for c in calls] + [0]) + max_useq * 2
+
+    groups = UnionFind([product_key(call) for call in sorted_calls])
+    for i, current in enumerate(sorted_calls):
+        current_key = product_key(current)
+        for other in sorted_calls[i + 1 : bisect_right(starts, current.break1.end + max_distance)]:
+            other_key = product_key(other)
+            if groups.find(current_key) == groups.find(other_key):
+                continue
+            if equivalent(current, other, distances=distances):
+                groups.union(current_key, other_key)
     # merge all the 'close-enough' pairs
     grouped_calls = []
     removed_calls = []
-    for component in get_connected_components(pairing):
+    for component in groups.components():
         if len(component) == 1:
-            grouped_calls.extend(mapping[component.pop()])
+            grouped_calls.extend(mapping[component[0]])
         else:
             pairs = []
             for key in component:
@@ -313,3 +335,285 @@ def filter_by_evidence(
             raise AssertionError('unexpected value for call_method: {}'.format(bpp.call_method))
         filtered.append(bpp)
     return filtered, removed
+
+
+def filter_pairs(
+    bpps,
+    filter_cdna_synon=True,
+    filter_protein_synon=False,
+    filter_trans_homopolymers=True,
+    filter_min_complexity=0,
+    filter_min_remapped_reads=5,
+    filter_min_spanning_reads=5,
+    filter_min_flanking_reads=10,
+    filter_min_split_reads=5,
+    filter_min_linking_split_reads=1,
+):
+    """
+    filter breakpoint pairs by synonymous annotations, RNA homopolymers, call sequence complexity and minimum
+    evidence levels. Filtered pairs have their filter comment set
+
+    Returns:
+        tuple: tuple of a :class:`list` of :class:`~mavis.breakpoint.BreakpointPair` which passed and
+        a :class:`list` of :class:`~mavis.breakpoint.BreakpointPair` which were filtered
+    """
+    filtered_pairs = []
+    passed = []  # store the bpps while we filter out
+
+    for bpp in bpps:
+        # filter by synonymous and RNA homopolymers
+        if filter_protein_synon and bpp.protein_synon:
+            bpp.data[COLUMNS.filter_comment] = 'synonymous protein'
+            filtered_pairs.append(bpp)
+            continue
+        elif filter_cdna_synon and bpp.cdna_synon:
+            bpp.data[COLUMNS.filter_comment] = 'synonymous cdna'
+            filtered_pairs.append(bpp)
+            continue
+        elif all(
+            [
+                filter_trans_homopolymers,
+                bpp.protocol == PROTOCOL.TRANS,
+                bpp.data.get(COLUMNS.repeat_count, None),
+                bpp.event_type in [SVTYPE.DUP, SVTYPE.INS, SVTYPE.DEL],
+            ]
+        ):
+            # a transcriptome event in a repeat region
+            match = re.match(r'^(-?\d+)-(-?\d+)$', str(bpp.data[COLUMNS.net_size]))
+            if match:
+                netsize_min = abs(int(match.group(1)))
+                netsize_max = abs(int(match.group(2)))
+
+                if all(
+                    [
+                        int(bpp.repeat_count) + 1
+                        >= HOMOPOLYMER_MIN_LENGTH,  # repeat count is 1 less than the length of the repeat
+                        netsize_min == netsize_max and netsize_min == 1,
+                        PROTOCOL.GENOME not in bpp.data.get(COLUMNS.pairing, ''),
+                    ]
+                ):
+                    bpp.data[COLUMNS.filter_comment] = 'homopolymer filter'
+                    filtered_pairs.append(bpp)
+                    continue
+        # filter based on the sequence call complexity
+        sc = str(bpp.data.get(COLUMNS.call_sequence_complexity, 'none')).lower()
+        if sc != 'none' and float(sc) < filter_min_complexity:
+            bpp.data[COLUMNS.filter_comment] = 'low complexity'
+            filtered_pairs.append(bpp)
+            continue
+        passed.append(bpp)
+
+    # filter based on minimum evidence levels
+    bpps, filtered = filter_by_evidence(
+        passed,
+        filter_min_remapped_reads=filter_min_remapped_reads,
+        filter_min_spanning_reads=filter_min_spanning_reads,
+        filter_min_flanking_reads=filter_min_flanking_reads,
+        filter_min_split_reads=filter_min_split_reads,
+        filter_min_linking_split_reads=filter_min_linking_split_reads,
+    )
+    for pair in filtered:
+        pair.data[COLUMNS.filter_comment] = 'low evidence'
+        filtered_pairs.append(pair)
+    return bpps, filtered_pairs
+
+
+def _map_unique(values, func):
+    """
+    apply a function once per distinct (string) value of a column and broadcast the result back to all rows
+    """
+    uniques, inverse = np.unique(values.astype(str), return_inverse=True)
+    return np.array([func(u) for u in uniques])[inverse]
+
+
+def _cast_count(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def build_column_table(rows, columns):
+    """
+    convert a list of row dictionaries to a columnar table
+
+    Args:
+        rows (:class:`list` of :class:`dict`): the input rows
+        columns (:class:`list` of :class:`str`): the columns to extract. Missing values are set to None
+
+    Returns:
+        :class:`dict` of :class:`numpy.ndarray` by :class:`str`: object arrays of the values by column name
+    """
+    table = {}
+    for col in columns:
+        table[col] = np.empty(len(rows), dtype=object)
+        table[col][:] = [row.get(col, None) for row in rows]
+    return table
+
+
+def count_column(table, col):
+    """
+    Returns:
+        :class:`numpy.ndarray`: the column as floats where missing counts are treated as 0
+    """
+    counts = _map_unique(table[col], _cast_count)
+    counts[np.isnan(counts)] = 0
+    return counts
+
+
+def filter_by_evidence_mask(
+    table,
+    filter_min_remapped_reads=5,
+    filter_min_spanning_reads=5,
+    filter_min_flanking_reads=10,
+    filter_min_split_reads=5,
+    filter_min_linking_split_reads=1,
+):
+    """
+    vectorized equivalent of :func:`filter_by_evidence` over a columnar table (see :func:`build_column_table`)
+
+    Returns:
+        :class:`numpy.ndarray`: boolean mask of the rows which pass the evidence filters
+    """
+    call_method = table[COLUMNS.call_method].astype(str)
+    unexpected = ~np.isin(call_method, CALL_METHOD.values())
+    if unexpected.any():
+        raise AssertionError(
+            'unexpected value for call_method: {}'.format(call_method[unexpected][0])
+        )
+    b1_split = count_column(table, COLUMNS.break1_split_reads)
+    b2_split = count_column(table, COLUMNS.break2_split_reads)
+    flanking = count_column(table, COLUMNS.flanking_pairs)
+    linking = count_column(table, COLUMNS.linking_split_reads)
+    linking = linking + np.where(table[COLUMNS.event_type].astype(str) == SVTYPE.INS, flanking, 0)
+
+    removed = (call_method == CALL_METHOD.CONTIG) & (
+        count_column(table, COLUMNS.contig_remapped_reads) < filter_min_remapped_reads
+    )
+    removed |= (call_method == CALL_METHOD.SPAN) & (
+        count_column(table, COLUMNS.spanning_reads) < filter_min_spanning_reads
+    )
+    removed |= (call_method == CALL_METHOD.SPLIT) & (
+        (b1_split + count_column(table, COLUMNS.break1_split_reads_forced) < filter_min_split_reads)
+        | (
+            b2_split + count_column(table, COLUMNS.break2_split_reads_forced)
+            < filter_min_split_reads
+        )
+        | (linking < filter_min_linking_split_reads)
+        | (b1_split < 1)
+        | (b2_split < 1)
+    )
+    removed |= (call_method == CALL_METHOD.FLANK) & (flanking < filter_min_flanking_reads)
+    return ~removed
+
+
+def homopolymer_mask(table):
+    """
+    flag single bp transcriptome indels in homopolymer regions which have not been paired to a genomic event
+
+    Returns:
+        :class:`numpy.ndarray`: boolean mask of the rows which should be filtered
+    """
+
+    def single_bp_net_size(net_size):
+        match = re.match(r'^(-?\d+)-(-?\d+)$', net_size)
+        return bool(match) and abs(int(match.group(1))) == 1 and abs(int(match.group(2))) == 1
+
+    def repeat_length(repeat_count):
+        # repeat count is 1 less than the length of the repeat
+        return 0 if repeat_count in {'None', ''} else int(repeat_count) + 1
+
+    return (
+        (table[COLUMNS.protocol].astype(str) == PROTOCOL.TRANS)
+        & np.isin(table[COLUMNS.event_type].astype(str), [SVTYPE.DUP, SVTYPE.INS, SVTYPE.DEL])
+        & (_map_unique(table[COLUMNS.repeat_count], repeat_length) >= HOMOPOLYMER_MIN_LENGTH)
+        & _map_unique(table[COLUMNS.net_size], single_bp_net_size)
+        & (np.char.find(table[COLUMNS.pairing].astype(str), PROTOCOL.GENOME) < 0)
+    )
+
+
+def filter_table(
+    rows,
+    filter_cdna_synon=True,
+    filter_protein_synon=False,
+    filter_trans_homopolymers=True,
+    filter_min_complexity=0,
+    **kwargs
+):
+    """
+    Applies the summary filters as vectorized masks over the input rows and only builds breakpoint pairs for the
+    rows which pass. Rows are split on event type first so each row corresponds to a single call
+
+    Args:
+        rows (:class:`list` of :class:`dict`): rows read by :func:`~mavis.util.read_bpp_rows_from_input_file`
+        **kwargs: minimum evidence levels passed to :func:`filter_by_evidence_mask`
+
+    Returns:
+        tuple: tuple of a :class:`list` of :class:`~mavis.breakpoint.BreakpointPair` which passed
+        and a :class:`list` of :class:`dict` rows which were filtered (in the order they were filtered)
+    """
+    expanded = []
+    for row in rows:
+        event_types = str(row.get(COLUMNS.event_type, None)).split(';')
+        if len(event_types) == 1:
+            expanded.append(row)
+            continue
+        for event_type in event_types:
+            new_row = dict(row)
+            new_row[COLUMNS.event_type] = event_type
+            expanded.append(new_row)
+    rows = expanded
+
+    table = build_column_table(
+        rows,
+        [
+            COLUMNS.call_method,
+            COLUMNS.call_sequence_complexity,
+            COLUMNS.cdna_synon,
+            COLUMNS.event_type,
+            COLUMNS.net_size,
+            COLUMNS.pairing,
+            COLUMNS.protein_synon,
+            COLUMNS.protocol,
+            COLUMNS.repeat_count,
+            COLUMNS.break1_split_reads,
+            COLUMNS.break1_split_reads_forced,
+            COLUMNS.break2_split_reads,
+            COLUMNS.break2_split_reads_forced,
+            COLUMNS.contig_remapped_reads,
+            COLUMNS.flanking_pairs,
+            COLUMNS.linking_split_reads,
+            COLUMNS.spanning_reads,
+        ],
+    )
+    comments = np.full(len(rows), None, dtype=object)
+    kept = np.ones(len(rows), dtype=bool)
+
+    def add_filter(mask, comment):
+        mask = mask & kept  # only the first filter a row fails is reported
+        comments[mask] = comment
+        kept[mask] = False
+
+    def is_set(col):
+        values = table[col].astype(str)
+        return (values != 'None') & (values != '')
+
+    if filter_protein_synon:
+        add_filter(is_set(COLUMNS.protein_synon), 'synonymous protein')
+    if filter_cdna_synon:
+        add_filter(is_set(COLUMNS.cdna_synon), 'synonymous cdna')
+    if filter_trans_homopolymers:
+        add_filter(homopolymer_mask(table), 'homopolymer filter')
+    complexity = _map_unique(table[COLUMNS.call_sequence_complexity], _cast_count)
+    add_filter(complexity < filter_min_complexity, 'low complexity')
+    first_pass = kept.copy()
+    add_filter(~filter_by_evidence_mask(table, **kwargs), 'low evidence')
+
+    filtered = []
+    for index in np.concatenate([np.flatnonzero(~first_pass), np.flatnonzero(first_pass & ~kept)]):
+        rows[index][COLUMNS.filter_comment] = comments[index]
+        filtered.append(rows[index])
+    bpps = []
+    for index in np.flatnonzero(kept):
+        bpps.extend(bpps_from_row(rows[index]))
+    return bpps, filtered
@@ -233,19 +233,36 @@ def filter_on_overlap(bpps, regions_by_reference_name):
     return passed, failed
 
 
-def read_inputs(inputs, **kwargs):
+def read_inputs(inputs, rows_only=False, **kwargs):
+    """
+    read the breakpoint pairs from a list of input files (or file glob expressions)
+
+    Args:
+        inputs (list of str): the input files
+        rows_only (bool): return the cast row dictionaries (see :func:`read_bpp_rows_from_input_file`) instead of
+            converting them to breakpoint pairs
+
+    Returns:
+        :class:`list` of :any:`BreakpointPair`: the pairs (or rows) from all of the input files
+    """
     bpps = []
     kwargs.setdefault('require', [])
     kwargs['require'] = list(set(kwargs['require'] + [COLUMNS.protocol]))
     kwargs.setdefault('in_', {})
     kwargs['in_'][COLUMNS.protocol] = PROTOCOL.values()
+    if rows_only:  # expansion options only apply when converting to breakpoint pairs
+        for opt in ['expand_orient', 'expand_strand', 'expand_svtype']:
+            kwargs.pop(opt, None)
     for finput in bash_expands(*inputs):
         try:
             LOG('loading:', finput)
-            bpps.extend(read_bpp_from_input_file(finput, **kwargs))
+            if rows_only:
+                bpps.extend(read_bpp_rows_from_input_file(finput, **kwargs))
+            else:
+                bpps.extend(read_bpp_from_input_file(finput, **kwargs))
         except tab.EmptyFileError:
             LOG('ignoring empty file:', finput)
-    LOG('loaded', len(bpps), 'breakpoint pairs')
+    LOG('loaded', len(bpps), 'rows' if rows_only else 'breakpoint pairs')
     return bpps
 
 
@@ -299,6 +316,60 @@ def get_connected_components(adj_matrix):
     return components
 
 
+class UnionFind:
+    """
+    disjoint sets over hashable items with path compression and union by size. Used to incrementally
+    build connected components without materializing the adjacency matrix
+
+    Example:
+        >>> sets = UnionFind()
+        >>> root = sets.union(1, 2)
+        >>> sets.find(2) == sets.find(1)
+        True
+    """
+
+    def __init__(self, items=None):
+        self.parent = {}
+        self.size = {}
+        for item in items or []:
+            self.add(item)
+
+    def add(self, item):
+        if item not in self.parent:
+            self.parent[item] = item
+            self.size[item] = 1
+
+    def find(self, item):
+        self.add(item)
+        root = item
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[item] != root:  # compress the path
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, item1, item2):
+        root1 = self.find(item1)
+        root2 = self.find(item2)
+        if root1 == root2:
+            return root1
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        return root1
+
+    def components(self):
+        """
+        Returns:
+            :class:`list` of :class:`list`: the sets, ordered by the first time an item of the set was added
+        """
+        components = {}
+        for item in self.parent:
+            components.setdefault(self.find(item), []).append(item)
+        return list(components.values())
+
+
 def generate_complete_stamp(output_dir, log=DEVNULL, prefix='MAVIS.', start_time=None):
     """
     writes a complete stamp, optionally including the run time if start_time is given
@@ -370,32 +441,17 @@ def unique_exists(pattern, allow_none=False, get_newest=False):
         raise OSError('no result found', pattern)
 
 
-def read_bpp_from_input_file(
-    filename, expand_orient=False, expand_strand=False, expand_svtype=False, **kwargs
-):
+def read_bpp_rows_from_input_file(filename, **kwargs):
     """
-    reads a file using the tab module. Each row is converted to a breakpoint pair and
-    other column data is stored in the data attribute
+    reads a file using the tab module and casts/validates the breakpoint columns without building the
+    breakpoint pairs. Used where rows should be filtered before paying for the conversion to
+    :class:`~mavis.breakpoint.BreakpointPair` (see :func:`bpps_from_row`)
 
     Args:
         filename (str): path to the input file
-        expand_ns (bool): expand not specified orient/strand settings to all specific version
-            (for strand this is only applied if the bam itself is stranded)
-        explicit_strand (bool): used to stop unstranded breakpoint pairs from losing input strand information
-    Returns:
-        :class:`list` of :any:`BreakpointPair`: a list of pairs
-
-    Example:
-        >>> read_bpp_from_input_file('filename')
-        [BreakpointPair(), BreakpointPair(), ...]
-
-    One can also validate other expected columns that will go in the data attribute using the usual arguments
-    to the tab.read_file function
 
-    .. code-block:: python
-
-        >>> read_bpp_from_input_file('filename', cast={'index': int})
-        [BreakpointPair(), BreakpointPair(), ...]
+    Returns:
+        :class:`list` of :class:`dict`: the rows of the input file
     """
 
     def soft_null_cast(value):
@@ -440,22 +496,6 @@ def read_bpp_from_input_file(
         }
     )
     _, rows = tab.read_file(filename, suppress_index=True, **kwargs)
-    restricted = [
-        COLUMNS.break1_chromosome,
-        COLUMNS.break1_position_start,
-        COLUMNS.break1_position_end,
-        COLUMNS.break1_strand,
-        COLUMNS.break1_orientation,
-        COLUMNS.break2_chromosome,
-        COLUMNS.break2_position_start,
-        COLUMNS.break2_position_end,
-        COLUMNS.break2_strand,
-        COLUMNS.break2_orientation,
-        COLUMNS.stranded,
-        COLUMNS.opposing_strands,
-        COLUMNS.untemplated_seq,
-    ]
-    pairs = []
     for line_index, row in enumerate(rows):
         row['line_no'] = line_index + 1
         if '_index' in row:
@@ -472,86 +512,155 @@ def read_bpp_from_input_file(
                         '^([A-Za-z0-9-]+|)(;[A-Za-z0-9-]+)*$',
                         row[attr],
                     )
-        stranded = row[COLUMNS.stranded]
-
-        strand1 = row[COLUMNS.break1_strand] if stranded else STRAND.NS
-        strand2 = row[COLUMNS.break2_strand] if stranded else STRAND.NS
-
-        temp = []
-        expand_strand = stranded and expand_strand
-        event_type = [None]
-        if row.get(COLUMNS.event_type, None) not in [None, 'None']:
-            try:
-                event_type = row[COLUMNS.event_type].split(';')
-                for putative_event_type in event_type:
-                    SVTYPE.enforce(putative_event_type)
-            except KeyError:
-                pass
-
-        for orient1, orient2, strand1, strand2, putative_event_type in itertools.product(
-            ORIENT.expand(row[COLUMNS.break1_orientation])
-            if expand_orient
-            else [row[COLUMNS.break1_orientation]],
-            ORIENT.expand(row[COLUMNS.break2_orientation])
-            if expand_orient
-            else [row[COLUMNS.break2_orientation]],
-            STRAND.expand(strand1) if expand_strand and stranded else [strand1],
-            STRAND.expand(strand2) if expand_strand and stranded else [strand2],
-            event_type,
-        ):
-            try:
-                break1 = Breakpoint(
-                    row[COLUMNS.break1_chromosome],
-                    row[COLUMNS.break1_position_start],
-                    row[COLUMNS.break1_position_end],
-                    strand=strand1,
-                    orient=orient1,
-                )
-                break2 = Breakpoint(
-                    row[COLUMNS.break2_chromosome],
-                    row[COLUMNS.break2_position_start],
-                    row[COLUMNS.break2_position_end],
-                    strand=strand2,
-                    orient=orient2,
-                )
+    return rows
 
-                data = {k: v for k, v in row.items() if k not in restricted}
-                bpp = BreakpointPair(
-                    break1,
-                    break2,
-                    opposing_strands=row[COLUMNS.opposing_strands],
-                    untemplated_seq=row[COLUMNS.untemplated_seq],
-                    stranded=row[COLUMNS.stranded],
-                )
-                bpp.data.update(data)
-                if putative_event_type:
-                    bpp.data[COLUMNS.event_type] = putative_event_type
-                    if putative_event_type not in BreakpointPair.classify(bpp):
-                        raise InvalidRearrangement(
-                            'error: expected one of',
-                            BreakpointPair.classify(bpp),
-                            'but found',
-                            putative_event_type,
-                            str(bpp),
-                            row,
-                        )
-                if expand_svtype and not putative_event_type:
-                    for svtype in BreakpointPair.classify(
-                        bpp, distance=lambda x, y: Interval(y - x)
-                    ):
-                        new_bpp = bpp.copy()
-                        new_bpp.data[COLUMNS.event_type] = svtype
-                        temp.append(new_bpp)
-                else:
-                    temp.append(bpp)
-            except InvalidRearrangement as err:
-                if not any([expand_strand, expand_svtype, expand_orient]):
-                    raise err
-            except AssertionError as err:
-                if not expand_strand:
-                    raise err
-        if not temp:
-            raise InvalidRearrangement('could not produce a valid rearrangement', row)
-        else:
-            pairs.extend(temp)
+
+def bpps_from_row(row, expand_orient=False, expand_strand=False, expand_svtype=False):
+    """
+    convert a row read by :func:`read_bpp_rows_from_input_file` into one or more breakpoint pairs. Other
+    column data is stored in the data attribute
+
+    Args:
+        row (dict): the row to convert
+        expand_orient (bool): expand not specified orientations to all specific versions
+        expand_strand (bool): expand not specified strands to all specific versions (only applied if the
+            row is stranded)
+        expand_svtype (bool): expand an unspecified event type to all possible classifications
+
+    Returns:
+        :class:`list` of :any:`BreakpointPair`: the pairs for this row
+    """
+    restricted = [
+        COLUMNS.break1_chromosome,
+        COLUMNS.break1_position_start,
+        COLUMNS.break1_position_end,
+        COLUMNS.break1_strand,
+        COLUMNS.break1_orientation,
+        COLUMNS.break2_chromosome,
+        COLUMNS.break2_position_start,
+        COLUMNS.break2_position_end,
+        COLUMNS.break2_strand,
+        COLUMNS.break2_orientation,
+        COLUMNS.stranded,
+        COLUMNS.opposing_strands,
+        COLUMNS.untemplated_seq,
+    ]
+    stranded = row[COLUMNS.stranded]
+
+    strand1 = row[COLUMNS.break1_strand] if stranded else STRAND.NS
+    strand2 = row[COLUMNS.break2_strand] if stranded else STRAND.NS
+
+    temp = []
+    expand_strand = stranded and expand_strand
+    event_type = [None]
+    if row.get(COLUMNS.event_type, None) not in [None, 'None']:
+        try:
+            event_type = row[COLUMNS.event_type].split(';')
+            for putative_event_type in event_type:
+                SVTYPE.enforce(putative_event_type)
+        except KeyError:
+            pass
+
+    for orient1, orient2, strand1, strand2, putative_event_type in itertools.product(
+        ORIENT.expand(row[COLUMNS.break1_orientation])
+        if expand_orient
+        else [row[COLUMNS.break1_orientation]],
+        ORIENT.expand(row[COLUMNS.break2_orientation])
+        if expand_orient
+        else [row[COLUMNS.break2_orientation]],
+        STRAND.expand(strand1) if expand_strand and stranded else [strand1],
+        STRAND.expand(strand2) if expand_strand and stranded else [strand2],
+        event_type,
+    ):
+        try:
+            break1 = Breakpoint(
+                row[COLUMNS.break1_chromosome],
+                row[COLUMNS.break1_position_start],
+                row[COLUMNS.break1_position_end],
+                strand=strand1,
+                orient=orient1,
+            )
+            break2 = Breakpoint(
+                row[COLUMNS.break2_chromosome],
+                row[COLUMNS.break2_position_start],
+                row[COLUMNS.break2_position_end],
+                strand=strand2,
+                orient=orient2,
+            )
+
+            data = {k: v for k, v in row.items() if k not in restricted}
+            bpp = BreakpointPair(
+                break1,
+                break2,
+                opposing_strands=row[COLUMNS.opposing_strands],
+                untemplated_seq=row[COLUMNS.untemplated_seq],
+                stranded=row[COLUMNS.stranded],
+            )
+            bpp.data.update(data)
+            if putative_event_type:
+                bpp.data[COLUMNS.event_type] = putative_event_type
+                if putative_event_type not in BreakpointPair.classify(bpp):
+                    raise InvalidRearrangement(
+                        'error: expected one of',
+                        BreakpointPair.classify(bpp),
+                        'but found',
+                        putative_event_type,
+                        str(bpp),
+                        row,
+                    )
+            if expand_svtype and not putative_event_type:
+                for svtype in BreakpointPair.classify(bpp, distance=lambda x, y: Interval(y - x)):
+                    new_bpp = bpp.copy()
+                    new_bpp.data[COLUMNS.event_type] = svtype
+                    temp.append(new_bpp)
+            else:
+                temp.append(bpp)
+        except InvalidRearrangement as err:
+            if not any([expand_strand, expand_svtype, expand_orient]):
+                raise err
+        except AssertionError as err:
+            if not expand_strand:
+                raise err
+    if not temp:
+        raise InvalidRearrangement('could not produce a valid rearrangement', row)
+    return temp
+
+
+def read_bpp_from_input_file(
+    filename, expand_orient=False, expand_strand=False, expand_svtype=False, **kwargs
+):
+    """
+    reads a file using the tab module. Each row is converted to a breakpoint pair and
+    other column data is stored in the data attribute
+
+    Args:
+        filename (str): path to the input file
+        expand_ns (bool): expand not specified orient/strand settings to all specific version
+            (for strand this is only applied if the bam itself is stranded)
+        explicit_strand (bool): used to stop unstranded breakpoint pairs from losing input strand information
+    Returns:
+        :class:`list` of :any:`BreakpointPair`: a list of pairs
+
+    Example:
+        >>> read_bpp_from_input_file('filename')
+        [BreakpointPair(), BreakpointPair(), ...]
+
+    One can also validate other expected columns that will go in the data attribute using the usual arguments
+    to the tab.read_file function
+
+    .. code-block:: python
+
+        >>> read_bpp_from_input_file('filename', cast={'index': int})
+        [BreakpointPair(), BreakpointPair(), ...]
+    """
+    pairs = []
+    for row in read_bpp_rows_from_input_file(filename, **kwargs):
+        pairs.extend(
+            bpps_from_row(
+                row,
+                expand_orient=expand_orient,
+                expand_strand=expand_strand,
+                expand_svtype=expand_svtype,
+            )
+        )
     return pairs
@@ -1,5 +1,6 @@
 import itertools
 import logging
+import math
 from .constants import DEFAULTS
 from ..assemble import assemble
 from ..bam import cigar as _cigar
@@ -22,6 +23,17 @@ from ..interval import Interval
 from ..util import DEVNULL
 
 
+def _reference_span(read):
+    """
+    the 0-based half-open range of reference positions covered by the read alignment
+    """
+    return (
+        read.reference_start,
+        read.reference_start
+        + sum([freq for state, freq in read.cigar if state in _cigar.REFERENCE_ALIGNED_STATES]),
+    )
+
+
 class Evidence(BreakpointPair):
     @property
     def min_expected_fragment_size(self):
@@ -151,6 +163,13 @@ class Evidence(BreakpointPair):
         # bamfile for the window surrounding the breakpoint
         self.counts = [0, 0]  # has to be a list to assign
         self.contigs = []
+        self.assembly_stats = {}  # size of the assembly graph built by assemble_contig
+        # padded reference sequence of each outer window (by chromosome and window)
+        self._reference_windows = {}
+        # reference sequence of the inner window opposite to each breakpoint
+        self._opposite_window_references = {}
+        # k-mer indices of the opposite window references (by breakpoint and k-mer length)
+        self._opposite_window_kmer_indices = {}
 
         self.half_mapped = (set(), set())
 
@@ -185,13 +204,52 @@ class Evidence(BreakpointPair):
             return True
         return False
 
+    def reference_window(self, read, reference_name=None):
+        """
+        the reference sequence to use for re-aligning a read. The sequence of each outer window (padded by the read
+        length) is extracted once and re-used for all the reads which fall within it. Otherwise the genome-wide
+        sequence is returned
+
+        Args:
+            read (pysam.AlignedSegment): the read
+            reference_name (str): the reference the read is aligned to (defaults to the read reference_name)
+
+        Returns:
+            tuple of str and int: the reference sequence and the genomic position of its first base (the offset to subtract
+            from genomic positions to index into the sequence)
+        """
+        chrom = read.reference_name if reference_name is None else reference_name
+        start, end = _reference_span(read)
+        seq = self.reference_genome[chrom].seq
+        windows = self._reference_windows
+        for breakpoint, window in [
+            (self.break1, self.outer_window1),
+            (self.break2, self.outer_window2),
+        ]:
+            if breakpoint.chr != chrom:
+                continue
+            key = (chrom, window.start, window.end)
+            if key not in windows:
+                window_start = max(0, window.start - 1 - self.read_length)
+                window_end = min(len(seq), window.end + self.read_length)
+                window_seq = str(seq[window_start:window_end])
+                windows[key] = None
+                if len(window_seq) == window_end - window_start:
+                    windows[key] = (window_start, window_end, window_seq)
+            if windows[key] is not None:
+                window_start, window_end, window_seq = windows[key]
+                # slices past the end of the reference are truncated the same way on both sequences
+                if window_start <= start and (end <= window_end or window_end == len(seq)):
+                    return window_seq, window_start
+        return seq, 0
+
     def standardize_read(self, read):
         # recomputing to standardize b/c split reads can be used to call breakpoints exactly
         read.set_tag(PYSAM_READ_FLAGS.RECOMPUTED_CIGAR, 1, value_type='i')
+        reference_name = self.bam_cache.get_read_reference_name(read)
         # recalculate the read cigar string to ensure M is replaced with = or X
-        cigar = _cigar.recompute_cigar_mismatch(
-            read, self.reference_genome[self.bam_cache.get_read_reference_name(read)].seq
-        )
+        refseq, offset = self.reference_window(read, reference_name)
+        cigar = _cigar.recompute_cigar_mismatch(read, refseq, reference_offset=offset)
         prefix = 0
         try:
             cigar, prefix = _cigar.extend_softclipping(cigar, self.min_anchor_exact)
@@ -206,9 +264,8 @@ class Evidence(BreakpointPair):
         read.reference_start = read.reference_start + prefix
 
         # makes sure all indels are called as far 'right' as possible
-        read.cigar = _cigar.hgvs_standardize_cigar(
-            read, self.reference_genome[self.bam_cache.get_read_reference_name(read)].seq
-        )
+        refseq, offset = self.reference_window(read, reference_name)
+        read.cigar = _cigar.hgvs_standardize_cigar(read, refseq, reference_offset=offset)
         return read
 
     def putative_event_types(self):
@@ -532,6 +589,52 @@ class Evidence(BreakpointPair):
             added = True
         return added
 
+    def _opposite_window_reference(self, first_breakpoint):
+        """
+        the reference sequence of the inner window opposite to a breakpoint (where the soft-clipped portion of split
+        reads is remapped to)
+
+        Args:
+            first_breakpoint (bool): the split reads are collected for the first breakpoint (or second if false)
+
+        Returns:
+            str: the reference sequence
+        """
+        if first_breakpoint not in self._opposite_window_references:
+            opposite_breakpoint = self.break2 if first_breakpoint else self.break1
+            opposite_window = self.inner_window2 if first_breakpoint else self.inner_window1
+            self._opposite_window_references[first_breakpoint] = str(
+                self.reference_genome[opposite_breakpoint.chr].seq[
+                    opposite_window[0] - 1 : opposite_window[1]
+                ]
+            )
+        return self._opposite_window_references[first_breakpoint]
+
+    def _opposite_window_kmer_index(self, first_breakpoint, kmer_size):
+        """
+        the k-mer index (see :func:`~mavis.bam.read.kmer_index`) of the opposite window reference. This is shared by
+        all the realignments against the window
+        """
+        key = (first_breakpoint, kmer_size)
+        if key not in self._opposite_window_kmer_indices:
+            self._opposite_window_kmer_indices[key] = _read.kmer_index(
+                self._opposite_window_reference(first_breakpoint), kmer_size
+            )
+        return self._opposite_window_kmer_indices[key]
+
+    def _has_opposite_window_seed(self, first_breakpoint, seq, kmer_size):
+        """
+        checks if any k-mer of the sequence occurs in the opposite window. :func:`~mavis.bam.read.nsb_align` only
+        considers alignments seeded by a k-mer exact match (of the min_consecutive_match length) so if there is no
+        shared k-mer there can be no alignment
+        """
+        ref_kmers = self._opposite_window_kmer_index(first_breakpoint, kmer_size)
+        # the same k-mers are used as seeds in nsb_align
+        for i in range(0, len(seq) - kmer_size):
+            if seq[i : i + kmer_size] in ref_kmers:
+                return True
+        return False
+
     def collect_split_read(self, read, first_breakpoint):
         """
         adds a split read if it passes the criteria filters and raises a warning if it does not
@@ -627,42 +730,46 @@ class Evidence(BreakpointPair):
 
         # try mapping the soft-clipped portion to the other breakpoint
         w = (opposite_window[0], opposite_window[1])
-        opposite_breakpoint_ref = self.reference_genome[opposite_breakpoint.chr].seq[
-            w[0] - 1 : w[1]
-        ]
+        opposite_breakpoint_ref = self._opposite_window_reference(first_breakpoint)
 
-        putative_alignments = None
         # figure out how much of the read must match when remaped
         min_match_tgt = read.cigar[-1][1] if breakpoint.orient == ORIENT.LEFT else read.cigar[0][1]
         min_match_tgt = min(min_match_tgt * self.min_anchor_match, min_match_tgt - 1) / len(
             read.query_sequence
         )
-        if not self.opposing_strands:  # same strand
-            sc_align = _read.nsb_align(
-                opposite_breakpoint_ref,
-                read.query_sequence,
-                min_consecutive_match=self.min_anchor_exact,
-                min_match=min_match_tgt,
-                min_overlap_percent=min_match_tgt,
-            )  # split half to this side
-
-            for alignment in sc_align:
-                alignment.flag = read.flag
-            putative_alignments = sc_align
+        remap_seq = (
+            reverse_complement(read.query_sequence)
+            if self.opposing_strands
+            else read.query_sequence
+        )
+        # the opposite window is indexed once and shared by all the split reads
+        seed_index = None
+        if self.min_anchor_exact > 1:
+            seed_index = self._opposite_window_kmer_index(first_breakpoint, self.min_anchor_exact)
+        if (
+            seed_index is not None
+            and opposite_breakpoint_ref
+            and 0 < min_match_tgt <= 1  # otherwise let nsb_align raise the error
+            and not self._has_opposite_window_seed(
+                first_breakpoint, remap_seq, self.min_anchor_exact
+            )
+        ):
+            putative_alignments = []  # no seed for the alignment so skip the remapping
         else:
-            # should align opposite the current read
-            revcomp_sc_align = reverse_complement(read.query_sequence)
-            revcomp_sc_align = _read.nsb_align(
+            # should align opposite the current read if the strands are opposing
+            putative_alignments = _read.nsb_align(
                 opposite_breakpoint_ref,
-                revcomp_sc_align,
+                remap_seq,
                 min_consecutive_match=self.min_anchor_exact,
                 min_match=min_match_tgt,
                 min_overlap_percent=min_match_tgt,
+                ref_kmer_index=seed_index,
             )
-
-            for alignment in revcomp_sc_align:
-                alignment.flag = read.flag ^ PYSAM_READ_FLAGS.REVERSE  # EXOR
-            putative_alignments = revcomp_sc_align
+            for alignment in putative_alignments:
+                if self.opposing_strands:
+                    alignment.flag = read.flag ^ PYSAM_READ_FLAGS.REVERSE  # EXOR
+                else:
+                    alignment.flag = read.flag
 
         scores = []
         for alignment in putative_alignments:  # loop over the alignments
@@ -798,6 +905,15 @@ class Evidence(BreakpointPair):
         """
         # gather reads for the putative assembly
         assembly_sequences = {}
+        complements = {}  # reverse complement each distinct sequence only once
+
+        def add_read(read):
+            seq = read.query_sequence
+            if seq not in complements:
+                complements[seq] = reverse_complement(seq)
+            assembly_sequences.setdefault(seq, set()).add(read)
+            assembly_sequences.setdefault(complements[seq], set()).add(read)
+
         # add split reads
         for read in list(itertools.chain.from_iterable(self.split_reads)) + list(
             self.spanning_reads
@@ -807,25 +923,16 @@ class Evidence(BreakpointPair):
                 PYSAM_READ_FLAGS.TARGETED_ALIGNMENT
             ):
                 continue
-            assembly_sequences.setdefault(read.query_sequence, set()).add(read)
-            rqs_comp = reverse_complement(read.query_sequence)
-            assembly_sequences.setdefault(rqs_comp, set()).add(read)
+            add_read(read)
 
         # add half-mapped reads
         for read in itertools.chain.from_iterable(self.half_mapped):
-            assembly_sequences.setdefault(read.query_sequence, set()).add(read)
-            rqs_comp = reverse_complement(read.query_sequence)
-            assembly_sequences.setdefault(rqs_comp, set()).add(read)
+            add_read(read)
 
         # add flanking reads
         for read, mate in self.flanking_pairs:
-            assembly_sequences.setdefault(read.query_sequence, set()).add(read)
-            rqs_comp = reverse_complement(read.query_sequence)
-            assembly_sequences.setdefault(rqs_comp, set()).add(read)
-
-            assembly_sequences.setdefault(mate.query_sequence, set()).add(mate)
-            rqs_comp = reverse_complement(mate.query_sequence)
-            assembly_sequences.setdefault(rqs_comp, set()).add(mate)
+            add_read(read)
+            add_read(mate)
 
         log('assembly size of {} sequences'.format(len(assembly_sequences) // 2))
 
@@ -834,6 +941,7 @@ class Evidence(BreakpointPair):
             self.read_length - self.assembly_min_exact_match_to_remap, kmer_size
         )
 
+        self.assembly_stats = {'assembly_sequences': len(assembly_sequences)}
         contigs = assemble(
             assembly_sequences,
             kmer_size,
@@ -845,28 +953,31 @@ class Evidence(BreakpointPair):
             remap_min_exact_match=self.assembly_min_exact_match_to_remap,
             assembly_min_uniq=self.assembly_min_uniq,
             min_complexity=self.min_call_complexity,
+            stats=self.assembly_stats,
         )
 
         # add the input reads
         # drop any contigs without reads from both breakpoints
+        break1_reads = {
+            r.query_sequence
+            for r in self.split_reads[0] | self.half_mapped[0] | self.spanning_reads
+        }
+        break2_reads = {
+            r.query_sequence
+            for r in self.split_reads[1] | self.half_mapped[1] | self.spanning_reads
+        }
+        for read, mate in self.flanking_pairs | self.compatible_flanking_pairs:
+            break1_reads.add(read.query_sequence)
+            break2_reads.add(mate.query_sequence)
+
         filtered_contigs = []
         for ctg in contigs:
+            # fan the remapped sequences back out to the reads they were gathered from
             for read_seq in ctg.remapped_sequences:
                 ctg.input_reads.update(assembly_sequences[read_seq.query_sequence])
-            break1_reads = {
-                r.query_sequence
-                for r in self.split_reads[0] | self.half_mapped[0] | self.spanning_reads
-            }
-            break2_reads = {
-                r.query_sequence
-                for r in self.split_reads[1] | self.half_mapped[1] | self.spanning_reads
-            }
-            for read, mate in self.flanking_pairs | self.compatible_flanking_pairs:
-                break1_reads.add(read.query_sequence)
-                break2_reads.add(mate.query_sequence)
 
             ctg_reads = {r.query_sequence for r in ctg.input_reads}
-            ctg_reads.update({reverse_complement(r) for r in ctg_reads})
+            ctg_reads.update({complements[r] for r in ctg_reads})
             if (ctg_reads & break1_reads and ctg_reads & break2_reads) or (
                 not self.interchromosomal and len(self.break1 | self.break2) < self.read_length
             ):
@@ -937,6 +1048,33 @@ class Evidence(BreakpointPair):
             list(filtered_contigs.values()), key=lambda x: (x.remap_score() * -1, x.seq)
         )
 
+    def fetch_sample_bins(self, chrom, window):
+        """
+        the number of bins to split the read limit over when fetching reads for a window. When a depth map is
+        given this is scaled by the number of times the expected reads in the window exceed the read limit so that
+        the reads collected are spread across the window rather than taken from the start of each bin. The number of
+        bins is capped so that the total read limit is still fetched
+
+        Args:
+            chrom (str): the chromosome name
+            window (Interval): the window reads will be fetched from
+
+        Returns:
+            int: the number of bins
+        """
+        if not self.depth_map or not self.fetch_reads_limit:
+            return self.fetch_reads_bins
+        expected = self.depth_map.expected_reads(chrom, window[0], window[1])
+        if expected is None:
+            return self.fetch_reads_bins
+        elif expected <= self.fetch_reads_limit:
+            return 1
+        sample_bins = self.fetch_reads_bins * int(math.ceil(expected / self.fetch_reads_limit))
+        # the read limit is divided by the number of bins requested. Asking for more bins than fit in the window
+        # (see fetch_min_bin_size) or than there are reads to share would reduce the reads fetched instead
+        max_bins = (window[1] - window[0] + 1) // self.fetch_min_bin_size
+        return max(1, min(sample_bins, max_bins, self.fetch_reads_limit))
+
     def load_evidence(self, log=DEVNULL):
         """
         open the associated bam file and read and store the evidence
@@ -1003,7 +1141,7 @@ class Evidence(BreakpointPair):
             self.outer_window1[0],
             self.outer_window1[1],
             read_limit=self.fetch_reads_limit,
-            sample_bins=self.fetch_reads_bins,
+            sample_bins=self.fetch_sample_bins(self.break1.chr, self.outer_window1),
             min_bin_size=self.fetch_min_bin_size,
             cache=True,
             cache_if=cache_if_true,
@@ -1034,7 +1172,7 @@ class Evidence(BreakpointPair):
             self.outer_window2[0],
             self.outer_window2[1],
             read_limit=self.fetch_reads_limit,
-            sample_bins=self.fetch_reads_bins,
+            sample_bins=self.fetch_sample_bins(self.break2.chr, self.outer_window2),
             min_bin_size=self.fetch_min_bin_size,
             cache=True,
             cache_if=cache_if_true,
@@ -1086,7 +1224,7 @@ class Evidence(BreakpointPair):
                 self.compatible_window1[0],
                 self.compatible_window1[1],
                 read_limit=self.fetch_reads_limit,
-                sample_bins=self.fetch_reads_bins,
+                sample_bins=self.fetch_sample_bins(self.break1.chr, self.compatible_window1),
                 min_bin_size=self.fetch_min_bin_size,
                 cache=True,
                 cache_if=cache_if_true,
@@ -1100,7 +1238,7 @@ class Evidence(BreakpointPair):
                 self.compatible_window2[0],
                 self.compatible_window2[1],
                 read_limit=self.fetch_reads_limit,
-                sample_bins=self.fetch_reads_bins,
+                sample_bins=self.fetch_sample_bins(self.break2.chr, self.compatible_window2),
                 min_bin_size=self.fetch_min_bin_size,
                 cache=True,
                 cache_if=cache_if_true,
@@ -3,6 +3,8 @@ from ..align import SUPPORTED_ALIGNER
 from ..util import WeakMavisNamespace
 
 PASS_FILENAME = 'validation-passed.tab'
+CHECKPOINT_FILENAME = 'validation.checkpoint.jsonl'
+PROFILE_FILENAME = 'validation.profile.tab'
 
 DEFAULTS = WeakMavisNamespace()
 """
@@ -18,6 +20,7 @@ DEFAULTS = WeakMavisNamespace()
 - :term:`blat_limit_top_aln`
 - :term:`blat_min_identity`
 - :term:`call_error`
+- :term:`checkpoint_clusters`
 - :term:`contig_aln_max_event_size`
 - :term:`contig_aln_merge_inner_anchor`
 - :term:`contig_aln_merge_outer_anchor`
@@ -25,11 +28,13 @@ DEFAULTS = WeakMavisNamespace()
 - :term:`contig_aln_min_extend_overlap`
 - :term:`contig_aln_min_query_consumption`
 - :term:`contig_aln_min_score`
+- :term:`depth_map`
 - :term:`fetch_min_bin_size`
 - :term:`fetch_reads_bins`
 - :term:`fetch_reads_limit`
 - :term:`filter_secondary_alignments`
 - :term:`fuzzy_mismatch_number`
+- :term:`max_depth_fold`
 - :term:`max_sc_preceeding_anchor`
 - :term:`min_anchor_exact`
 - :term:`min_anchor_fuzzy`
@@ -44,6 +49,7 @@ DEFAULTS = WeakMavisNamespace()
 - :term:`min_spanning_reads_resolution`
 - :term:`min_splits_reads_resolution`
 - :term:`outer_window_min_event_size`
+- :term:`profile_stages`
 - :term:`stdev_count_abnormal`
 - :term:`strand_determining_read`
 
@@ -301,3 +307,35 @@ DEFAULTS.add(
     defn='Remove the aligner output files after the validation stage is complete. Not'
     ' required for subsequent steps but can be useful in debugging and deep investigation of events',
 )
+DEFAULTS.add(
+    'profile_stages',
+    False,
+    defn='write the wall time of each validation stage, the reads fetched and kept, the assembly graph size, the '
+    'contig count and the peak memory (RSS) for each evidence cluster to a tab delimited file in the output directory. '
+    'Useful for finding pathological clusters and tuning :term:`fetch_reads_limit` and :term:`assembly_max_paths`',
+)
+DEFAULTS.add(
+    'checkpoint_clusters',
+    0,
+    defn='Number of input clusters to validate per batch before appending the per-cluster results to the checkpoint '
+    'journal in the output directory. On re-run, clusters already in the journal are skipped and their results are '
+    'included in the outputs. A journal written for different inputs or validation settings is not resumed. The '
+    'aligner input and output files are kept per batch. 0 (default) disables checkpointing',
+)
+DEFAULTS.add(
+    'depth_map',
+    None,
+    cast_type=str,
+    nullable=True,
+    defn='path to the coarse read depth map for the library (written by mavis config with --depth_map_dir). Used to '
+    'predict the number of reads in each evidence window and spread the read limit (:term:`fetch_reads_limit`) across '
+    'the window',
+)
+DEFAULTS.add(
+    'max_depth_fold',
+    None,
+    cast_type=float,
+    nullable=True,
+    defn='Requires :term:`depth_map`. Evidence windows with an expected read depth greater than this many times the '
+    'median depth are filtered before any reads are collected',
+)
@@ -1,3 +1,5 @@
+import bisect
+from collections import Counter
 import itertools
 
 from .base import Evidence
@@ -90,6 +92,69 @@ class GenomeEvidence(Evidence):
         return Interval(abs(read.template_length))
 
 
+class TranscriptSet(set):
+    """
+    the set of transcripts overlapping an evidence object. Also holds the results memoized (by method) from these
+    transcripts, which are discarded whenever the set is modified
+    """
+
+    def __init__(self, *pos):
+        set.__init__(self, *pos)
+        self.memo = {}
+
+    def add(self, transcript):
+        self.memo.clear()
+        set.add(self, transcript)
+
+    def clear(self):
+        self.memo.clear()
+        set.clear(self)
+
+    def discard(self, transcript):
+        self.memo.clear()
+        set.discard(self, transcript)
+
+    def pop(self):
+        self.memo.clear()
+        return set.pop(self)
+
+    def remove(self, transcript):
+        self.memo.clear()
+        set.remove(self, transcript)
+
+    def update(self, *others):
+        self.memo.clear()
+        set.update(self, *others)
+
+    def difference_update(self, *others):
+        self.memo.clear()
+        set.difference_update(self, *others)
+
+    def intersection_update(self, *others):
+        self.memo.clear()
+        set.intersection_update(self, *others)
+
+    def symmetric_difference_update(self, other):
+        self.memo.clear()
+        set.symmetric_difference_update(self, other)
+
+    def __ior__(self, other):
+        self.memo.clear()
+        return set.__ior__(self, other)
+
+    def __iand__(self, other):
+        self.memo.clear()
+        return set.__iand__(self, other)
+
+    def __isub__(self, other):
+        self.memo.clear()
+        return set.__isub__(self, other)
+
+    def __ixor__(self, other):
+        self.memo.clear()
+        return set.__ixor__(self, other)
+
+
 class TranscriptomeEvidence(Evidence):
     def __init__(self, annotations, *pos, **kwargs):
         Evidence.__init__(self, *pos, **kwargs)
@@ -101,6 +166,8 @@ class TranscriptomeEvidence(Evidence):
             self.fetch_reads_limit = self.trans_fetch_reads_limit
 
         self.protocol = PROTOCOL.TRANS
+        # the number of times a memoized result is reused (by method)
+        self.memo_hits = Counter()
         # get the list of overlapping transcripts
         self.overlapping_transcripts = overlapping_transcripts(
             annotations, self.break1
@@ -156,11 +223,21 @@ class TranscriptomeEvidence(Evidence):
             self.compatible_window1 = self.generate_window(compt_break1)
             self.compatible_window2 = self.generate_window(compt_break2)
 
+    @property
+    def overlapping_transcripts(self):
+        """:class:`TranscriptSet`: the transcripts overlapping either breakpoint"""
+        return self._overlapping_transcripts
+
+    @overlapping_transcripts.setter
+    def overlapping_transcripts(self, transcripts):
+        # reassigning the transcripts starts a new (empty) set of memoized results
+        self._overlapping_transcripts = TranscriptSet(transcripts)
+
     def traverse(self, start, distance, direction, strand=STRAND.NS, chrom=None):
         """
         given some genomic position and a distance. Uses the input transcripts to
         compute all possible genomic end positions at that distance if intronic
-        positions are ignored
+        positions are ignored. Results are memoized by the input arguments
 
         Args:
             start (int): the genomic start position
@@ -168,6 +245,17 @@ class TranscriptomeEvidence(Evidence):
             direction (ORIENT): the direction wrt to the positive/forward reference strand to traverse
             transcripts (:class:`list` of :class:`PreTranscript`): list of transcripts to use
         """
+        cache = self.overlapping_transcripts.memo.setdefault('traverse', {})
+        key = (start, distance, direction, strand, chrom)
+        if key in cache:
+            self.memo_hits['traverse'] += 1
+        else:
+            cache[key] = TranscriptomeEvidence._traverse(
+                self, start, distance, direction, strand, chrom
+            )
+        return cache[key]
+
+    def _traverse(self, start, distance, direction, strand=STRAND.NS, chrom=None):
         transcripts = self._select_transcripts(chrom, strand)
         is_left = True if direction == ORIENT.LEFT else False
         genomic_end_positions = set()
@@ -235,8 +323,18 @@ class TranscriptomeEvidence(Evidence):
         give the current list of transcripts, computes the putative exonic/intergenic distance
         given two genomic positions. Intronic positions are ignored
 
-        Intergenic calculations are only done if exonic only fails
+        Intergenic calculations are only done if exonic only fails. Results are memoized by the input arguments (this
+        also deduplicates the fragment size computation for read pairs with the same positions)
         """
+        cache = self.overlapping_transcripts.memo.setdefault('distance', {})
+        key = (start, end, strand, chrom)
+        if key in cache:
+            self.memo_hits['distance'] += 1
+        else:
+            cache[key] = TranscriptomeEvidence._distance(self, start, end, strand, chrom)
+        return cache[key]
+
+    def _distance(self, start, end, strand=STRAND.NS, chrom=None):
         exonic = []
         mixed = []
         inter = []
@@ -308,6 +406,47 @@ class TranscriptomeEvidence(Evidence):
                 exon_boundaries.update({exon.start, exon.end})
         return min(exon_boundaries, key=lambda x: abs(x - pos))
 
+    def exon_boundaries(self, chrom=None):
+        """
+        the collapsed exon boundaries of the overlapping transcripts. Results are memoized by chromosome
+
+        Returns:
+            tuple of list of int and list of int: the sorted exon start and end positions
+        """
+        cache = self.overlapping_transcripts.memo.setdefault('exon_boundaries', {})
+        if chrom in cache:
+            self.memo_hits['exon_boundaries'] += 1
+        else:
+            exon_starts = set()
+            exon_ends = set()
+            for transcript in self._select_transcripts(chrom):
+                for exon in transcript.exons:
+                    exon_starts.add(exon.start)
+                    exon_ends.add(exon.end)
+            cache[chrom] = (sorted(exon_starts), sorted(exon_ends))
+        return cache[chrom]
+
+    def spliced_introns(self):
+        """
+        the introns (as the last base of the preceding exon and the first base of the following exon) of all splicing
+        patterns of the overlapping transcripts. These are the deletions which have an exonic :meth:`distance` of 1
+
+        Returns:
+            :class:`set` of :class:`tuple` of :class:`int` and :class:`int`: the intron boundaries
+        """
+        cache = self.overlapping_transcripts.memo.setdefault('spliced_introns', {})
+        if None in cache:
+            self.memo_hits['spliced_introns'] += 1
+        else:
+            introns = set()
+            for transcript in itertools.chain.from_iterable(
+                [t.transcripts for t in self._select_transcripts()]
+            ):
+                for exon, next_exon in zip(transcript.exons, transcript.exons[1:]):
+                    introns.add((exon.end, next_exon.start))
+            cache[None] = introns
+        return cache[None]
+
     def exon_boundary_shift_cigar(self, read):
         """
         given an input read, converts deletions to N when the deletion matches the exon boundaries. Also shifts alignments
@@ -318,13 +457,8 @@ class TranscriptomeEvidence(Evidence):
         new_cigar = []
 
         # collapsed transcript model
-        exon_ends = set()
-        exon_starts = set()
-        for transcript in self._select_transcripts(read.reference_name):
-            for exon in transcript.exons:
-                exon_starts.add(exon.start)
-                exon_ends.add(exon.end)
-        refseq = self.reference_genome[read.reference_name].seq
+        exon_starts, exon_ends = self.exon_boundaries(read.reference_name)
+        refseq, offset = self.reference_window(read)
         for i, (state, freq) in enumerate(read.cigar):
             # shift to coincide with exon boundaries if possible
             if new_cigar and i < len(read.cigar) - 1 and exon_ends and exon_starts:
@@ -333,11 +467,19 @@ class TranscriptomeEvidence(Evidence):
                 # compare deletions surrounded by exact alignments. Indels at exon boundaries will
                 # be aligned the same as genome indels
                 if state in {CIGAR.D, CIGAR.N} and {next_state} & {prev_state} & {CIGAR.EQ}:
-                    nearest_end_boundary = min(exon_ends, key=lambda x: abs(x - reference_pos - 1))
-                    prev_alignment_seq = refseq[reference_pos - prev_freq : reference_pos]
+                    # nearest exon end to the last aligned base (the preceding end on ties)
+                    index = bisect.bisect_left(exon_ends, reference_pos + 1)
+                    nearest_end_boundary = min(
+                        exon_ends[max(0, index - 1) : index + 1],
+                        key=lambda x: abs(x - reference_pos - 1),
+                    )
+                    prev_alignment_seq = refseq[
+                        reference_pos - prev_freq - offset : reference_pos - offset
+                    ]
                     next_reference_pos = reference_pos + freq
+                    next_alignment_start = max(reference_pos, next_reference_pos - prev_freq)
                     next_alignment_seq = refseq[
-                        max(reference_pos, next_reference_pos - prev_freq) : next_reference_pos
+                        next_alignment_start - offset : next_reference_pos - offset
                     ]
                     shift = 0
                     for prev_base, next_base in zip(
@@ -363,12 +505,11 @@ class TranscriptomeEvidence(Evidence):
                 query_pos += freq
             new_cigar.append((state, freq))
         # mark intron deletions as N instead of D
+        introns = self.spliced_introns()
         reference_pos = read.reference_start
         for i, (state, freq) in enumerate(new_cigar):
-            if state == CIGAR.D:
-                dist = self.distance(reference_pos, reference_pos + freq + 1)
-                if dist.start == 1:
-                    state = CIGAR.N
+            if state == CIGAR.D and (reference_pos, reference_pos + freq + 1) in introns:
+                state = CIGAR.N
             if state in _cigar.REFERENCE_ALIGNED_STATES:
                 reference_pos += freq
             new_cigar[i] = (state, freq)
@@ -1,7 +1,10 @@
 import hashlib
 import itertools
+import json
 import os
 import re
+import resource
+import sys
 import time
 import warnings
 
@@ -9,15 +12,24 @@ import pysam
 from shortuuid import uuid
 
 from .call import call_events
-from .constants import DEFAULTS, PASS_FILENAME
+from .constants import CHECKPOINT_FILENAME, DEFAULTS, PASS_FILENAME, PROFILE_FILENAME
 from .evidence import GenomeEvidence, TranscriptomeEvidence
 from ..align import align_sequences, select_contig_alignments, SUPPORTED_ALIGNER
 from ..annotate.base import BioInterval
 from ..bam import cigar as _cigar
 from ..bam.cache import BamCache
+from ..bam.stats import DepthMap
 from ..breakpoint import BreakpointPair
 from ..constants import CALL_METHOD, COLUMNS, MavisNamespace, PROTOCOL
-from ..util import filter_on_overlap, LOG, mkdirp, output_tabbed_file, read_inputs, write_bed_file
+from ..util import (
+    bash_expands,
+    filter_on_overlap,
+    LOG,
+    mkdirp,
+    output_tabbed_file,
+    read_inputs,
+    write_bed_file,
+)
 
 
 def main(
@@ -62,6 +74,26 @@ def main(
     validation_settings.update(DEFAULTS.items())
     validation_settings.update({k: v for k, v in kwargs.items() if k in DEFAULTS})
     validation_settings = MavisNamespace(**validation_settings)
+    header = None
+    if validation_settings.checkpoint_clusters:
+        header = checkpoint_header(
+            inputs,
+            bam_file=getattr(bam_file, 'filename', bam_file),
+            strand_specific=strand_specific,
+            library=library,
+            protocol=protocol,
+            median_fragment_size=median_fragment_size,
+            stdev_fragment_size=stdev_fragment_size,
+            read_length=read_length,
+            reference_genome=reference_genome.name,
+            annotations=annotations.name,
+            masking=masking.name,
+            aligner_reference=aligner_reference.name,
+            **{k: v for k, v in validation_settings.items() if k not in CHECKPOINT_IGNORED_SETTINGS}
+        )
+    if validation_settings.depth_map:
+        LOG('loading the depth map:', validation_settings.depth_map)
+        validation_settings.depth_map = DepthMap.read(validation_settings.depth_map)
 
     raw_evidence_bam = os.path.join(output, 'raw_evidence.bam')
     contig_bam = os.path.join(output, 'contigs.bam')
@@ -70,16 +102,12 @@ def main(
     passed_output_file = os.path.join(output, PASS_FILENAME)
     passed_bed_file = os.path.join(output, 'validation-passed.bed')
     failed_output_file = os.path.join(output, 'validation-failed.tab')
-    contig_aligner_fa = os.path.join(output, 'contigs.fa')
-    if validation_settings.aligner == SUPPORTED_ALIGNER.BLAT:
-        contig_aligner_output = os.path.join(output, 'contigs.blat_out.pslx')
-        contig_aligner_log = os.path.join(output, 'contigs.blat.log')
-    elif validation_settings.aligner == SUPPORTED_ALIGNER.BWA_MEM:
-        contig_aligner_output = os.path.join(output, 'contigs.bwa_mem.sam')
-        contig_aligner_log = os.path.join(output, 'contigs.bwa_mem.log')
-    else:
-        raise NotImplementedError('unsupported aligner', validation_settings.aligner)
+    contig_aligner_fa, contig_aligner_output, contig_aligner_log = aligner_files(
+        output, 'contigs', validation_settings.aligner
+    )
     igv_batch_file = os.path.join(output, 'igv.batch')
+    checkpoint_file = os.path.join(output, CHECKPOINT_FILENAME)
+    profile_file = os.path.join(output, PROFILE_FILENAME)
     input_bam_cache = BamCache(bam_file, strand_specific)
 
     bpps = read_inputs(
@@ -147,6 +175,209 @@ def main(
     evidence_clusters, filtered_evidence_clusters = filter_on_overlap(
         evidence_clusters, extended_masks
     )
+    if validation_settings.depth_map and validation_settings.max_depth_fold:
+        evidence_clusters, high_depth_clusters = filter_on_depth(
+            evidence_clusters, validation_settings.depth_map, validation_settings.max_depth_fold
+        )
+        LOG('filtered {} clusters in high depth regions'.format(len(high_depth_clusters)))
+        filtered_evidence_clusters.extend(high_depth_clusters)
+    masked_count = len(filtered_evidence_clusters)
+    checkpoint = {}
+    if validation_settings.checkpoint_clusters:
+        checkpoint = read_checkpoint(checkpoint_file)
+        if read_checkpoint_header(checkpoint_file) != header:
+            if checkpoint:
+                raise ValueError(
+                    'cannot resume from the checkpoint journal. It was written for different inputs or '
+                    'validation settings. Remove it or use a new output directory',
+                    checkpoint_file,
+                )
+            write_checkpoint_header(checkpoint_file, header)
+        if checkpoint:
+            LOG(
+                'resuming from checkpoint:',
+                checkpoint_file,
+                '({} clusters)'.format(len(checkpoint)),
+            )
+    evidence_by_cluster = {}
+    for evidence in evidence_clusters:
+        evidence_by_cluster.setdefault(evidence.cluster_id, []).append(evidence)
+    # all evidence for a given input cluster is validated in the same batch
+    batches = [[]]
+    for cluster_id, cluster_evidence in evidence_by_cluster.items():
+        if cluster_id in checkpoint:
+            continue
+        if (
+            validation_settings.checkpoint_clusters
+            and len({e.cluster_id for e in batches[-1]}) >= validation_settings.checkpoint_clusters
+        ):
+            batches.append([])
+        batches[-1].extend(cluster_evidence)
+
+    write_bed_file(
+        evidence_bed,
+        itertools.chain.from_iterable([e.get_bed_repesentation() for e in evidence_clusters]),
+    )
+    event_calls = []
+    total_pass = 0
+    profiles = None
+    if validation_settings.profile_stages:
+        profiles = {}
+    for batch_index, batch in enumerate(batches):
+        if profiles is not None:
+            for evidence in batch:
+                profiles[id(evidence)] = evidence_profile(evidence, batch_index)
+        contig_sequences = assemble_clusters(batch, profiles=profiles)
+        if validation_settings.checkpoint_clusters:
+            # keep the aligner files of each batch (named by its clusters) so that they agree with each other
+            batch_name = hashlib.md5(
+                ','.join(sorted({e.cluster_id for e in batch})).encode('utf-8')
+            ).hexdigest()[:12]
+            contig_aligner_fa, contig_aligner_output, contig_aligner_log = aligner_files(
+                output, 'contigs.batch-' + batch_name, validation_settings.aligner
+            )
+
+        LOG('will output:', contig_aligner_fa, contig_aligner_output)
+        stage_start = time.time()
+        raw_contig_alignments = align_sequences(
+            contig_sequences,
+            input_bam_cache,
+            reference_genome=reference_genome.content,
+            aligner_fa_input_file=contig_aligner_fa,
+            aligner_output_file=contig_aligner_output,
+            clean_files=validation_settings.clean_aligner_files,
+            aligner=kwargs.get('aligner', validation_settings.aligner),
+            aligner_reference=aligner_reference.name[0],
+            aligner_output_log=contig_aligner_log,
+            blat_min_identity=kwargs.get(
+                'blat_min_identity', validation_settings.blat_min_identity
+            ),
+            blat_limit_top_aln=kwargs.get(
+                'blat_limit_top_aln', validation_settings.blat_limit_top_aln
+            ),
+            log=LOG,
+        )
+        align_time = time.time() - stage_start
+        for evidence in batch:
+            stage_start = time.time()
+            select_contig_alignments(evidence, raw_contig_alignments)
+            if profiles is not None:
+                profiles[id(evidence)].update(
+                    {
+                        'align_sequences_time': round(align_time, 3),
+                        'select_contig_alignments_time': round(time.time() - stage_start, 3),
+                        'contig_alignments': sum(
+                            [len(contig.alignments) for contig in evidence.contigs]
+                        ),
+                        'peak_rss_mb': peak_rss_mb(),
+                    }
+                )
+        LOG('alignment complete', time_stamp=True)
+        batch_calls, batch_failures = call_clusters(
+            batch, reference_genome.content, profiles=profiles
+        )
+        event_calls.extend(batch_calls)
+        filtered_evidence_clusters.extend(batch_failures)
+        total_pass += len(batch) - len(batch_failures)
+
+        if validation_settings.checkpoint_clusters:
+            for cluster_id in sorted({e.cluster_id for e in batch}):
+                checkpoint[cluster_id] = append_checkpoint(
+                    checkpoint_file,
+                    cluster_id,
+                    passed=[c for c in batch_calls if c.cluster_id == cluster_id],
+                    failed=[e for e in batch_failures if e.cluster_id == cluster_id],
+                    contigs={
+                        contig_name(contig): contig.seq
+                        for e in evidence_by_cluster[cluster_id]
+                        for contig in e.contigs
+                    },
+                )
+    LOG(
+        '{} putative calls resulted in {} events with 1 or more event call'.format(
+            sum([len(batch) for batch in batches]), total_pass
+        ),
+        time_stamp=True,
+    )
+    passed_bed = itertools.chain.from_iterable([e.get_bed_repesentation() for e in event_calls])
+    if validation_settings.checkpoint_clusters:
+        # output all clusters from the journal (including those validated by a previous run)
+        event_calls = []
+        filtered_evidence_clusters = filtered_evidence_clusters[:masked_count]
+        passed_bed = []
+        for cluster_id in evidence_by_cluster:
+            event_calls.extend(checkpoint[cluster_id]['passed'])
+            filtered_evidence_clusters.extend(checkpoint[cluster_id]['failed'])
+            passed_bed.extend(checkpoint[cluster_id]['bed'])
+    output_tabbed_file(event_calls, passed_output_file)
+    output_tabbed_file(filtered_evidence_clusters, failed_output_file)
+    write_bed_file(passed_bed_file, passed_bed)
+    if profiles is not None:
+        output_tabbed_file(
+            [profiles[id(e)] for batch in batches for e in batch],
+            profile_file,
+            header=PROFILE_COLUMNS,
+        )
+
+    if validation_settings.write_evidence_files:
+        with pysam.AlignmentFile(contig_bam, 'wb', template=input_bam_cache.fh) as fh:
+            LOG('writing:', contig_bam, time_stamp=True)
+            for evidence in evidence_clusters:
+                for contig in evidence.contigs:
+                    for aln in contig.alignments:
+                        aln.read1.cigar = _cigar.convert_for_igv(aln.read1.cigar)
+                        fh.write(aln.read1)
+                        if aln.read2:
+                            aln.read2.cigar = _cigar.convert_for_igv(aln.read2.cigar)
+                            fh.write(aln.read2)
+
+        # write the evidence
+        with pysam.AlignmentFile(raw_evidence_bam, 'wb', template=input_bam_cache.fh) as fh:
+            LOG('writing:', raw_evidence_bam, time_stamp=True)
+            reads = set()
+            for evidence in evidence_clusters:
+                reads.update(evidence.supporting_reads())
+            for read in reads:
+                read.cigar = _cigar.convert_for_igv(read.cigar)
+                fh.write(read)
+        # now sort the contig bam
+        sort = re.sub(r'.bam$', '.sorted.bam', contig_bam)
+        LOG('sorting the bam file:', contig_bam, time_stamp=True)
+        pysam.sort('-o', sort, contig_bam)
+        contig_bam = sort
+        LOG('indexing the sorted bam:', contig_bam)
+        pysam.index(contig_bam)
+
+        # then sort the evidence bam file
+        sort = re.sub(r'.bam$', '.sorted.bam', raw_evidence_bam)
+        LOG('sorting the bam file:', raw_evidence_bam, time_stamp=True)
+        pysam.sort('-o', sort, raw_evidence_bam)
+        raw_evidence_bam = sort
+        LOG('indexing the sorted bam:', raw_evidence_bam)
+        pysam.index(raw_evidence_bam)
+
+        # write the igv batch file
+        with open(igv_batch_file, 'w') as fh:
+            LOG('writing:', igv_batch_file, time_stamp=True)
+
+            fh.write('load {} name="{}"\n'.format(passed_bed_file, 'passed events'))
+            fh.write('load {} name="{}"\n'.format(contig_bam, 'aligned contigs'))
+            fh.write('load {} name="{}"\n'.format(evidence_bed, 'evidence windows'))
+            fh.write('load {} name="{}"\n'.format(raw_evidence_bam, 'raw evidence'))
+            fh.write('load {} name="{} {} input"\n'.format(bam_file, library, protocol))
+
+
+def assemble_clusters(evidence_clusters, profiles=None):
+    """
+    collect the evidence for and assemble contigs from each of the evidence clusters
+
+    Args:
+        evidence_clusters (:class:`list` of :class:`~mavis.validate.base.Evidence`): the evidence clusters to assemble
+        profiles (:class:`dict` of :class:`dict` by :class:`int`): if given, the stage profile of each evidence cluster (by id) is updated
+
+    Returns:
+        :class:`dict` of :class:`str` by :class:`str`: the contig sequences by name
+    """
     contig_sequences = {}
     for i, evidence in enumerate(evidence_clusters):
         LOG()
@@ -183,7 +414,9 @@ def main(
             ),
             time_stamp=False,
         )
+        stage_start = time.time()
         evidence.load_evidence(log=LOG)
+        load_time = time.time() - stage_start
         LOG(
             'flanking pairs: {};'.format(len(evidence.flanking_pairs)),
             'split reads: {}, {};'.format(*[len(a) for a in evidence.split_reads]),
@@ -193,10 +426,27 @@ def main(
             len(evidence.compatible_flanking_pairs),
             time_stamp=False,
         )
+        stage_start = time.time()
         evidence.assemble_contig(log=LOG)
+        if profiles is not None:
+            profile = profiles.setdefault(id(evidence), evidence_profile(evidence))
+            profile.update(evidence.assembly_stats)
+            profile.update(
+                {
+                    'load_evidence_time': round(load_time, 3),
+                    'break1_reads_fetched': evidence.counts[0],
+                    'break2_reads_fetched': evidence.counts[1],
+                    'reads_kept': len(
+                        evidence.supporting_reads() | set().union(*evidence.half_mapped)
+                    ),
+                    'assemble_contig_time': round(time.time() - stage_start, 3),
+                    'contigs': len(evidence.contigs),
+                    'peak_rss_mb': peak_rss_mb(),
+                }
+            )
         LOG('assembled {} contigs'.format(len(evidence.contigs)), time_stamp=False)
         for contig in evidence.contigs:
-            name = 'seq-{}'.format(hashlib.md5(contig.seq.encode('utf-8')).hexdigest())
+            name = contig_name(contig)
             LOG(
                 '>',
                 name,
@@ -207,31 +457,25 @@ def main(
             )
             LOG(contig.seq[:140], time_stamp=False)
             contig_sequences[name] = contig.seq
+    return contig_sequences
 
-    LOG('will output:', contig_aligner_fa, contig_aligner_output)
-    raw_contig_alignments = align_sequences(
-        contig_sequences,
-        input_bam_cache,
-        reference_genome=reference_genome.content,
-        aligner_fa_input_file=contig_aligner_fa,
-        aligner_output_file=contig_aligner_output,
-        clean_files=validation_settings.clean_aligner_files,
-        aligner=kwargs.get('aligner', validation_settings.aligner),
-        aligner_reference=aligner_reference.name[0],
-        aligner_output_log=contig_aligner_log,
-        blat_min_identity=kwargs.get('blat_min_identity', validation_settings.blat_min_identity),
-        blat_limit_top_aln=kwargs.get('blat_limit_top_aln', validation_settings.blat_limit_top_aln),
-        log=LOG,
-    )
-    for evidence in evidence_clusters:
-        select_contig_alignments(evidence, raw_contig_alignments)
-    LOG('alignment complete', time_stamp=True)
+
+def call_clusters(evidence_clusters, reference_genome, profiles=None):
+    """
+    call events from the evidence clusters (after the contig alignments have been selected)
+
+    Args:
+        evidence_clusters (:class:`list` of :class:`~mavis.validate.base.Evidence`): the evidence clusters to call events for
+        reference_genome (:class:`dict` of :class:`Bio.SeqRecord` by :class:`str`): dict of reference sequence by template/chr name
+        profiles (:class:`dict` of :class:`dict` by :class:`int`): if given, the stage profile of each evidence cluster (by id) is updated
+
+    Returns:
+        tuple:
+            - :class:`list` of :class:`~mavis.validate.call.EventCall`: the events called
+            - :class:`list` of :class:`~mavis.validate.base.Evidence`: the evidence clusters which failed to call any events
+    """
     event_calls = []
-    total_pass = 0
-    write_bed_file(
-        evidence_bed,
-        itertools.chain.from_iterable([e.get_bed_repesentation() for e in evidence_clusters]),
-    )
+    failed = []
     validation_counts = {}
     for index, evidence in enumerate(evidence_clusters):
         LOG()
@@ -248,21 +492,28 @@ def main(
         LOG('source:', evidence)
         calls = []
         failure_comment = None
+        stage_start = time.time()
         try:
             calls = call_events(evidence)
             event_calls.extend(calls)
         except UserWarning as err:
             LOG('warning: error in calling events', repr(err))
             failure_comment = str(err)
+        if profiles is not None:
+            profiles.setdefault(id(evidence), evidence_profile(evidence)).update(
+                {
+                    'call_events_time': round(time.time() - stage_start, 3),
+                    'events_called': len(calls),
+                    'peak_rss_mb': peak_rss_mb(),
+                }
+            )
 
         if not calls:
             failure_comment = (
                 ['zero events were called'] if failure_comment is None else failure_comment
             )
             evidence.data[COLUMNS.filter_comment] = failure_comment
-            filtered_evidence_clusters.append(evidence)
-        else:
-            total_pass += 1
+            failed.append(evidence)
 
         LOG('called {} event(s)'.format(len(calls)), time_stamp=True)
         for call in calls:
@@ -307,73 +558,267 @@ def main(
                 )
             )
 
-    # write the output validated clusters (split by type and contig)
-    for i, call in enumerate(event_calls):
+    for call in event_calls:
         b1_homseq = None
         b2_homseq = None
         try:
-            b1_homseq, b2_homseq = call.breakpoint_sequence_homology(reference_genome.content)
+            b1_homseq, b2_homseq = call.breakpoint_sequence_homology(reference_genome)
         except AttributeError:
             pass
         call.data.update(
             {COLUMNS.break1_homologous_seq: b1_homseq, COLUMNS.break2_homologous_seq: b2_homseq}
         )
-    LOG(
-        '{} putative calls resulted in {} events with 1 or more event call'.format(
-            len(evidence_clusters), total_pass
-        ),
-        time_stamp=True,
-    )
-    output_tabbed_file(event_calls, passed_output_file)
-    output_tabbed_file(filtered_evidence_clusters, failed_output_file)
-    write_bed_file(
-        passed_bed_file,
-        itertools.chain.from_iterable([e.get_bed_repesentation() for e in event_calls]),
+    return event_calls, failed
+
+
+CHECKPOINT_HEADER = 'checkpoint_header'
+""":class:`str`: key of the first entry of the checkpoint journal which holds the inputs and settings it was written for"""
+
+CHECKPOINT_IGNORED_SETTINGS = {
+    'checkpoint_clusters',
+    'clean_aligner_files',
+    'profile_stages',
+    'write_evidence_files',
+}
+""":class:`set` of :class:`str`: validation settings which do not change the results and so can differ when resuming"""
+
+
+PROFILE_COLUMNS = [
+    COLUMNS.cluster_id,
+    COLUMNS.tracking_id,
+    'batch',
+    'break1',
+    'break2',
+    'load_evidence_time',
+    'break1_reads_fetched',
+    'break2_reads_fetched',
+    'reads_kept',
+    'assemble_contig_time',
+    'assembly_sequences',
+    'assembly_graph_nodes',
+    'assembly_graph_edges',
+    'assembly_paths',
+    'contigs',
+    'align_sequences_time',
+    'select_contig_alignments_time',
+    'contig_alignments',
+    'call_events_time',
+    'events_called',
+    'peak_rss_mb',
+]
+"""
+:class:`list` of :class:`str`: columns of the validation stage profile. Times are wall time in seconds. The
+align_sequences_time is for the whole batch the evidence cluster was aligned in and peak_rss_mb is the peak memory of
+the process at the end of the last stage recorded for the evidence cluster
+"""
+
+
+def peak_rss_mb():
+    """
+    Returns:
+        float: the peak resident set size (memory) of the current process in MB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':  # reported in bytes rather than kilobytes
+        peak /= 1024
+    return round(peak / 1024, 1)
+
+
+def evidence_profile(evidence, batch=None):
+    """
+    start the stage profile for an evidence cluster
+
+    Args:
+        evidence (:class:`~mavis.validate.base.Evidence`): the evidence cluster
+        batch (int): index of the batch the evidence is validated in
+
+    Returns:
+        dict: the profile row
+    """
+    return {
+        COLUMNS.cluster_id: evidence.data.get(COLUMNS.cluster_id),
+        COLUMNS.tracking_id: evidence.data.get(COLUMNS.tracking_id),
+        'batch': batch,
+        'break1': '{0.chr}:{0.start}-{0.end}{0.orient}'.format(evidence.break1),
+        'break2': '{0.chr}:{0.start}-{0.end}{0.orient}'.format(evidence.break2),
+    }
+
+
+def filter_on_depth(evidence_clusters, depth_map, max_depth_fold):
+    """
+    filter evidence where either outer window has an expected read depth greater than max_depth_fold times the
+    median depth
+
+    Args:
+        evidence_clusters (:class:`list` of :class:`~mavis.validate.base.Evidence`): the evidence to filter
+        depth_map (:class:`~mavis.bam.stats.DepthMap`): the depth map for the library
+        max_depth_fold (float): the maximum depth relative to the median depth
+
+    Returns:
+        tuple:
+            - :class:`list` of :class:`~mavis.validate.base.Evidence`: the evidence which passed the filter
+            - :class:`list` of :class:`~mavis.validate.base.Evidence`: the evidence which was filtered
+    """
+    passed = []
+    failed = []
+    for evidence in evidence_clusters:
+        fold = 0
+        for chrom, window in [
+            (evidence.break1.chr, evidence.outer_window1),
+            (evidence.break2.chr, evidence.outer_window2),
+        ]:
+            fold = max(fold, depth_map.fold(chrom, window[0], window[1]) or 0)
+        if fold > max_depth_fold:
+            evidence.data[
+                COLUMNS.filter_comment
+            ] = 'expected read depth is {:.1f}x the median'.format(fold)
+            failed.append(evidence)
+        else:
+            passed.append(evidence)
+    return passed, failed
+
+
+def contig_name(contig):
+    """
+    name used for the contig sequence in the aligner input (a hash of the sequence)
+    """
+    return 'seq-{}'.format(hashlib.md5(contig.seq.encode('utf-8')).hexdigest())
+
+
+def aligner_files(output, prefix, aligner):
+    """
+    Args:
+        output (str): path to the output directory
+        prefix (str): prefix for the file names
+        aligner (SUPPORTED_ALIGNER): the aligner
+
+    Returns:
+        tuple of str and str and str: paths to the aligner input fasta, the aligner output and the aligner log
+    """
+    if aligner == SUPPORTED_ALIGNER.BLAT:
+        suffix = 'blat'
+        output_suffix = 'blat_out.pslx'
+    elif aligner == SUPPORTED_ALIGNER.BWA_MEM:
+        suffix = 'bwa_mem'
+        output_suffix = 'bwa_mem.sam'
+    else:
+        raise NotImplementedError('unsupported aligner', aligner)
+    return (
+        os.path.join(output, prefix + '.fa'),
+        os.path.join(output, '{}.{}'.format(prefix, output_suffix)),
+        os.path.join(output, '{}.{}.log'.format(prefix, suffix)),
     )
 
-    if validation_settings.write_evidence_files:
-        with pysam.AlignmentFile(contig_bam, 'wb', template=input_bam_cache.fh) as fh:
-            LOG('writing:', contig_bam, time_stamp=True)
-            for evidence in evidence_clusters:
-                for contig in evidence.contigs:
-                    for aln in contig.alignments:
-                        aln.read1.cigar = _cigar.convert_for_igv(aln.read1.cigar)
-                        fh.write(aln.read1)
-                        if aln.read2:
-                            aln.read2.cigar = _cigar.convert_for_igv(aln.read2.cigar)
-                            fh.write(aln.read2)
 
-        # write the evidence
-        with pysam.AlignmentFile(raw_evidence_bam, 'wb', template=input_bam_cache.fh) as fh:
-            LOG('writing:', raw_evidence_bam, time_stamp=True)
-            reads = set()
-            for evidence in evidence_clusters:
-                reads.update(evidence.supporting_reads())
-            for read in reads:
-                read.cigar = _cigar.convert_for_igv(read.cigar)
-                fh.write(read)
-        # now sort the contig bam
-        sort = re.sub(r'.bam$', '.sorted.bam', contig_bam)
-        LOG('sorting the bam file:', contig_bam, time_stamp=True)
-        pysam.sort('-o', sort, contig_bam)
-        contig_bam = sort
-        LOG('indexing the sorted bam:', contig_bam)
-        pysam.index(contig_bam)
+def checkpoint_header(inputs, **settings):
+    """
+    header identifying the inputs and settings a checkpoint journal was written for
 
-        # then sort the evidence bam file
-        sort = re.sub(r'.bam$', '.sorted.bam', raw_evidence_bam)
-        LOG('sorting the bam file:', raw_evidence_bam, time_stamp=True)
-        pysam.sort('-o', sort, raw_evidence_bam)
-        raw_evidence_bam = sort
-        LOG('indexing the sorted bam:', raw_evidence_bam)
-        pysam.index(raw_evidence_bam)
+    Args:
+        inputs (list): list of input files (or glob expressions) containing the breakpoint pairs
+        settings: the other arguments and settings of the validation run
 
-        # write the igv batch file
-        with open(igv_batch_file, 'w') as fh:
-            LOG('writing:', igv_batch_file, time_stamp=True)
+    Returns:
+        dict: the header entry
+    """
+    checksums = []
+    for filename in sorted(bash_expands(*inputs)):
+        with open(filename, 'rb') as fh:
+            checksums.append(hashlib.md5(fh.read()).hexdigest())
+    header = {CHECKPOINT_HEADER: {'inputs': checksums, 'settings': settings}}
+    # compare as it would be read back from the journal
+    return json.loads(json.dumps(header, default=str, sort_keys=True))
 
-            fh.write('load {} name="{}"\n'.format(passed_bed_file, 'passed events'))
-            fh.write('load {} name="{}"\n'.format(contig_bam, 'aligned contigs'))
-            fh.write('load {} name="{}"\n'.format(evidence_bed, 'evidence windows'))
-            fh.write('load {} name="{}"\n'.format(raw_evidence_bam, 'raw evidence'))
-            fh.write('load {} name="{} {} input"\n'.format(bam_file, library, protocol))
+
+def read_checkpoint_header(filename):
+    """
+    Args:
+        filename (str): path to the checkpoint journal
+
+    Returns:
+        dict: the header entry of the journal (None if the journal does not exist or does not start with a header)
+    """
+    if not os.path.exists(filename):
+        return None
+    with open(filename, 'r') as fh:
+        try:
+            entry = json.loads(fh.readline())
+        except ValueError:
+            return None
+    return entry if CHECKPOINT_HEADER in entry else None
+
+
+def write_checkpoint_header(filename, header):
+    """
+    start a new checkpoint journal (replacing any existing file)
+
+    Args:
+        filename (str): path to the checkpoint journal
+        header (dict): the header entry (see :func:`checkpoint_header`)
+    """
+    with open(filename, 'w') as fh:
+        fh.write(json.dumps(header, sort_keys=True) + '\n')
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def read_checkpoint(filename):
+    """
+    read the per-cluster results which have already been appended to the validation checkpoint journal
+
+    Args:
+        filename (str): path to the checkpoint journal
+
+    Returns:
+        :class:`dict` of :class:`dict` by :class:`str`: the journal entries by cluster id
+    """
+    entries = {}
+    if not os.path.exists(filename):
+        return entries
+    with open(filename, 'r') as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+            except ValueError:  # incomplete entry written when the previous run was killed
+                LOG('ignoring incomplete checkpoint entry')
+                continue
+            if CHECKPOINT_HEADER in entry:
+                continue
+            entries[entry[COLUMNS.cluster_id]] = entry
+    return entries
+
+
+def append_checkpoint(filename, cluster_id, passed, failed, contigs):
+    """
+    append the results for a completed cluster to the validation checkpoint journal
+
+    Args:
+        filename (str): path to the checkpoint journal
+        cluster_id (str): the cluster id
+        passed (:class:`list` of :class:`~mavis.validate.call.EventCall`): the events called for this cluster
+        failed (:class:`list` of :class:`~mavis.validate.base.Evidence`): the evidence for this cluster which failed
+        contigs (:class:`dict` of :class:`str` by :class:`str`): contig sequences by name
+
+    Returns:
+        dict: the journal entry
+    """
+    entry = {
+        COLUMNS.cluster_id: cluster_id,
+        'passed': [call.flatten() for call in passed],
+        'failed': [evidence.flatten() for evidence in failed],
+        'bed': list(itertools.chain.from_iterable([c.get_bed_repesentation() for c in passed])),
+        'contigs': contigs,
+    }
+    # start on a new line if the last entry was truncated
+    truncated = False
+    if os.path.exists(filename) and os.path.getsize(filename):
+        with open(filename, 'rb') as fh:
+            fh.seek(-1, os.SEEK_END)
+            truncated = fh.read(1) != b'\n'
+    with open(filename, 'a') as fh:
+        if truncated:
+            fh.write('\n')
+        fh.write(json.dumps(entry, default=str) + '\n')
+        fh.flush()
+        os.fsync(fh.fileno())
+    return json.loads(json.dumps(entry, default=str))
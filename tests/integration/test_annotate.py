@@ -1,7 +1,7 @@
 import os
 import unittest
 
-from mavis.annotate.base import BioInterval, ReferenceName
+from mavis.annotate.base import BioInterval, ReferenceName, sequence_digest
 from mavis.annotate.file_io import load_reference_genes, load_reference_genome
 from mavis.annotate.genomic import Exon, Gene, Template, Transcript, PreTranscript
 from mavis.annotate.protein import calculate_orf, Domain, DomainRegion, translate, Translation
@@ -13,7 +13,7 @@ from mavis.annotate.variant import (
     flatten_fusion_transcript,
     overlapping_transcripts,
 )
-from mavis.annotate.fusion import determine_prime, FusionTranscript
+from mavis.annotate.fusion import determine_prime, FusionTranscript, FusionTranscriptCache
 from mavis.annotate.constants import SPLICE_TYPE
 from mavis.breakpoint import Breakpoint, BreakpointPair
 from mavis.constants import ORIENT, PRIME, PROTOCOL, reverse_complement, STRAND, SVTYPE
@@ -261,6 +261,32 @@ class TestFusionTranscript(unittest.TestCase):
         self.assertEqual(600, e.end)
         self.assertEqual('A' * 100, seq[e.start - 1 : e.end])
 
+    def test_build_cached(self):
+        t = PreTranscript(exons=[self.x, self.y, self.z, self.w, self.s], strand=STRAND.POS)
+        ref = {REF_CHR: MockObject(seq=self.reference_sequence)}
+
+        def make_annotation(end):
+            bpp = BreakpointPair(
+                Breakpoint(REF_CHR, 599, orient=ORIENT.LEFT),
+                Breakpoint(REF_CHR, end, orient=ORIENT.RIGHT),
+                opposing_strands=False,
+                untemplated_seq='ATCGATCG',
+            )
+            return Annotation(
+                bpp, transcript1=t, transcript2=t, event_type=SVTYPE.DEL, protocol=PROTOCOL.GENOME
+            )
+
+        cache = FusionTranscriptCache(maxsize=1)
+        ft = cache.build(make_annotation(1200), ref)
+        self.assertEqual(FusionTranscript.build(make_annotation(1200), ref).seq, ft.seq)
+        self.assertIs(ft, cache.build(make_annotation(1200), ref))
+        self.assertEqual((1, 1, 0), (cache.hits, cache.misses, cache.evictions))
+        other = cache.build(make_annotation(1210), ref)
+        self.assertIsNot(ft, other)
+        self.assertEqual((1, 2, 1), (cache.hits, cache.misses, cache.evictions))
+        self.assertIsNot(ft, cache.build(make_annotation(1200), ref))  # evicted
+        self.assertEqual(1, len(cache))
+
     def test_build_single_transcript_indel(self):
         # x:100-199, y:500-599, z:1200-1299, w:1500-1599, s:1700-1799
         #   CCCCCCC    GGGGGGG    TTTTTTTTT    CCCCCCCCC    GGGGGGGGG
@@ -878,6 +904,18 @@ class TestSequenceFetching(unittest.TestCase):
         )
         self.translation.domains.append(self.domain)
 
+    def test_sequence_digests(self):
+        cdna, protein = self.pre_transcript.sequence_digests(REFERENCE_GENOME)
+        self.assertEqual({sequence_digest(self.spliced_seq)}, cdna)
+        self.assertEqual({sequence_digest(self.translation.get_aa_seq(REFERENCE_GENOME))}, protein)
+        self.assertIs(cdna, self.pre_transcript.sequence_digests(REFERENCE_GENOME)[0])
+        # adding a translation invalidates the cached digests
+        translation = Translation(1, 30, self.transcript)
+        self.transcript.translations.append(translation)
+        cdna, protein = self.pre_transcript.sequence_digests(REFERENCE_GENOME)
+        self.assertEqual(2, len(protein))
+        self.assertIn(sequence_digest(translation.get_aa_seq(REFERENCE_GENOME)), protein)
+
     def test_fetch_gene_seq_from_ref(self):
         expt = str(REFERENCE_GENOME[REF_CHR][0:900].seq).upper()
         self.assertEqual(expt, self.gene.get_seq(REFERENCE_GENOME))
@@ -1539,6 +1577,27 @@ class TestAnnotate(unittest.TestCase):
         for orf in orfs:
             self.assertEqual('ATG', seq[orf.start - 1 : orf.start + 2])
 
+    def test_calculate_orf_matches_translation(self):
+        seq = 'ccATGaaaTAGgATGcccATGtttTGAaaATGgggTRAcATGTAAtt'
+        expected = []
+        for offset in range(3):
+            aa_seq = translate(seq, offset)
+            start = None
+            for i, aa in enumerate(aa_seq):
+                if aa == 'M' and start is None:
+                    start = i * 3 + 1 + offset
+                elif aa == '*' and start is not None:
+                    expected.append(Interval(start, (i + 1) * 3 + offset))
+                    start = None
+        self.assertEqual(expected, calculate_orf(seq))
+        self.assertEqual([o for o in expected if len(o) >= 9], calculate_orf(seq, min_orf_size=9))
+
+    def test_calculate_orf_max_orf_cap(self):
+        seq = 'ATGTAAcATGaaaTAGggATGaaaaaaTGA'
+        self.assertEqual([Interval(1, 6), Interval(19, 30), Interval(8, 16)], calculate_orf(seq))
+        self.assertEqual([Interval(19, 30), Interval(8, 16)], calculate_orf(seq, max_orf_cap=2))
+        self.assertEqual([Interval(19, 30)], calculate_orf(seq, max_orf_cap=1))
+
 
 class TestAnnotateEvents(unittest.TestCase):
     def test_annotate_events(self):
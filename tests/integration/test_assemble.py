@@ -1,12 +1,16 @@
+import itertools
 import os
 import time
 import unittest
 
+from Bio.Data import IUPACData as iupac
+from Bio.Seq import Seq
 import timeout_decorator
 
 from mavis.assemble import Contig, assemble, filter_contigs
+from mavis.bam.read import sequence_complexity
 from mavis.interval import Interval
-from mavis.constants import reverse_complement
+from mavis.constants import DNA_ALPHABET, reverse_complement
 from mavis.validate.constants import DEFAULTS
 from mavis.util import LOG
 
@@ -31,6 +35,58 @@ class TestFilterContigs(unittest.TestCase):
         self.assertEqual(3, len(filtered))  # figure out amount later. need to optimize timing
 
 
+def _biopython_reverse_complement(seq):
+    # the previous implementation of reverse_complement
+    return str(Seq(seq, DNA_ALPHABET).reverse_complement())
+
+
+def _float_sequence_complexity(seq):
+    # the previous implementation of sequence_complexity
+    hist = {c: 0 for c in iupac.unambiguous_dna_letters}
+    for ambig_base in seq.upper():
+        values = iupac.ambiguous_dna_values[ambig_base]
+        for base in values:
+            hist[base] += 1 / len(values)
+    total = sum(hist.values())
+    return min(
+        [
+            (hist[base1] + hist[base2]) / total
+            for base1, base2 in itertools.combinations(iupac.unambiguous_dna_letters, 2)
+        ]
+    )
+
+
+class TestSequenceUtilities(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(get_data('large_assembly.txt'), 'r') as fh:
+            cls.reads = [line.strip() for line in fh.readlines() if line.strip()]
+
+    def time_per_read(self, func):
+        start_time = time.time()
+        for _ in range(10):
+            results = [func(read) for read in self.reads]
+        return results, (time.time() - start_time) * 1e5 / len(self.reads)
+
+    @timeout_decorator.timeout(60)
+    def test_large_read_set(self):
+        # benchmark the per-read sequence helpers against their previous implementations
+        for func, previous_func, assert_equal in [
+            (reverse_complement, _biopython_reverse_complement, self.assertEqual),
+            # the float sums of the previous implementation can differ in the last bit
+            (sequence_complexity, _float_sequence_complexity, self.assertAlmostEqual),
+        ]:
+            results, duration = self.time_per_read(func)
+            previous_results, previous_duration = self.time_per_read(previous_func)
+            print(
+                '{}: {:.2f}us per read (previously {:.2f}us) for {} reads'.format(
+                    func.__name__, duration, previous_duration, len(self.reads)
+                )
+            )
+            for result, previous_result in zip(results, previous_results):
+                assert_equal(previous_result, result)
+
+
 class TestContigRemap(unittest.TestCase):
     def setUp(self):
         self.contig = Contig(' ' * 60, None)
@@ -1,5 +1,6 @@
 import logging
 import os
+import tempfile
 import unittest
 from unittest import mock
 import warnings
@@ -14,7 +15,13 @@ from mavis.bam.read import (
     read_pair_type,
     sequenced_strand,
 )
-from mavis.bam.stats import compute_genome_bam_stats, compute_transcriptome_bam_stats, Histogram
+from mavis.bam.stats import (
+    compute_depth_map,
+    compute_genome_bam_stats,
+    compute_transcriptome_bam_stats,
+    DepthMap,
+    Histogram,
+)
 from mavis.constants import (
     CIGAR,
     DNA_ALPHABET,
@@ -25,6 +32,7 @@ from mavis.constants import (
     NA_MAPPING_QUALITY,
 )
 from mavis.interval import Interval
+import numpy as np
 import timeout_decorator
 
 from . import MockRead, MockBamFileHandle
@@ -220,6 +228,31 @@ class TestNsbAlign(unittest.TestCase):
         alignment = _read.nsb_align(ref, seq, min_consecutive_match=6)
         self.assertEqual(1, len(alignment))
 
+    def test_ref_kmer_index(self):
+        ref = 'AAAAAAATTTTCGAAAAAAAT'
+        self.assertEqual([0, 1, 2, 3, 13, 14, 15, 16], _read.kmer_index(ref, 4)['AAAA'])
+        for seq in ['AAAAATTT', 'TCGAAAAAAAT', 'CCCCCCCCC']:
+            for min_match in [0.5, 0.9]:
+                exp = _read.nsb_align(
+                    ref,
+                    seq,
+                    min_consecutive_match=4,
+                    min_match=min_match,
+                    min_overlap_percent=min_match,
+                )
+                result = _read.nsb_align(
+                    ref,
+                    seq,
+                    min_consecutive_match=4,
+                    min_match=min_match,
+                    min_overlap_percent=min_match,
+                    ref_kmer_index=_read.kmer_index(ref, 4),
+                )
+                self.assertEqual(
+                    [(r.reference_start, r.cigar) for r in exp],
+                    [(r.reference_start, r.cigar) for r in result],
+                )
+
     def test_left_softclipping(self):
         ref = 'TAAGCTTCTTCCTTTTTCTATGCCACCTACATAGGCATTTTGCATGGTCAGATTGGAATTTACATAATGCATACATGCAAAGAAATATATAGAAGCCAGATATATAAGGTAGTACATTGGCAGGCTTCATATATATAGACTCCCCCATATTGTCTATATGCTAAAAAAGTATTTTAAATCCTTAAATTTTATTTTTGTTCTCTGCATTTGAAATCTTTATCAACTAGGTCATGAAAATAGCCAGTCGGTTCTCCTTTTGGTCTATTAGAATAAAATCTGGACTGCAACTGAGAAGCAGAAGGTAATGTCAGAATGTAT'
         seq = 'GCTAAAAAAGTATTTTAAATCCTTAAATGTTATTTTTGTTCTC'
@@ -461,6 +494,21 @@ class TestBamStats(unittest.TestCase):
         self.assertEqual(150, stats.read_length)
         bamfh.close()
 
+    def test_genome_bam_stats_processes(self):
+        bamfh = BamCache(get_data('mock_reads_for_events.sorted.bam'))
+        results = []
+        for processes in [1, 2]:
+            np.random.seed(1)
+            results.append(
+                compute_genome_bam_stats(
+                    bamfh, 1000, 100, min_mapping_quality=1, sample_cap=10000, processes=processes
+                )
+            )
+        self.assertEqual(results[0].median_fragment_size, results[1].median_fragment_size)
+        self.assertAlmostEqual(results[0].stdev_fragment_size, results[1].stdev_fragment_size)
+        self.assertEqual(150, results[1].read_length)
+        bamfh.close()
+
     def test_trans_bam_stats(self):
         bamfh = BamCache(get_data('mock_trans_reads_for_events.sorted.bam'))
         annotations = load_reference_genes(get_data('mock_annotations.json'))
@@ -479,6 +527,41 @@ class TestBamStats(unittest.TestCase):
         bamfh.close()
 
 
+class TestDepthMap(unittest.TestCase):
+    def setUp(self):
+        self.depth_map = DepthMap(100, {'1': [1, 2, 0, 4], '2': [1, 0.5]})
+
+    def test_median_density(self):
+        self.assertEqual(1, self.depth_map.median_density)
+
+    def test_expected_reads(self):
+        self.assertEqual(50, self.depth_map.expected_reads('1', 51, 100))
+        self.assertEqual(50 + 100, self.depth_map.expected_reads('1', 51, 150))
+        self.assertEqual(100 + 200 + 0 + 400, self.depth_map.expected_reads('1', 1, 1000))
+        self.assertEqual(None, self.depth_map.expected_reads('3', 1, 100))
+
+    def test_fold(self):
+        self.assertEqual(4, self.depth_map.fold('1', 301, 400))
+        self.assertEqual(0.5, self.depth_map.fold('2', 101, 110))
+        self.assertEqual(None, self.depth_map.fold('3', 1, 10))
+
+    def test_read_write(self):
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, 'depth_map.tab')
+            self.depth_map.write(filename)
+            result = DepthMap.read(filename)
+        self.assertEqual(100, result.bin_size)
+        self.assertEqual({'1': [1, 2, 0, 4], '2': [1, 0.5]}, result.density)
+
+    def test_compute_depth_map(self):
+        bamfh = BamCache(get_data('mock_reads_for_events.sorted.bam'))
+        depth_map = compute_depth_map(bamfh, bin_size=10000, sample_size=500)
+        self.assertEqual(set(bamfh.fh.references), set(depth_map.density))
+        bamfh.close()
+        self.assertEqual([0] * len(depth_map.density['fake']), depth_map.density['fake'])
+        self.assertGreater(depth_map.median_density, 0)
+
+
 class TestMapRefRangeToQueryRange(unittest.TestCase):
     def setUp(self):
         self.contig_read = MockRead(
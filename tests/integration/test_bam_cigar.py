@@ -91,6 +91,15 @@ class TestRecomputeCigarMismatch(unittest.TestCase):
             recompute_cigar_mismatch(r, REFERENCE_GENOME['fake']),
         )
 
+    def test_ambiguous_and_lowercase_bases(self):
+        r = MockRead(
+            reference_start=0, query_sequence='ACNTTRaaCG', cigar=[(CIGAR.M, 4), (CIGAR.EQ, 6)],
+        )
+        self.assertEqual(
+            [(CIGAR.EQ, 4), (CIGAR.X, 1), (CIGAR.EQ, 3), (CIGAR.X, 2)],
+            recompute_cigar_mismatch(r, 'ACGTAGAAGC'),
+        )
+
 
 class TestExtendSoftclipping(unittest.TestCase):
     def test_softclipped_right(self):
@@ -1,10 +1,11 @@
+from collections import Counter
 import unittest
 
 from mavis.annotate.file_io import load_reference_genome
 from mavis.breakpoint import Breakpoint, BreakpointPair
 from mavis.constants import CIGAR, ORIENT, reverse_complement, STRAND
 from mavis.interval import Interval
-from mavis.validate.evidence import TranscriptomeEvidence
+from mavis.validate.evidence import TranscriptomeEvidence, TranscriptSet
 from mavis.validate.constants import DEFAULTS
 from functools import partial
 
@@ -32,7 +33,8 @@ class TestNetSizeTransEGFR(unittest.TestCase):
             read_length=100,
             max_expected_fragment_size=550,
             call_error=11,
-            overlapping_transcripts=set(get_example_genes()['EGFR'].transcripts),
+            overlapping_transcripts=TranscriptSet(get_example_genes()['EGFR'].transcripts),
+            memo_hits=Counter(),
         )
         setattr(
             self.evidence, '_select_transcripts', lambda *pos: self.evidence.overlapping_transcripts
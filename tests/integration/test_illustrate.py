@@ -1,5 +1,7 @@
 import random
+import tempfile
 import unittest
+from unittest import mock
 import os
 
 from mavis.annotate.base import BioInterval
@@ -8,8 +10,10 @@ from mavis.annotate import genomic
 from mavis.annotate import protein
 from mavis.annotate import variant
 from mavis.annotate import fusion
+from mavis.annotate.main import draw
 from mavis.breakpoint import Breakpoint, BreakpointPair
 from mavis.constants import ORIENT, PROTOCOL, STRAND, SVTYPE
+from mavis.error import DrawingFitError
 from mavis.illustrate.constants import DiagramSettings, DEFAULTS
 from mavis.illustrate.diagram import (
     draw_multi_transcript_overlay,
@@ -17,6 +21,7 @@ from mavis.illustrate.diagram import (
     generate_interval_mapping,
     HEX_BLACK,
     HEX_WHITE,
+    sv_summary_diagram_min_width,
 )
 from mavis.illustrate.elements import draw_genes, draw_legend, draw_template, draw_ustranscript
 from mavis.illustrate.scatter import ScatterPlot
@@ -338,6 +343,57 @@ class TestDraw(unittest.TestCase):
         if OUTPUT_SVG:
             canvas.saveas('test_draw_layout_single_genomic.svg')
 
+    def test_sv_summary_diagram_min_width(self):
+        d = DiagramSettings()
+        g1 = genomic.Gene('1', 150, 1000, strand=STRAND.POS)
+        g2 = genomic.Gene('1', 5000, 7500, strand=STRAND.POS)
+        t1 = build_transcript(g1, [(200, 299), (400, 499), (700, 899)], 50, 249, [])
+        t2 = build_transcript(
+            g2, [(5100, 5299), (5800, 6199), (6500, 6549), (6700, 6799)], 20, 500, []
+        )
+        b1 = Breakpoint('1', 350, orient=ORIENT.LEFT)
+        b2 = Breakpoint('1', 6500, orient=ORIENT.RIGHT)
+        bpp = BreakpointPair(b1, b2, opposing_strands=False, untemplated_seq='')
+        ann = variant.Annotation(
+            bpp, transcript1=t1, transcript2=t2, event_type=SVTYPE.DEL, protocol=PROTOCOL.GENOME
+        )
+        for start in range(1500, 4500, 300):
+            ann.add_gene(genomic.Gene('1', start, start + 100, strand=STRAND.POS))
+        ann.fusion = variant.FusionTranscript.build(ann, {'1': MockObject(seq=MockString('A'))})
+
+        min_width = sv_summary_diagram_min_width(d, ann)
+        self.assertGreater(min_width, d.left_margin + d.right_margin)
+        d.width = min_width + 1
+        draw_sv_summary_diagram(d, ann)
+        d.width = min_width - 2
+        with self.assertRaises(DrawingFitError):
+            draw_sv_summary_diagram(d, ann)
+        # stacking the transcripts can only require less width
+        self.assertLessEqual(
+            sv_summary_diagram_min_width(d, ann, stack_reference_transcripts=True), min_width
+        )
+
+    def test_draw_never_skips_fallback_attempt(self):
+        d = DiagramSettings()
+        g1 = genomic.Gene('1', 150, 1000, strand=STRAND.POS)
+        t1 = build_transcript(g1, [(200, 299), (400, 499), (700, 899)], 50, 249, [])
+        b1 = Breakpoint('1', 350, orient=ORIENT.LEFT)
+        b2 = Breakpoint('1', 800, orient=ORIENT.RIGHT)
+        bpp = BreakpointPair(b1, b2, opposing_strands=False, untemplated_seq='')
+        ann = variant.Annotation(
+            bpp, transcript1=t1, transcript2=t1, event_type=SVTYPE.DEL, protocol=PROTOCOL.GENOME
+        )
+        ann.annotation_id = 'a1'
+        # an overestimated measurement must still leave the final fallback attempt
+        with mock.patch(
+            'mavis.annotate.main.sv_summary_diagram_min_width', return_value=float('inf')
+        ), tempfile.TemporaryDirectory() as drawings_directory:
+            drawing, legend = draw(d, ann, None, {}, drawings_directory)
+            self.assertIsNotNone(drawing)
+            self.assertTrue(os.path.exists(drawing))
+            self.assertTrue(os.path.exists(legend))
+        self.assertEqual(DEFAULTS.width, d.width)
+
     def test_draw_layout_translocation(self):
         d = DiagramSettings()
         d1 = protein.Domain('first', [(55, 61), (71, 73)])
@@ -1,4 +1,6 @@
 import glob
+import itertools
+import json
 import os
 import re
 import shutil
@@ -13,9 +15,11 @@ from mavis.annotate.file_io import (
     ReferenceFile,
     load_annotations,
 )
-from mavis.annotate.main import main as annotate_main
+from mavis.annotate import main as _annotate_main
+from mavis.annotate.main import draw_main, main as annotate_main
 from mavis.cluster.main import main as cluster_main
 from mavis.constants import DISEASE_STATUS, PROTOCOL
+from mavis.validate import main as _validate_main
 from mavis.validate.main import main as validate_main
 import pysam
 
@@ -133,3 +137,227 @@ class TestPipeline(unittest.TestCase):
         self.assertTrue(os.path.exists(drawings_dir))
         self.assertLessEqual(1, len(glob.glob(os.path.join(drawings_dir, '*.svg'))))
         self.assertLessEqual(1, len(glob.glob(os.path.join(drawings_dir, '*.legend.json'))))
+
+
+class TestAnnotateProcesses(unittest.TestCase):
+    def setUp(self):
+        self.output = mkdtemp()
+        self.input = os.path.join(self.output, 'events.tab')
+        with open(get_data('mock_sv_events.tsv'), 'r') as fh:
+            lines = [line for line in fh.readlines() if not line.startswith('##')][:11]
+        with open(self.input, 'w') as fh:
+            fh.write(lines[0].rstrip('\n') + '\tvalidation_id\n')
+            for i, line in enumerate(lines[1:]):
+                fh.write(line.rstrip('\n') + '\tv{}\n'.format(i))
+        self.template_metadata = template_metadata
+
+    def tearDown(self):
+        shutil.rmtree(self.output)
+
+    def run_annotate(self, output, processes, **kwargs):
+        annotate_main(
+            [self.input],
+            output,
+            'mock-A36971',
+            PROTOCOL.GENOME,
+            reference_genome,
+            annotations,
+            self.template_metadata,
+            annotation_processes=processes,
+            **kwargs
+        )
+        rows = []
+        with open(os.path.join(output, 'annotations.tab'), 'r') as fh:
+            for line in fh.readlines():
+                rows.append(line.split('\t')[1:])  # drop the random tracking_id
+        with open(os.path.join(output, 'annotations.fusion-cdna.fa'), 'r') as fh:
+            fasta = fh.read()
+        drawings = sorted(os.listdir(os.path.join(output, 'drawings')))
+        return rows, fasta, drawings
+
+    def test_parallel_matches_serial(self):
+        serial = self.run_annotate(os.path.join(self.output, 'serial'), 1)
+        parallel = self.run_annotate(os.path.join(self.output, 'parallel'), 2)
+        serial_rows, serial_fasta, serial_drawings = serial
+        parallel_rows, parallel_fasta, parallel_drawings = parallel
+        self.assertLess(11, len(serial_rows))
+        self.assertEqual(
+            [[c.replace('parallel', 'serial') for c in row] for row in parallel_rows], serial_rows
+        )
+        self.assertEqual(serial_fasta, parallel_fasta)
+        self.assertEqual(serial_drawings, parallel_drawings)
+
+    def test_parallel_logs_fusion_cache_stats(self):
+        with mock.patch.object(_annotate_main, 'LOG') as log:
+            self.run_annotate(self.output, 2)
+        stats = [c for c in log.call_args_list if c[0] and c[0][0] == 'annotation process']
+        self.assertTrue(stats)
+        for call in stats:
+            self.assertTrue(call[0][2].startswith('fusion transcript cache:'))
+
+    def test_output_error_before_starting_processes(self):
+        os.makedirs(os.path.join(self.output, 'annotations.tab'))
+        with mock.patch.object(_annotate_main.multiprocessing, 'Pool') as pool:
+            with self.assertRaises(IsADirectoryError):
+                self.run_annotate(self.output, 2)
+        pool.assert_not_called()
+
+    def test_deferred_drawings_match_inline(self):
+        # use all the events so that some reference transcripts (and their domains) are drawn
+        with open(get_data('mock_sv_events.tsv'), 'r') as fh:
+            lines = [line for line in fh.readlines() if not line.startswith('##')]
+        with open(self.input, 'w') as fh:
+            fh.write(lines[0].rstrip('\n') + '\tvalidation_id\n')
+            for i, line in enumerate(lines[1:]):
+                fh.write(line.rstrip('\n') + '\tv{}\n'.format(i))
+        # templates for the mock chromosomes so that the template level view is drawn
+        cytoband = os.path.join(self.output, 'cytoband.tab')
+        with open(cytoband, 'w') as fh:
+            for chrom in sorted(reference_genome.content):
+                length = len(reference_genome.content[chrom].seq)
+                fh.write('{}\t0\t{}\tp11\tgneg\n'.format(chrom, length // 2))
+                fh.write('{}\t{}\t{}\tq11\tgpos50\n'.format(chrom, length // 2, length))
+        self.template_metadata = ReferenceFile('template_metadata', cytoband, eager_load=True)
+        inline_output = os.path.join(self.output, 'inline')
+        _, _, inline_drawings = self.run_annotate(inline_output, 1, draw_fusions_only=False)
+        deferred_output = os.path.join(self.output, 'deferred')
+        annotate_main(
+            [self.input],
+            deferred_output,
+            'mock-A36971',
+            PROTOCOL.GENOME,
+            reference_genome,
+            annotations,
+            self.template_metadata,
+            defer_drawings=True,
+            draw_fusions_only=False,
+        )
+        self.assertEqual([], os.listdir(os.path.join(deferred_output, 'drawings')))
+        # the domains and template bands are drawn from the records rather than the reference files
+        with open(os.path.join(deferred_output, 'annotations.drawings.jsonl'), 'r') as fh:
+            records = [json.loads(line) for line in fh]
+        self.assertTrue(all([record['templates'] for record in records]))
+        self.assertTrue(
+            any(
+                [
+                    record[transcript]['domains']
+                    for record in records
+                    for transcript in ['transcript1', 'transcript2']
+                    if record[transcript] and 'domains' in record[transcript]
+                ]
+            )
+        )
+        # reference annotations without any domains
+        genes = load_annotations(get_data('mock_annotations.json'))
+        for gene in itertools.chain.from_iterable(genes.values()):
+            for translation in gene.translations:
+                translation.domains = []
+        drawn = draw_main(
+            [os.path.join(deferred_output, 'annotations.drawings.jsonl')],
+            os.path.join(self.output, 'drawn'),
+            reference_genome,
+            mock.Mock(content=genes),
+            annotation_processes=2,
+        )
+        self.assertLess(0, len(drawn))
+        self.assertEqual(len(inline_drawings), 2 * len(drawn))
+        for annotation_id, drawing, legend in drawn:
+            for filename in [drawing, legend]:
+                with open(filename, 'r') as fh:
+                    deferred_content = fh.read()
+                with open(
+                    os.path.join(inline_output, 'drawings', os.path.basename(filename)), 'r'
+                ) as fh:
+                    self.assertEqual(fh.read(), deferred_content)
+
+
+class TestValidateCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.output = mkdtemp()
+        self.input = os.path.join(self.output, 'clusters.tab')
+        with open(get_data('mock_sv_events.tsv'), 'r') as fh:
+            lines = [line for line in fh.readlines() if not line.startswith('##')][:4]
+        with open(self.input, 'w') as fh:
+            fh.write(lines[0].rstrip('\n') + '\tcluster_id\ttracking_id\n')
+            for i, line in enumerate(lines[1:]):
+                fh.write(line.rstrip('\n') + '\tc{0}\tt{0}\n'.format(i))
+
+    def tearDown(self):
+        shutil.rmtree(self.output)
+
+    def run_validate(self, output, inputs=None, **kwargs):
+        assembled = []
+        original_assemble_clusters = _validate_main.assemble_clusters
+
+        def assemble_clusters(evidence_clusters, **kwargs):
+            assembled.extend([e.cluster_id for e in evidence_clusters])
+            return original_assemble_clusters(evidence_clusters, **kwargs)
+
+        # the journal does not depend on the aligner so contig alignment is skipped
+        with mock.patch.object(
+            _validate_main, 'align_sequences', return_value={}
+        ), mock.patch.object(_validate_main, 'assemble_clusters', assemble_clusters):
+            validate_main(
+                inputs or [self.input],
+                output,
+                genome_bam_fh,
+                False,
+                'mock-A36971',
+                PROTOCOL.GENOME,
+                median_fragment_size=427,
+                stdev_fragment_size=106,
+                read_length=150,
+                reference_genome=reference_genome,
+                annotations=annotations,
+                masking=masking,
+                aligner_reference=ReferenceFile(
+                    'aligner_reference', get_data('mock_reference_genome.2bit')
+                ),
+                checkpoint_clusters=1,
+                write_evidence_files=False,
+                **kwargs
+            )
+        outputs = {}
+        for filename in ['validation-passed.tab', 'validation-failed.tab', 'validation-passed.bed']:
+            with open(os.path.join(output, filename), 'r') as fh:
+                outputs[filename] = fh.read()
+        return assembled, outputs
+
+    def test_resume_after_truncated_journal(self):
+        output = os.path.join(self.output, 'validate')
+        assembled, clean_outputs = self.run_validate(output)
+        self.assertEqual(['c0', 'c1', 'c2'], assembled)
+        journal = os.path.join(output, 'validation.checkpoint.jsonl')
+        with open(journal, 'r') as fh:
+            header, first, second, third = fh.readlines()
+        # keep the first cluster and simulate being killed while writing the second
+        with open(journal, 'w') as fh:
+            fh.write(header + first + second[: len(second) // 2])
+
+        assembled, resumed_outputs = self.run_validate(output)
+        self.assertEqual(['c1', 'c2'], assembled)
+        self.assertEqual(clean_outputs, resumed_outputs)
+
+        assembled, _ = self.run_validate(output)
+        self.assertEqual([], assembled)
+
+    def test_resume_with_glob_input(self):
+        output = os.path.join(self.output, 'validate')
+        inputs = [os.path.join(self.output, '*.tab')]
+        assembled, clean_outputs = self.run_validate(output, inputs=inputs)
+        self.assertEqual(['c0', 'c1', 'c2'], assembled)
+        assembled, resumed_outputs = self.run_validate(output, inputs=inputs)
+        self.assertEqual([], assembled)
+        self.assertEqual(clean_outputs, resumed_outputs)
+
+    def test_refuse_resume_with_different_settings(self):
+        output = os.path.join(self.output, 'validate')
+        self.run_validate(output)
+        with self.assertRaises(ValueError):
+            self.run_validate(output, min_mapping_quality=10)
+        with open(self.input, 'r') as fh:
+            lines = fh.readlines()
+        with open(self.input, 'w') as fh:
+            fh.writelines(lines[:-1])
+        with self.assertRaises(ValueError):
+            self.run_validate(output)
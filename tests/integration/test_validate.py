@@ -1,12 +1,15 @@
+from functools import partial
 import unittest
 
 from mavis.annotate.file_io import load_reference_genome
 from mavis.bam.cache import BamCache
 from mavis.breakpoint import Breakpoint
 from mavis.constants import ORIENT, PYSAM_READ_FLAGS, NA_MAPPING_QUALITY
+from mavis.interval import Interval
 from mavis.validate.evidence import GenomeEvidence
 from mavis.validate.base import Evidence
-from mavis.bam.read import SamRead
+from mavis.validate.main import assemble_clusters, call_clusters, PROFILE_COLUMNS
+from mavis.bam.read import nsb_align, SamRead
 from mavis.bam import cigar as _cigar
 
 from . import mock_read_pair, MockRead, RUN_FULL, MockObject, MockLongString
@@ -604,6 +607,17 @@ class TestEvidenceGathering(unittest.TestCase):
         )
         self.assertFalse(self.ev1.collect_split_read(ev1_sr, True))
 
+    def test_opposite_window_seed(self):
+        ref = self.ev1._opposite_window_reference(True)
+        self.assertEqual(len(self.ev1.inner_window2), len(ref))
+        self.assertTrue(self.ev1._has_opposite_window_seed(True, 'N' * 20 + ref[10:30], 10))
+        seq = 'N' * 20 + ref[10:19] + 'N' * 20
+        self.assertFalse(self.ev1._has_opposite_window_seed(True, seq, 10))
+        self.assertEqual(
+            [],
+            nsb_align(ref, seq, min_consecutive_match=10, min_match=0.1, min_overlap_percent=0.1),
+        )
+
     def test_collect_flanking_pair(self):
         self.ev1.collect_flanking_pair(
             MockRead(
@@ -740,6 +754,17 @@ class TestStandardizeRead(unittest.TestCase):
             bam_cache=MockObject(get_read_reference_name=lambda x: x.reference_name),
             contig_aln_merge_inner_anchor=10,
             contig_aln_merge_outer_anchor=20,
+            break1=Breakpoint('1', 224646893, orient=ORIENT.LEFT),
+            break2=Breakpoint('1', 224646906, orient=ORIENT.RIGHT),
+            outer_window1=Interval(224646710, 224646924),
+            outer_window2=Interval(224646710, 224646924),
+            read_length=150,
+            _reference_windows={},
+        )
+        setattr(
+            self.mock_evidence,
+            'reference_window',
+            partial(Evidence.reference_window, self.mock_evidence),
         )
 
     def test_bwa_mem(self):
@@ -766,5 +791,41 @@ class MockEvidence:
         self.HUMAN_REFERENCE_GENOME = ref
 
 
+class TestStageProfile(unittest.TestCase):
+    def test_profile_stages(self):
+        evidence = GenomeEvidence(
+            Breakpoint('reference10', 520, orient=ORIENT.RIGHT),
+            Breakpoint('reference19', 964, orient=ORIENT.LEFT),
+            FULL_BAM_CACHE,
+            REFERENCE_GENOME,
+            opposing_strands=False,
+            read_length=125,
+            stdev_fragment_size=100,
+            median_fragment_size=380,
+            stdev_count_abnormal=3,
+            min_flanking_pairs_resolution=3,
+            max_sc_preceeding_anchor=3,
+            outer_window_min_event_size=0,
+            min_mapping_quality=20,
+            data={'cluster_id': 'cluster1', 'tracking_id': 'tracking1'},
+        )
+        profiles = {}
+        assemble_clusters([evidence], profiles=profiles)
+        call_clusters([evidence], REFERENCE_GENOME, profiles=profiles)
+        self.assertEqual([id(evidence)], list(profiles))
+        profile = profiles[id(evidence)]
+        self.assertEqual('cluster1', profile['cluster_id'])
+        self.assertEqual('reference10:520-520R', profile['break1'])
+        self.assertEqual(
+            evidence.counts, [profile['break1_reads_fetched'], profile['break2_reads_fetched']]
+        )
+        self.assertLessEqual(1, profile['reads_kept'])
+        self.assertLess(0, profile['assembly_graph_nodes'])
+        self.assertEqual(len(evidence.contigs), profile['contigs'])
+        self.assertLessEqual(0, profile['call_events_time'])
+        self.assertLess(0, profile['peak_rss_mb'])
+        self.assertTrue(set(profile) <= set(PROFILE_COLUMNS))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,3 +1,4 @@
+from collections import Counter
 from functools import partial
 import unittest
 
@@ -10,7 +11,7 @@ from mavis.constants import CIGAR, ORIENT, STRAND
 from mavis.interval import Interval
 from mavis.validate.constants import DEFAULTS
 from mavis.validate.base import Evidence
-from mavis.validate.evidence import GenomeEvidence, TranscriptomeEvidence
+from mavis.validate.evidence import GenomeEvidence, TranscriptomeEvidence, TranscriptSet
 
 from . import mock_read_pair, MockBamFileHandle, MockRead, MockObject
 
@@ -30,7 +31,8 @@ class TestDistance(unittest.TestCase):
             read_length=100,
             max_expected_fragment_size=550,
             call_error=11,
-            overlapping_transcripts={self.transcript},
+            overlapping_transcripts=TranscriptSet({self.transcript}),
+            memo_hits=Counter(),
         )
         setattr(
             self.trans_evidence,
@@ -62,9 +64,24 @@ class TestDistance(unittest.TestCase):
         self.assertEqual(Interval(2), self.trans_evidence.distance(1101, 1501))
 
     def test_no_annotations(self):
-        dist = self.trans_evidence.distance(101, 300, [])
+        self.trans_evidence.overlapping_transcripts.clear()
+        dist = self.trans_evidence.distance(101, 300)
         self.assertEqual(Interval(199), dist)
 
+    def test_memoized(self):
+        dist = self.trans_evidence.distance(1001, 1550)
+        self.assertEqual(0, self.trans_evidence.memo_hits['distance'])
+        self.assertIs(dist, self.trans_evidence.distance(1001, 1550))
+        self.assertEqual(1, self.trans_evidence.memo_hits['distance'])
+        # changing the transcripts invalidates the memoized results
+        self.trans_evidence.overlapping_transcripts.clear()
+        self.assertEqual(Interval(549), self.trans_evidence.distance(1001, 1550))
+        self.trans_evidence.overlapping_transcripts.add(self.transcript)
+        self.assertEqual(dist, self.trans_evidence.distance(1001, 1550))
+        self.assertEqual(1, self.trans_evidence.memo_hits['distance'])
+        self.trans_evidence.overlapping_transcripts = TranscriptSet()
+        self.assertEqual(Interval(549), self.trans_evidence.distance(1001, 1550))
+
     def test_intergenic_intronic(self):
         dist = self.trans_evidence.distance(101, 1400)
         self.assertEqual(Interval(1101), dist)
@@ -157,6 +174,31 @@ class TestTransStandardize(unittest.TestCase):
         new_cigar = evidence.exon_boundary_shift_cigar(read)
         self.assertEqual(_cigar.convert_string_to_cigar('14=7D18='), new_cigar)
 
+    def test_exon_boundaries_and_introns(self):
+        gene = Gene('1', 1, 1000, strand='+')
+        transcript = PreTranscript(exons=[(1, 12), (20, 28), (40, 50)], gene=gene, strand='+')
+        for spl_patt in transcript.generate_splicing_patterns():
+            transcript.transcripts.append(Transcript(transcript, spl_patt))
+        gene.transcripts.append(transcript)
+        evidence = TranscriptomeEvidence(
+            annotations={},
+            reference_genome={'1': MockObject(seq='qwertyuiopasdfkkkkkdfghjklzxcvbnm')},
+            bam_cache=None,
+            break1=Breakpoint('1', 1, orient='L', strand='+'),
+            break2=Breakpoint('1', 10, orient='R', strand='+'),
+            read_length=75,
+            stdev_fragment_size=75,
+            median_fragment_size=220,
+        )
+        self.assertEqual(([], []), evidence.exon_boundaries('1'))
+        self.assertEqual(set(), evidence.spliced_introns())
+        evidence.overlapping_transcripts.add(transcript)
+        self.assertEqual(([1, 20, 40], [12, 28, 50]), evidence.exon_boundaries('1'))
+        self.assertEqual(([], []), evidence.exon_boundaries('2'))
+        self.assertEqual({(12, 20), (28, 40)}, evidence.spliced_introns())
+        for start, end in evidence.spliced_introns():
+            self.assertEqual(1, evidence.distance(start, end).start)
+
 
 class TestComputeFragmentSizes(unittest.TestCase):
     def setUp(self):
@@ -222,7 +264,8 @@ class TestTraverse(unittest.TestCase):
             read_length=100,
             max_expected_fragment_size=550,
             call_error=11,
-            overlapping_transcripts={self.transcript},
+            overlapping_transcripts=TranscriptSet({self.transcript}),
+            memo_hits=Counter(),
         )
         setattr(
             self.trans_evidence,
@@ -294,7 +337,8 @@ class TestTraverseTransRev(unittest.TestCase):
             read_length=100,
             max_expected_fragment_size=550,
             call_error=11,
-            overlapping_transcripts={self.transcript},
+            overlapping_transcripts=TranscriptSet({self.transcript}),
+            memo_hits=Counter(),
         )
         setattr(
             self.trans_evidence,
@@ -373,7 +417,8 @@ class TestTranscriptomeEvidenceWindow(unittest.TestCase):
             read_length=100,
             max_expected_fragment_size=550,
             call_error=11,
-            overlapping_transcripts={self.pre_transcript},
+            overlapping_transcripts=TranscriptSet({self.pre_transcript}),
+            memo_hits=Counter(),
         )
         setattr(
             self.trans_evidence,
@@ -478,7 +523,8 @@ class TestNetSizeTrans(unittest.TestCase):
             read_length=100,
             max_expected_fragment_size=550,
             call_error=11,
-            overlapping_transcripts={self.transcript},
+            overlapping_transcripts=TranscriptSet({self.transcript}),
+            memo_hits=Counter(),
         )
         setattr(
             self.trans_evidence,
@@ -553,6 +599,39 @@ class TestGenomeEvidenceWindow(unittest.TestCase):
         self.assertEqual(6150, ge.inner_window2.end)
         self.assertEqual(5852, ge.inner_window2.start)
 
+    def test_reference_window(self):
+        seq = ''.join(['ACGT'[i % 4] for i in range(10000)])
+        ge = GenomeEvidence(
+            Breakpoint('1', 1500, orient=ORIENT.LEFT),
+            Breakpoint('1', 6001, orient=ORIENT.RIGHT),
+            None,
+            {'1': MockObject(seq=seq), '2': MockObject(seq=seq)},
+            opposing_strands=False,
+            read_length=150,
+            stdev_fragment_size=500,
+            median_fragment_size=100,
+            call_error=0,
+            stdev_count_abnormal=1,
+        )
+        # outer windows (901, 1649)  (5852, 6600) padded by the read length
+        window_seq, offset = ge.reference_window(self.read('1', 1000))
+        self.assertEqual(750, offset)
+        self.assertEqual(seq[750:1799], window_seq)
+        self.assertEqual(seq[1000:1100], window_seq[1000 - offset : 1100 - offset])
+        self.assertEqual((seq[5701:6750], 5701), ge.reference_window(self.read('1', 6000)))
+        # the sequence between the windows is not extracted
+        self.assertEqual((seq, 0), ge.reference_window(self.read('1', 3000)))
+        # outside the windows or on another chromosome falls back to the genome-wide sequence
+        self.assertEqual((seq, 0), ge.reference_window(self.read('1', 6700)))
+        self.assertEqual((seq, 0), ge.reference_window(self.read('2', 1000)))
+        self.assertEqual((seq, 0), ge.reference_window(self.read('1', 1000), '2'))
+
+    @staticmethod
+    def read(reference_name, reference_start):
+        return MockRead(
+            reference_name=reference_name, reference_start=reference_start, cigar=[(CIGAR.EQ, 100)],
+        )
+
 
 class TestGenomeEvidenceAddReads(unittest.TestCase):
     def setUp(self):
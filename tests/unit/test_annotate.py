@@ -3,8 +3,11 @@ import os
 import unittest
 
 from mavis.annotate.base import ReferenceName
+from mavis.annotate.genomic import ExonCoordinateMap
 from mavis.annotate.protein import calculate_orf, Domain, DomainRegion
 from mavis.annotate.variant import IndelCall
+from mavis.constants import ORIENT
+from mavis.interval import Interval
 import timeout_decorator
 
 from .mock import Mock, MockFunction
@@ -276,6 +279,27 @@ class TestDomainAlignSeq(unittest.TestCase):
         with self.assertRaises(UserWarning):
             d.align_seq(input_seq)
 
+    def test_exact_match_case_insensitive(self):
+        d = Domain('name', [DomainRegion(1, 4, seq='MKLA'), DomainRegion(8, 10, seq='WRE')])
+        match, total, regions = d.align_seq('ggmklaPPPwreGG')
+        self.assertEqual(7, match)
+        self.assertEqual(7, total)
+        self.assertEqual([(3, 6), (10, 12)], [(r.start, r.end) for r in regions])
+
+    def test_mismatch_match(self):
+        d = Domain('name', [DomainRegion(1, 6, seq='MKLAWR')])
+        match, total, regions = d.align_seq('PPPMKLTWRPP')
+        self.assertEqual(5, match)
+        self.assertEqual(6, total)
+        self.assertEqual([(4, 9)], [(r.start, r.end) for r in regions])
+
+    def test_multiple_equal_mappings_error(self):
+        d = Domain('name', [DomainRegion(1, 3, seq='MKL'), DomainRegion(5, 7, seq='WRE')])
+        with self.assertRaises(UserWarning):
+            d.align_seq('MKLPMKLPWREPP')
+        match, total, regions = d.align_seq('MKLPWREPPMKL')
+        self.assertEqual([(1, 3), (5, 7)], [(r.start, r.end) for r in regions])
+
 
 class TestCalculateORF(unittest.TestCase):
     def setUp(self):
@@ -366,6 +390,56 @@ class TestReferenceName(unittest.TestCase):
         self.assertTrue(ReferenceName('3') in {ReferenceName('chr3')})
 
 
+class TestExonCoordinateMap(unittest.TestCase):
+    def setUp(self):
+        self.exons = [Interval(101, 200), Interval(301, 350), Interval(401, 500)]
+
+    def test_overlapping_error(self):
+        with self.assertRaises(AttributeError):
+            ExonCoordinateMap([Interval(1, 10), Interval(10, 20)])
+
+    def test_forward(self):
+        cmap = ExonCoordinateMap(self.exons)
+        self.assertEqual(250, cmap.length)
+        self.assertEqual((1, 0), cmap.genomic_to_nearest_cdna(101))
+        self.assertEqual((101, 0), cmap.genomic_to_nearest_cdna(301))
+        self.assertEqual((100, 10), cmap.genomic_to_nearest_cdna(210))
+        self.assertEqual((101, -10), cmap.genomic_to_nearest_cdna(291))
+        self.assertEqual(
+            (101, -90), cmap.genomic_to_nearest_cdna(211, stick_direction=ORIENT.RIGHT)
+        )
+        self.assertEqual(None, cmap.genomic_to_nearest_cdna(100))
+        self.assertEqual(None, cmap.genomic_to_nearest_cdna(501))
+        self.assertEqual(301, cmap.cdna_to_genomic(101))
+        self.assertEqual(500, cmap.cdna_to_genomic(250))
+
+    def test_reverse(self):
+        cmap = ExonCoordinateMap(self.exons, reverse=True)
+        self.assertEqual((250, 0), cmap.genomic_to_nearest_cdna(101))
+        self.assertEqual((1, 0), cmap.genomic_to_nearest_cdna(500))
+        self.assertEqual((150, 0), cmap.genomic_to_nearest_cdna(301))
+        self.assertEqual((151, -10), cmap.genomic_to_nearest_cdna(210))
+        self.assertEqual(500, cmap.cdna_to_genomic(1))
+        self.assertEqual(301, cmap.cdna_to_genomic(150))
+        with self.assertRaises(IndexError):
+            cmap.cdna_to_genomic(0)
+
+    def test_many_matches_single(self):
+        positions = list(range(50, 560, 3))
+        for reverse in [True, False]:
+            cmap = ExonCoordinateMap(self.exons, reverse=reverse)
+            cdna, shift = cmap.genomic_to_nearest_cdna_many(positions)
+            for pos, cdna_pos, pos_shift in zip(positions, cdna, shift):
+                expected = cmap.genomic_to_nearest_cdna(pos)
+                if expected is None:  # outside the exons
+                    expected = (
+                        (1 if reverse else 250, pos - 500)
+                        if pos > 500
+                        else (250 if reverse else 1, pos - 101)
+                    )
+                self.assertEqual(expected, (cdna_pos, pos_shift))
+
+
 class TestIndelCall(unittest.TestCase):
     def test_duplication_in_repeat(self):
         ref = 'ASFHGHGSFSFSLLLLLL' 'FLLLLSFSLMVPWSFKW'
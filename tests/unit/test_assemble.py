@@ -2,7 +2,9 @@ import itertools
 import random
 import os
 import unittest
+from unittest import mock
 
+from mavis import assemble as _assemble
 from mavis.assemble import assemble, Contig, DeBruijnGraph, filter_contigs, kmers
 from mavis.constants import DNA_ALPHABET
 
@@ -32,6 +34,23 @@ class TestModule(unittest.TestCase):
         self.assertEqual('ABCDEFG', c[0].seq)
         self.assertEqual(5, c[0].remap_score())
 
+    def test_assemble_duplicate_sequences(self):
+        sequences = ['ABCD', 'BCDE', 'CDEF', 'ABCDE', 'DEFG']
+        with mock.patch('mavis.assemble.nsb_align', wraps=_assemble.nsb_align) as align:
+            c = assemble(sequences * 3, 3, min_edge_trim_weight=1, remap_min_exact_match=1)
+        self.assertEqual(1, len(c))
+        self.assertEqual('ABCDEFG', c[0].seq)
+        self.assertEqual(5, c[0].remap_score())
+        self.assertEqual(len(sequences), align.call_count)
+
+    def test_assemble_stats(self):
+        sequences = ['ABCD', 'BCDE', 'CDEF', 'ABCDE', 'DEFG']
+        stats = {}
+        assemble(sequences, 3, min_edge_trim_weight=1, remap_min_exact_match=1, stats=stats)
+        self.assertEqual(
+            {'assembly_graph_nodes': 6, 'assembly_graph_edges': 5, 'assembly_paths': 1}, stats
+        )
+
     def test_assemble_empty_list(self):
         self.assertEqual([], assemble([], 1))
 
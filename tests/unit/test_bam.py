@@ -43,6 +43,41 @@ class TestPileUp(unittest.TestCase):
         expected = list(zip(range(2, 9), [1, 1, 2, 2, 2, 2, 2]))
         self.assertEqual(expected, pileup)
 
+    def test_aligned_blocks(self):
+        reads = [
+            Mock(get_blocks=MockFunction([(0, 3), (10, 12)])),
+            self.mock_read([1, 2, 3, 4, 11, 12]),
+        ]
+        pileup = _read.pileup(reads)
+        expected = [(1, 1), (2, 2), (3, 2), (4, 1), (5, 1), (11, 1), (12, 2), (13, 1)]
+        self.assertEqual(expected, pileup)
+
+
+class TestCoverage(unittest.TestCase):
+    def mock_read(self, blocks, **kwargs):
+        return Mock(get_blocks=MockFunction(blocks), **kwargs)
+
+    def test_window(self):
+        reads = [self.mock_read([(0, 5), (8, 10)]), self.mock_read([(3, 12)])]
+        depth = _read.coverage(reads, 3, 10)
+        self.assertEqual([1, 2, 2, 1, 1, 1, 2, 2], depth.tolist())
+
+    def test_filter_reads(self):
+        reads = [
+            self.mock_read([(0, 5)], mapping_quality=0),
+            self.mock_read([(3, 12)], mapping_quality=10),
+        ]
+        depth = _read.coverage(reads, 1, 6, filter_func=lambda x: x.mapping_quality < 1)
+        self.assertEqual([0, 0, 0, 1, 1, 1], depth.tolist())
+
+    def test_bins(self):
+        reads = [self.mock_read([(0, 5)]), self.mock_read([(2, 7)])]
+        depth = _read.coverage(reads, 1, 7, bin_size=3)
+        self.assertEqual([4 / 3, 5 / 3, 1], depth.tolist())
+
+    def test_empty_window(self):
+        self.assertEqual([], _read.coverage([self.mock_read([(0, 5)])], 10, 9).tolist())
+
 
 class TestConvertEventsToSoftclipping(unittest.TestCase):
     def test_left_large_deletion(self):
@@ -353,3 +388,9 @@ class TestSequenceComplexity(unittest.TestCase):
 
     def test_empty(self):
         self.assertEqual(0, _read.sequence_complexity(''))
+
+    def test_ambiguous_bases(self):
+        self.assertAlmostEqual(1 / 6, _read.sequence_complexity('AAANccvR'))
+        self.assertEqual(
+            _read.sequence_complexity('AAANccvR'), _read.sequence_complexity('aaanCCVr')
+        )
@@ -1,6 +1,10 @@
 import unittest
 
+from mavis.breakpoint import Breakpoint, BreakpointPair
 from mavis.cluster.cluster import merge_integer_intervals
+from mavis.cluster.constants import COST_WINDOW_PADDING, TRANSCRIPTOME_COST_FACTOR
+from mavis.cluster.main import estimate_cluster_cost, partition_by_cost
+from mavis.constants import COLUMNS, ORIENT, PROTOCOL
 from mavis.interval import Interval
 
 
@@ -26,5 +30,45 @@ class TestMergeIntegerIntervals(unittest.TestCase):
         self.assertEqual(Interval(1, 3), m)
 
 
+class TestEstimateClusterCost(unittest.TestCase):
+    def setUp(self):
+        self.bpp = BreakpointPair(
+            Breakpoint('1', 100, 199, orient=ORIENT.LEFT),
+            Breakpoint('2', 500, 549, orient=ORIENT.RIGHT),
+            data={COLUMNS.protocol: PROTOCOL.GENOME},
+        )
+
+    def test_genome(self):
+        self.assertEqual(150 + 2 * COST_WINDOW_PADDING, estimate_cluster_cost(self.bpp))
+
+    def test_transcriptome(self):
+        self.bpp.data[COLUMNS.protocol] = PROTOCOL.TRANS
+        self.assertEqual(
+            (150 + 2 * COST_WINDOW_PADDING) * TRANSCRIPTOME_COST_FACTOR,
+            estimate_cluster_cost(self.bpp),
+        )
+
+    def test_depth(self):
+        cost = estimate_cluster_cost(self.bpp, {'1': 2, '3': 10}, window_padding=0)
+        self.assertEqual(100 * 2 + 50, cost)
+
+
+class TestPartitionByCost(unittest.TestCase):
+    def test_even_costs(self):
+        jobs = partition_by_cost(list(range(6)), [1] * 6, 3)
+        self.assertEqual([[0, 1], [2, 3], [4, 5]], jobs)
+
+    def test_expensive_cluster_alone(self):
+        jobs = partition_by_cost(list(range(5)), [1, 1, 8, 1, 1], 3)
+        self.assertEqual([[0, 1], [2], [3, 4]], jobs)
+
+    def test_drops_empty_jobs(self):
+        jobs = partition_by_cost(list(range(2)), [1, 100], 4)
+        self.assertEqual([[0], [1]], jobs)
+
+    def test_zero_cost(self):
+        self.assertEqual([[0, 1]], partition_by_cost([0, 1], [0, 0], 2))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -31,6 +31,11 @@ class TestConstants(unittest.TestCase):
         self.assertEqual('ATCG', reverse_complement('CGAT'))
         self.assertEqual('', reverse_complement(''))
 
+    def test_reverse_complement_ambiguous(self):
+        self.assertEqual('NnKYrmBDHVU', reverse_complement('UBDHVkyRMnN'))
+        with self.assertRaises(ValueError):
+            reverse_complement('AC-GT')
+
     def test_translate(self):
         seq = 'ATG' 'AAT' 'TCT' 'GGA' 'TGA'
         translated_seq = translate(seq, 0)
@@ -1,5 +1,6 @@
 import unittest
-from mavis.illustrate.util import generate_interval_mapping
+from mavis.error import DrawingFitError
+from mavis.illustrate.util import generate_interval_mapping, interval_mapping_min_width
 from mavis.interval import Interval
 
 
@@ -34,3 +35,14 @@ class TestGenerateIntervalMapping(unittest.TestCase):
             [], target, ratio, min_width, buffer_, start, end, min_inter
         )
         self.assertEqual(1, len(mapping.keys()))
+
+
+class TestIntervalMappingMinWidth(unittest.TestCase):
+    def test_matches_fit_error(self):
+        regions = [Interval(100, 199), Interval(150, 300), Interval(500, 600), Interval(601, 700)]
+        min_width = interval_mapping_min_width(regions, 60, start=1, end=1000, min_inter_width=10)
+        # overlapping inputs are split at each start/end into 6 focus intervals with 3 gaps between
+        self.assertEqual(3 * 10 + 6 * 60, min_width)
+        generate_interval_mapping(regions, min_width, 5, 60, None, 1, 1000, 10)
+        with self.assertRaises(DrawingFitError):
+            generate_interval_mapping(regions, min_width - 1, 5, 60, None, 1, 1000, 10)
@@ -2,7 +2,13 @@ import unittest
 
 from mavis.breakpoint import Breakpoint, BreakpointPair
 from mavis.constants import CALL_METHOD, COLUMNS, PROTOCOL, STRAND, SVTYPE
-from mavis.summary.summary import filter_by_annotations
+from mavis.summary.summary import (
+    filter_by_annotations,
+    filter_pairs,
+    filter_table,
+    group_by_distance,
+)
+from mavis.util import bpps_from_row
 
 
 class TestFilterByAnnotations(unittest.TestCase):
@@ -144,3 +150,181 @@ class TestFilterByAnnotations(unittest.TestCase):
 
     def test_get_pairing_state(self):
         raise unittest.SkipTest('TODO')
+
+
+class TestFilterTable(unittest.TestCase):
+    def build_row(self, **kwargs):
+        row = {
+            COLUMNS.break1_chromosome: '1',
+            COLUMNS.break1_position_start: 100,
+            COLUMNS.break1_position_end: 100,
+            COLUMNS.break1_orientation: 'L',
+            COLUMNS.break1_strand: STRAND.NS,
+            COLUMNS.break2_chromosome: '1',
+            COLUMNS.break2_position_start: 500,
+            COLUMNS.break2_position_end: 500,
+            COLUMNS.break2_orientation: 'R',
+            COLUMNS.break2_strand: STRAND.NS,
+            COLUMNS.stranded: False,
+            COLUMNS.opposing_strands: False,
+            COLUMNS.untemplated_seq: None,
+            COLUMNS.event_type: SVTYPE.DEL,
+            COLUMNS.protocol: PROTOCOL.GENOME,
+            COLUMNS.call_method: CALL_METHOD.CONTIG,
+            COLUMNS.contig_remapped_reads: 10,
+            COLUMNS.protein_synon: None,
+            COLUMNS.cdna_synon: None,
+            COLUMNS.net_size: '-399--399',
+            COLUMNS.pairing: '',
+        }
+        for col, value in kwargs.items():
+            row[COLUMNS[col]] = value
+        return row
+
+    def setUp(self):
+        self.rows = [
+            self.build_row(tracking_id='pass'),
+            self.build_row(tracking_id='cdna', cdna_synon='a;b'),
+            self.build_row(tracking_id='protein', protein_synon='a', cdna_synon='b'),
+            self.build_row(tracking_id='contig', contig_remapped_reads=1),
+            self.build_row(
+                tracking_id='homopolymer',
+                protocol=PROTOCOL.TRANS,
+                event_type=SVTYPE.INS,
+                break2_position_start=101,
+                break2_position_end=101,
+                untemplated_seq='A',
+                repeat_count='2',
+                net_size='1-1',
+            ),
+            self.build_row(
+                tracking_id='paired_homopolymer',
+                protocol=PROTOCOL.TRANS,
+                event_type=SVTYPE.INS,
+                break2_position_start=101,
+                break2_position_end=101,
+                untemplated_seq='A',
+                repeat_count='2',
+                net_size='1-1',
+                pairing='lib_genome',
+            ),
+            self.build_row(tracking_id='complexity', call_sequence_complexity='0.1'),
+            self.build_row(
+                tracking_id='split',
+                call_method=CALL_METHOD.SPLIT,
+                break1_split_reads=5,
+                break1_split_reads_forced=0,
+                break2_split_reads=3,
+                break2_split_reads_forced=3,
+                linking_split_reads=1,
+            ),
+            self.build_row(
+                tracking_id='split_low',
+                call_method=CALL_METHOD.SPLIT,
+                break1_split_reads=5,
+                break1_split_reads_forced=0,
+                break2_split_reads=0,
+                break2_split_reads_forced=6,
+                linking_split_reads=1,
+            ),
+            self.build_row(tracking_id='flank', call_method=CALL_METHOD.FLANK, flanking_pairs=9),
+            self.build_row(tracking_id='span', call_method=CALL_METHOD.SPAN, spanning_reads=5),
+            self.build_row(
+                tracking_id='multi',
+                event_type='{};{}'.format(SVTYPE.DEL, SVTYPE.INS),
+                call_method=CALL_METHOD.INPUT,
+            ),
+        ]
+        self.filters = dict(filter_protein_synon=True, filter_min_complexity=0.2)
+
+    def test_matches_filter_pairs(self):
+        bpps = []
+        for row in self.rows:
+            bpps.extend(bpps_from_row(dict(row)))
+        exp_pass, exp_filtered = filter_pairs(bpps, **self.filters)
+        passed, filtered = filter_table([dict(row) for row in self.rows], **self.filters)
+
+        self.assertEqual(
+            [(b.tracking_id, b.event_type) for b in exp_pass],
+            [(b.tracking_id, b.event_type) for b in passed],
+        )
+        self.assertEqual(
+            [(b.tracking_id, b.filter_comment) for b in exp_filtered],
+            [(r[COLUMNS.tracking_id], r[COLUMNS.filter_comment]) for r in filtered],
+        )
+
+    def test_filter_comments(self):
+        passed, filtered = filter_table(self.rows, **self.filters)
+        self.assertEqual(
+            ['pass', 'paired_homopolymer', 'split', 'span', 'multi', 'multi'],
+            [b.tracking_id for b in passed],
+        )
+        self.assertEqual(
+            {
+                'cdna': 'synonymous cdna',
+                'protein': 'synonymous protein',
+                'homopolymer': 'homopolymer filter',
+                'complexity': 'low complexity',
+                'contig': 'low evidence',
+                'split_low': 'low evidence',
+                'flank': 'low evidence',
+            },
+            {r[COLUMNS.tracking_id]: r[COLUMNS.filter_comment] for r in filtered},
+        )
+
+    def test_unexpected_call_method(self):
+        with self.assertRaises(AssertionError):
+            filter_table([self.build_row(call_method='blargh')])
+
+
+class TestGroupByDistance(unittest.TestCase):
+    def build_call(self, start1, start2, annotation_id, **kwargs):
+        data = {
+            COLUMNS.event_type: SVTYPE.DEL,
+            COLUMNS.call_method: CALL_METHOD.SPLIT,
+            COLUMNS.library: 'lib',
+            COLUMNS.protocol: PROTOCOL.GENOME,
+            COLUMNS.annotation_id: annotation_id,
+            COLUMNS.fusion_splicing_pattern: None,
+            COLUMNS.fusion_cdna_coding_start: None,
+            COLUMNS.fusion_cdna_coding_end: None,
+            COLUMNS.tracking_id: annotation_id,
+        }
+        for col, value in kwargs.items():
+            data[COLUMNS[col]] = value
+        return BreakpointPair(
+            Breakpoint('1', start1, orient='L'),
+            Breakpoint('1', start2, orient='R'),
+            opposing_strands=False,
+            data=data,
+        )
+
+    def test_chained_calls(self):
+        calls = [
+            self.build_call(100, 500, 'a'),
+            self.build_call(1000, 1500, 'd'),
+            self.build_call(108, 505, 'b'),
+            self.build_call(116, 511, 'c', call_method=CALL_METHOD.CONTIG),
+        ]
+        grouped, removed = group_by_distance(calls, {CALL_METHOD.SPLIT: 10, CALL_METHOD.CONTIG: 0})
+        self.assertEqual(2, len(grouped))
+        self.assertEqual(3, len(removed))
+        self.assertEqual(Breakpoint('1', 100, 116, orient='L'), grouped[0].break1)
+        self.assertEqual(Breakpoint('1', 500, 511, orient='R'), grouped[0].break2)
+        self.assertEqual('a;b;c', grouped[0].data[COLUMNS.tracking_id])
+        self.assertEqual(
+            '{};{}'.format(CALL_METHOD.CONTIG, CALL_METHOD.SPLIT), grouped[0].call_method
+        )
+        self.assertEqual(SVTYPE.DEL, grouped[0].event_type)
+        self.assertEqual('d', grouped[1].data[COLUMNS.tracking_id])
+
+    def test_second_breakpoint_too_far(self):
+        calls = [self.build_call(100, 500, 'a'), self.build_call(105, 600, 'b')]
+        grouped, removed = group_by_distance(calls, {CALL_METHOD.SPLIT: 10})
+        self.assertEqual(2, len(grouped))
+        self.assertEqual([], removed)
+
+    def test_same_product_key(self):
+        calls = [self.build_call(100, 500, 'a'), self.build_call(5000, 6000, 'a')]
+        grouped, removed = group_by_distance(calls, {CALL_METHOD.SPLIT: 10})
+        self.assertEqual(calls, grouped)
@@ -11,6 +11,7 @@ from mavis.util import (
     WeakMavisNamespace,
     read_bpp_from_input_file,
     get_connected_components,
+    UnionFind,
 )
 
 from .mock import Mock
@@ -47,6 +48,21 @@ class TestGetConnectedComponents(unittest.TestCase):
         self.assertEqual({6, 7, 8}, components[1])
 
 
+class TestUnionFind(unittest.TestCase):
+    def test_no_unions(self):
+        sets = UnionFind([1, 2, 3])
+        self.assertEqual([[1], [2], [3]], sets.components())
+
+    def test_multiple_components(self):
+        sets = UnionFind()
+        for item1, item2 in [(1, 2), (2, 3), (3, 4), (6, 7), (8, 6)]:
+            sets.union(item1, item2)
+        sets.add(9)
+        self.assertEqual(sets.find(1), sets.find(4))
+        self.assertNotEqual(sets.find(1), sets.find(8))
+        self.assertEqual([[1, 2, 3, 4], [6, 7, 8], [9]], sets.components())
+
+
 class TestCast(unittest.TestCase):
     def test_float(self):
         self.assertEqual(type(1.0), type(cast('1', float)))
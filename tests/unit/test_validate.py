@@ -1,12 +1,17 @@
+import os
+import shutil
+import tempfile
 import unittest
 
-from mavis.constants import ORIENT
+from mavis.bam.stats import DepthMap
+from mavis.constants import COLUMNS, ORIENT
 from mavis.validate.call import _call_interval_by_flanking_coverage
 from mavis.validate.evidence import GenomeEvidence
 from mavis.validate.base import Evidence
+from mavis.validate.main import append_checkpoint, read_checkpoint
 from mavis.interval import Interval
 
-from .mock import Mock
+from .mock import Mock, MockFunction
 
 
 class CallIntervalByFlankingCoverage(unittest.TestCase):
@@ -69,3 +74,72 @@ class TestDistanceAndTraverse(unittest.TestCase):
 
     def test_traverse_left(self):
         self.assertEqual(Interval(10), Evidence.traverse(20, 10, ORIENT.LEFT))
+
+
+class TestFetchSampleBins(unittest.TestCase):
+    def setUp(self):
+        self.evidence = Mock(
+            depth_map=DepthMap(1000, {'1': [1, 10], '3': [100000, 100000]}),
+            fetch_reads_limit=1000,
+            fetch_reads_bins=3,
+            fetch_min_bin_size=10,
+        )
+
+    def test_no_depth_map(self):
+        self.evidence.depth_map = None
+        self.assertEqual(3, Evidence.fetch_sample_bins(self.evidence, '1', Interval(1, 1000)))
+
+    def test_chr_not_in_map(self):
+        self.assertEqual(3, Evidence.fetch_sample_bins(self.evidence, '2', Interval(1, 1000)))
+
+    def test_under_read_limit(self):
+        self.assertEqual(1, Evidence.fetch_sample_bins(self.evidence, '1', Interval(1, 1000)))
+
+    def test_over_read_limit(self):
+        self.assertEqual(9, Evidence.fetch_sample_bins(self.evidence, '1', Interval(901, 1200)))
+
+    def test_far_over_read_limit(self):
+        # bins are limited to those which fit in the window
+        self.assertEqual(30, Evidence.fetch_sample_bins(self.evidence, '3', Interval(901, 1200)))
+        # and to the read limit so that each bin can still fetch a read
+        self.evidence.fetch_reads_limit = 20
+        self.assertEqual(20, Evidence.fetch_sample_bins(self.evidence, '3', Interval(1, 2000)))
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.output = tempfile.mkdtemp()
+        self.filename = os.path.join(self.output, 'validation.checkpoint.jsonl')
+
+    def mock_call(self, cluster_id):
+        return Mock(
+            flatten=MockFunction({COLUMNS.cluster_id: cluster_id, COLUMNS.event_type: 'deletion'}),
+            get_bed_repesentation=MockFunction([('1', 100, 200, cluster_id)]),
+        )
+
+    def test_missing_file(self):
+        self.assertEqual({}, read_checkpoint(self.filename))
+
+    def test_append_and_read(self):
+        append_checkpoint(self.filename, 'c1', [self.mock_call('c1')], [], {'seq-1': 'ACGT'})
+        failed = Mock(flatten=MockFunction({COLUMNS.cluster_id: 'c2'}))
+        append_checkpoint(self.filename, 'c2', [], [failed], {})
+        entries = read_checkpoint(self.filename)
+        self.assertEqual(['c1', 'c2'], sorted(entries))
+        self.assertEqual(
+            [{COLUMNS.cluster_id: 'c1', COLUMNS.event_type: 'deletion'}], entries['c1']['passed']
+        )
+        self.assertEqual([['1', 100, 200, 'c1']], entries['c1']['bed'])
+        self.assertEqual({'seq-1': 'ACGT'}, entries['c1']['contigs'])
+        self.assertEqual([{COLUMNS.cluster_id: 'c2'}], entries['c2']['failed'])
+
+    def test_ignore_truncated_entry(self):
+        append_checkpoint(self.filename, 'c1', [self.mock_call('c1')], [], {})
+        with open(self.filename, 'a') as fh:
+            fh.write('{"cluster_id": "c2", "pas')
+        self.assertEqual(['c1'], list(read_checkpoint(self.filename)))
+        append_checkpoint(self.filename, 'c3', [self.mock_call('c3')], [], {})
+        self.assertEqual(['c1', 'c3'], sorted(read_checkpoint(self.filename)))
+
+    def tearDown(self):
+        shutil.rmtree(self.output)